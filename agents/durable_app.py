@@ -0,0 +1,168 @@
+"""
+Push Agent Function App - 에이전트 응답 완료를 폴링 대신 알림으로 받는 AgentFunctionApp
+
+기본 AgentFunctionApp 의 HTTP 트리거는 엔티티에 요청을 보낸 뒤 poll_interval_seconds(1초)마다
+엔티티 상태를 읽어 응답을 찾습니다. 응답이 생긴 시점부터 최대 1초를 더 기다리고, 기다리는 동안
+상태 조회가 계속 발생합니다.
+
+PushAgentFunctionApp 은
+
+1. 엔티티 콜백(on_agent_response)으로 최종 응답을 CompletionNotifier 에 알리고,
+   같은 워커에서 기다리는 HTTP 요청을 즉시 깨웁니다. (엔티티는 별도 스레드 / 이벤트 루프에서 실행됨)
+2. 다른 인스턴스에서 엔티티가 실행된 경우를 위해 상태 조회도 계속하되, 간격을
+   poll_initial_seconds 부터 poll_max_seconds 까지 늘려가며(backoff) 조회 횟수를 줄입니다.
+
+    app = PushAgentFunctionApp(agents=[create_master_agent()], enable_health_check=True, timeout_seconds=60)
+
+응답에는 completed_via("push" / "poll")와 polls(상태 조회 횟수)가 추가됩니다.
+알림으로 받은 응답도 폴링 결과와 같은 필드(message_count 포함)를 돌려주도록 엔티티 상태를 한 번 읽습니다.
+bench/durable_latency.py 로 로컬 func host(+ 스토리지 에뮬레이터)에서 응답 지연을 측정할 수 있습니다.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+
+from agent_framework.azure import AgentFunctionApp
+from agent_framework_durabletask import ApiResponseFields
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 60
+POLL_INITIAL_SECONDS = 0.25
+POLL_MAX_SECONDS = 2.0
+POLL_BACKOFF = 1.6
+# 기다리는 요청이 등록되기 전에 끝난 응답을 보관하는 수 / 시간
+MAX_EARLY_RESPONSES = 256
+EARLY_RESPONSE_TTL_SECONDS = 300
+
+
+def backoff_intervals(initial: float = POLL_INITIAL_SECONDS,
+                      maximum: float = POLL_MAX_SECONDS,
+                      factor: float = POLL_BACKOFF):
+    """initial 부터 factor 배씩 늘어 maximum 에서 멈추는 대기 간격을 끝없이 만듭니다."""
+    interval = initial
+    while True:
+        yield interval
+        interval = min(interval * factor, maximum)
+
+
+class CompletionNotifier:
+    """
+    엔티티의 최종 응답을 correlation_id 로 기다리는 HTTP 요청에 전달하는 콜백
+    (AgentResponseCallbackProtocol). downstream 콜백이 있으면 그대로 이어서 호출합니다.
+    """
+
+    def __init__(self, downstream=None):
+        self.downstream = downstream
+        self._waiters: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._early: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, correlation_id: str) -> asyncio.Future:
+        """현재 이벤트 루프에서 응답 텍스트로 완료될 Future 를 만듭니다. (이미 끝났으면 완료된 상태)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            early = self._early.pop(correlation_id, None)
+            if early is not None and time.monotonic() - early[0] < EARLY_RESPONSE_TTL_SECONDS:
+                future.set_result(early[1])
+            else:
+                self._waiters[correlation_id] = (loop, future)
+        return future
+
+    def discard(self, correlation_id: str):
+        with self._lock:
+            self._waiters.pop(correlation_id, None)
+
+    def notify(self, correlation_id: str, text: str):
+        """응답 완료를 알립니다. (어느 스레드에서 호출해도 됨)"""
+        with self._lock:
+            waiter = self._waiters.pop(correlation_id, None)
+            if waiter is None:
+                self._early[correlation_id] = (time.monotonic(), text)
+                while len(self._early) > MAX_EARLY_RESPONSES:
+                    self._early.popitem(last=False)
+                return
+        loop, future = waiter
+        loop.call_soon_threadsafe(lambda: future.done() or future.set_result(text))
+
+    async def on_streaming_response_update(self, update, context):
+        if self.downstream is not None:
+            await self.downstream.on_streaming_response_update(update, context)
+
+    async def on_agent_response(self, response, context):
+        self.notify(context.correlation_id, response.text)
+        if self.downstream is not None:
+            await self.downstream.on_agent_response(response, context)
+
+
+class PushAgentFunctionApp(AgentFunctionApp):
+    def __init__(self,
+                 *args,
+                 timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+                 poll_initial_seconds: float = POLL_INITIAL_SECONDS,
+                 poll_max_seconds: float = POLL_MAX_SECONDS,
+                 default_callback=None,
+                 **kwargs):
+        self.notifier = CompletionNotifier(downstream=default_callback)
+        self.timeout_seconds = timeout_seconds
+        self.poll_initial_seconds = poll_initial_seconds
+        self.poll_max_seconds = poll_max_seconds
+        super().__init__(*args, default_callback=self.notifier, **kwargs)
+
+    async def _get_response_from_entity(self, client, entity_instance_id, correlation_id: str,
+                                        message: str, thread_id: str) -> dict:
+        """알림을 기다리다 간격마다 엔티티 상태를 확인합니다. (AgentFunctionApp 의 고정 간격 폴링 대체)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout_seconds
+        future = self.notifier.register(correlation_id)
+        polls = 0
+        try:
+            for interval in backoff_intervals(self.poll_initial_seconds, self.poll_max_seconds):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    text = await asyncio.wait_for(asyncio.shield(future), min(interval, remaining))
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    result = await self._build_push_result(client, entity_instance_id, text, correlation_id,
+                                                           message, thread_id)
+                    return {**result, "completed_via": "push", "polls": polls}
+
+                polls += 1
+                result = await self._poll_entity_for_response(
+                    client=client, entity_instance_id=entity_instance_id, correlation_id=correlation_id,
+                    message=message, thread_id=thread_id,
+                )
+                if result is not None:
+                    return {**result, "completed_via": "poll", "polls": polls}
+        finally:
+            self.notifier.discard(correlation_id)
+            future.cancel()
+
+        logger.warning(f"응답 대기 시간 초과: correlation_id={correlation_id} ({self.timeout_seconds}초, 상태 조회 {polls}회)")
+        return await self._build_timeout_result(message=message, thread_id=thread_id, correlation_id=correlation_id)
+
+    async def _build_push_result(self, client, entity_instance_id, text: str, correlation_id: str,
+                                 message: str, thread_id: str) -> dict:
+        """알림으로 받은 응답을 폴링 경로(_build_success_result)와 같은 필드로 만듭니다."""
+        try:
+            state = await self._read_cached_state(client, entity_instance_id)
+        except Exception as e:
+            logger.warning(f"엔티티 상태 조회 실패, message_count 없이 응답: {str(e)}")
+            message_count = None
+        else:
+            if state is not None and state.try_get_agent_response(correlation_id):
+                return self._build_success_result(response_message=text, message=message, thread_id=thread_id,
+                                                  correlation_id=correlation_id, state=state)
+            # 알림은 엔티티가 상태를 저장하기 전에 오므로, 저장될 이번 요청 + 응답 2건을 더함
+            message_count = (state.message_count if state is not None else 0) + 2
+        return self._build_response_payload(
+            response=text, message=message, thread_id=thread_id, status="success", correlation_id=correlation_id,
+            extra_fields={ApiResponseFields.MESSAGE_COUNT: message_count},
+        )
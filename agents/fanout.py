@@ -0,0 +1,68 @@
+"""
+Fan-out - 마스터 에이전트가 한 턴에 낸 여러 하위 에이전트 호출을 동시에 실행
+
+agent_framework 는 한 응답에 담긴 function call 들을 asyncio.gather 로 함께 실행하지만,
+- 모델이 도구를 한 번에 하나씩만 부르면 (allow_multiple_tool_calls 미설정) 턴마다 순차 실행되고
+- 하위 에이전트의 도구(Gmail / Google Tasks 클라이언트)는 동기 함수라 이벤트 루프를 막아서
+  MailAgent 와 TasksAgent 를 함께 호출해도 실제로는 한쪽 HTTP 호출이 끝나야 다른 쪽이 진행됩니다.
+
+이 모듈은
+- `sub_agent_tool`: 하위 에이전트를 도구로 감싸고 분기별 타임아웃을 적용합니다.
+  시간 안에 끝나지 않은 분기는 오류 문자열을 돌려주어 나머지 분기 결과로 답변할 수 있게 합니다.
+- `offload_sync_tools`: 동기 도구를 asyncio.to_thread 로 실행해 다른 분기와 겹쳐 실행되게 합니다.
+  googleapiclient(httplib2)는 스레드 안전하지 않으므로 Gmail / Tasks 도구는 스레드마다 service 를 따로 만듭니다.
+  (tools.tool_state.ThreadLocalClient) 프로세스 공용 lock 은 모든 세션의 호출을 직렬화하므로 쓰지 않습니다.
+"""
+
+import asyncio
+import inspect
+import logging
+import functools
+
+logger = logging.getLogger(__name__)
+
+SUB_AGENT_TIMEOUT_SECONDS = 90.0
+
+
+def sub_agent_tool(agent, *, name: str, description: str,
+                   timeout: float = SUB_AGENT_TIMEOUT_SECONDS, stream_callback=None):
+    """agent.as_tool(...) 결과에 분기별 타임아웃을 적용합니다."""
+    agent_tool = agent.as_tool(name=name, description=description, stream_callback=stream_callback)
+    run_agent = agent_tool.func
+
+    @functools.wraps(run_agent)
+    async def run_with_timeout(**kwargs):
+        try:
+            return await asyncio.wait_for(run_agent(**kwargs), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"하위 에이전트 시간 초과: {name} ({timeout}초)")
+            return f"Error: {name} 가 {timeout:g}초 안에 응답하지 않았습니다. 다른 에이전트의 결과만으로 답변하세요."
+
+    agent_tool.func = run_with_timeout
+    return agent_tool
+
+
+def offload_sync_tools(tools: list, lock=None) -> list:
+    """
+    동기 도구 함수를 스레드에서 실행하는 async 함수로 바꿉니다. (functools.wraps 로 도구 이름/스키마 유지)
+    lock 을 주면 목록 안의 동기 도구 실행을 직렬화합니다. async 도구는 그대로 둡니다.
+    """
+
+    def offload(func):
+        if inspect.iscoroutinefunction(func) or not callable(func):
+            return func
+
+        def call(*args, **kwargs):
+            if lock is None:
+                return func(*args, **kwargs)
+            with lock:
+                return func(*args, **kwargs)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            # to_thread 는 컨텍스트(계측 / 도구 캐시 세션 키)를 복사해서 실행
+            return await asyncio.to_thread(call, *args, **kwargs)
+
+        return wrapper
+
+    return [offload(tool) for tool in tools]
@@ -0,0 +1,243 @@
+"""
+History Window - 긴 AG-UI 대화의 입력 기록을 토큰 예산 안으로 유지
+
+AG-UI 클라이언트는 매 요청마다 스레드의 전체 메시지(이전 도구 결과 포함)를 보냅니다.
+메일 목록(get_emails_received_today)이나 티켓 히스토리(get_ticket_history) 같은 큰 결과가
+매 턴 다시 전송되면 대화가 길어질수록 지연과 토큰 비용이 선형으로 늘어나므로, 에이전트 실행 전에
+
+1. 마지막 턴을 제외한 도구 결과(function_result)를 TOOL_RESULT_MAX_CHARS 로 자르고
+2. 기록이 budget_tokens 를 넘으면 오래된 턴을 접어(fold) 요약 메시지 하나로 바꾸며
+3. 접는 지점과 요약을 스레드별로 기억해(rolling) 다음 요청에서는 새로 접힌 턴만 요약에 더합니다.
+
+접을 때는 예산의 FOLD_TARGET_RATIO 까지 한 번에 접기 때문에 요약(= 요청 prefix)이 매 턴 바뀌지 않고,
+그 사이의 턴들은 프롬프트 캐시(agents/prompts.py)를 그대로 활용합니다.
+턴 경계는 사용자 메시지이므로 function_call 과 그 결과가 서로 떨어지지 않습니다.
+
+요약은 기본적으로 LLM 호출 없는 추출식(사용자 요청 / 답변 앞부분)이며,
+llm_summarizer(chat_client) 를 주면 접는 시점에만 LLM 으로 요약합니다. (실패 시 추출식으로 대체)
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from agent_framework import AgentMiddleware, Content, Message
+
+from tools.output_format import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_TOKENS = 6000
+FOLD_TARGET_RATIO = 0.5
+TOOL_RESULT_MAX_CHARS = 600
+SUMMARY_MAX_CHARS = 2000
+MAX_THREADS = 256
+
+SUMMARY_HEADER = "[이전 대화 요약]"
+
+Summarizer = Callable[[str, list[Message]], Awaitable[str]]
+
+
+def _message_text(message: Message) -> str:
+    parts = []
+    for content in message.contents:
+        if content.type == "text":
+            parts.append(content.text or "")
+        elif content.type == "function_call":
+            parts.append(f"{content.name}({content.arguments})")
+        elif content.type == "function_result":
+            parts.append(str(content.result))
+    return "\n".join(parts)
+
+
+def _message_tokens(message: Message) -> int:
+    return estimate_tokens(_message_text(message)) + 4
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... (이하 {len(text) - limit}자 생략)"
+
+
+def truncate_tool_results(message: Message, limit: int = TOOL_RESULT_MAX_CHARS) -> Message:
+    """function_result 를 limit 글자로 자른 복사본을 반환합니다. (자를 게 없으면 원본)"""
+    if not any(c.type == "function_result" and len(str(c.result)) > limit for c in message.contents):
+        return message
+    contents = [
+        Content.from_function_result(call_id=c.call_id, result=_truncate(str(c.result), limit))
+        if c.type == "function_result" else c
+        for c in message.contents
+    ]
+    return Message(message.role, contents, author_name=message.author_name, message_id=message.message_id,
+                   additional_properties=message.additional_properties)
+
+
+def _split_turns(messages: list[Message]) -> list[list[Message]]:
+    """사용자 메시지마다 새 턴을 시작합니다. (첫 사용자 메시지 이전 메시지는 첫 턴에 포함)"""
+    turns: list[list[Message]] = []
+    for message in messages:
+        if message.role == "user" or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def _fingerprint(messages: list[Message]) -> str:
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(message.role.encode())
+        digest.update(_message_text(message).encode("utf-8", "ignore"))
+    return digest.hexdigest()
+
+
+def extractive_summary(previous: str, messages: list[Message]) -> str:
+    """LLM 없이 턴별 사용자 요청 / 마지막 답변 앞부분으로 요약합니다. 길면 오래된 줄부터 버립니다."""
+    lines = previous.splitlines() if previous else []
+    for turn in _split_turns(messages):
+        request = next((m.text for m in turn if m.role == "user"), "")
+        answer = next((m.text for m in reversed(turn) if m.role == "assistant" and m.text), "")
+        if request:
+            lines.append(f"- 사용자: {_truncate(' '.join(request.split()), 120)}")
+        if answer:
+            lines.append(f"  답변: {_truncate(' '.join(answer.split()), 200)}")
+    while lines and len("\n".join(lines)) > SUMMARY_MAX_CHARS:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+def llm_summarizer(chat_client) -> Summarizer:
+    """접히는 턴을 이전 요약과 합쳐 LLM 으로 요약하는 함수를 만듭니다."""
+
+    async def summarize(previous: str, messages: list[Message]) -> str:
+        transcript = "\n".join(f"{m.role}: {_truncate(_message_text(m), TOOL_RESULT_MAX_CHARS)}" for m in messages)
+        response = await chat_client.get_response([
+            Message("system", text=(
+                "이전 대화 요약과 새 대화 내용을 합쳐 이후 대화에 필요한 사실(요청, 결정, 링크/키, 남은 일)만 "
+                f"한국어 bullet 로 {SUMMARY_MAX_CHARS}자 이내로 요약하세요."
+            )),
+            Message("user", text=f"이전 요약:\n{previous or '(없음)'}\n\n새 대화:\n{transcript}"),
+        ])
+        return _truncate(response.text.strip(), SUMMARY_MAX_CHARS)
+
+    return summarize
+
+
+@dataclass
+class _FoldState:
+    folded_count: int
+    fingerprint: str
+    summary: str
+
+
+class HistoryWindow:
+    def __init__(self,
+                 budget_tokens: int = DEFAULT_BUDGET_TOKENS,
+                 summarizer: Summarizer | None = None,
+                 tool_result_max_chars: int = TOOL_RESULT_MAX_CHARS):
+        self.budget_tokens = budget_tokens
+        self.summarizer = summarizer
+        self.tool_result_max_chars = tool_result_max_chars
+        # 스레드 키 -> 접은 위치 / 요약 (LRU 로 MAX_THREADS 개 유지)
+        self._states: OrderedDict[str, _FoldState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def middleware(self) -> AgentMiddleware:
+        return HistoryWindowMiddleware(self)
+
+    # -------------------------------------------------------------- #
+    def _get_state(self, thread_key: str | None) -> _FoldState | None:
+        if thread_key is None:
+            return None
+        with self._lock:
+            state = self._states.get(thread_key)
+            if state is not None:
+                self._states.move_to_end(thread_key)
+            return state
+
+    def _set_state(self, thread_key: str | None, state: _FoldState):
+        if thread_key is None:
+            return
+        with self._lock:
+            self._states[thread_key] = state
+            self._states.move_to_end(thread_key)
+            while len(self._states) > MAX_THREADS:
+                self._states.popitem(last=False)
+
+    async def _summarize(self, previous: str, messages: list[Message]) -> str:
+        if self.summarizer is not None:
+            try:
+                return await self.summarizer(previous, messages)
+            except Exception as e:
+                logger.warning(f"대화 요약 실패, 추출식 요약으로 대체: {str(e)}")
+        return extractive_summary(previous, messages)
+
+    async def apply(self, messages: list[Message], thread_key: str | None = None) -> list[Message]:
+        """예산에 맞춘 메시지 목록을 반환합니다. (입력 목록은 변경하지 않음)"""
+        leading = 0
+        while leading < len(messages) and messages[leading].role == "system":
+            leading += 1
+        system, body = messages[:leading], messages[leading:]
+        turns = _split_turns(body)
+        if len(turns) <= 1:
+            return list(messages)
+
+        # 1. 마지막 턴(이번 요청)을 제외한 도구 결과 자르기
+        turns = [[truncate_tool_results(m, self.tool_result_max_chars) for m in turn] for turn in turns[:-1]] + [turns[-1]]
+        turn_tokens = [sum(_message_tokens(m) for m in turn) for turn in turns]
+
+        # 2. 이전에 접은 위치가 이번 기록의 앞부분과 같으면 이어서 사용
+        state = self._get_state(thread_key)
+        folded_turns, summary = 0, ""
+        if state is not None and state.folded_count < len(turns):
+            if _fingerprint([m for turn in turns[:state.folded_count] for m in turn]) == state.fingerprint:
+                folded_turns, summary = state.folded_count, state.summary
+
+        def kept_tokens(start):
+            return sum(turn_tokens[start:]) + estimate_tokens(summary)
+
+        # 3. 예산을 넘으면 목표 비율까지 한 번에 접기 (마지막 턴은 항상 유지)
+        if kept_tokens(folded_turns) > self.budget_tokens:
+            target = self.budget_tokens * FOLD_TARGET_RATIO
+            new_folded = folded_turns
+            while new_folded < len(turns) - 1 and kept_tokens(new_folded) > target:
+                new_folded += 1
+            newly_folded = [m for turn in turns[folded_turns:new_folded] for m in turn]
+            summary = await self._summarize(summary, newly_folded)
+            logger.info(f"대화 기록 접기: {folded_turns} → {new_folded} 턴 (스레드 {thread_key})")
+            folded_turns = new_folded
+            self._set_state(thread_key, _FoldState(
+                folded_turns, _fingerprint([m for turn in turns[:folded_turns] for m in turn]), summary
+            ))
+
+        result = list(system)
+        if folded_turns and summary:
+            result.append(Message("system", text=f"{SUMMARY_HEADER}\n{summary}"))
+        result.extend(m for turn in turns[folded_turns:] for m in turn)
+        return result
+
+
+class HistoryWindowMiddleware(AgentMiddleware):
+    """에이전트 실행 전에 context.messages 를 HistoryWindow 로 줄입니다."""
+
+    def __init__(self, window: HistoryWindow):
+        self.window = window
+
+    @staticmethod
+    def _thread_key(session) -> str | None:
+        if session is None:
+            return None
+        # AG-UI 는 요청마다 새 AgentSession 을 만들고 스레드 ID 를 metadata 로 전달
+        metadata = getattr(session, "metadata", None) or {}
+        return metadata.get("ag_ui_thread_id") or session.session_id
+
+    async def process(self, context, call_next):
+        context.messages = await self.window.apply(context.messages, self._thread_key(context.session))
+        await call_next()
+
+
+# 하위 에이전트가 공유하는 기본 창 (추출식 요약)
+history_window = HistoryWindow()
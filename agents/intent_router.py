@@ -0,0 +1,322 @@
+"""
+Intent Router - 명확한 요청은 마스터 에이전트의 LLM 호출 없이 하위 에이전트로 바로 전달
+
+마스터 에이전트는 매 요청마다 MailAgent / TasksAgent / SDDAgent 중 하나를 고르기 위해 LLM 을 한 번 호출하고,
+하위 에이전트가 다시 자신의 LLM 호출을 합니다. JIRA 링크나 "안 읽은 메일" 같은 요청은 고를 필요가 없으므로
+다음 두 단계로 먼저 분류하고, 확신할 때만 하위 에이전트를 직접 실행합니다.
+
+1. 규칙: JIRA/GitHub 링크, 설정된 프로젝트의 이슈 키, 키워드. 정확히 한 에이전트만 매칭될 때 확정
+   (예: "메일 보고 할 일 추가해줘" 처럼 여러 에이전트가 매칭되면 마스터에게 맡김)
+2. 임베딩 분류: 에이전트별 예시 문장의 임베딩 중심(centroid)과 코사인 유사도를 비교.
+   최고 점수가 EMBEDDING_MIN_SCORE 이상이고 2위와의 차이가 EMBEDDING_MIN_MARGIN 이상일 때 확정
+
+그 외(모호함, 임베딩 설정 없음/실패)에는 기존처럼 마스터 에이전트가 처리합니다.
+
+마스터 세션은 하위 에이전트에 그대로 넘기지 않습니다. (히스토리 / 서비스 스레드 형식이 에이전트마다 다름)
+대신 마스터 세션의 state 에 하위 에이전트별 세션을 만들어 두고, 같은 대화의 다음 요청에서 이어서 사용합니다.
+"""
+
+import os
+import re
+import math
+import asyncio
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable
+
+from agent_framework import AgentSession
+from openai import AzureOpenAI
+
+logger = logging.getLogger(__name__)
+
+MAIL_AGENT = "MailAgent"
+TASKS_AGENT = "TasksAgent"
+SDD_AGENT = "SDDAgent"
+
+# 임베딩 분류 임계치 (text-embedding-3-small 기준으로 조정한 값)
+EMBEDDING_MIN_SCORE = 0.45
+EMBEDDING_MIN_MARGIN = 0.08
+EMBEDDING_TIMEOUT_SECONDS = 3.0
+
+# 마스터 세션 state 에 하위 에이전트 세션을 보관하는 키
+ROUTED_SESSIONS_STATE_KEY = "routed_sessions"
+
+# 규칙: 에이전트 이름 -> 패턴 목록 ((?i) 로 대소문자 무시)
+# 영문 키워드는 \b 단어 경계로 감싸 "multitasking" 같은 부분 일치를 막습니다.
+# (?a) 로 경계를 ASCII 기준으로 판단해야 "todo에", "mail을" 처럼 한글 조사가 붙은 경우도 매칭됩니다.
+# 이슈 키 패턴은 설정된 JIRA 프로젝트 키로만 만듭니다. (issue_key_pattern 참고)
+ROUTING_RULES: dict[str, list[str]] = {
+    SDD_AGENT: [
+        r"atlassian\.net/browse/",
+        r"github\.com/[^/\s]+/[^/\s]+/issues/\d+",
+        r"(?ia)\bjira\b|지라|사양\s*티켓|개발\s*티켓|깃허브\s*이슈|\bgithub\s*이슈|\bgithub\s+issues?\b",
+    ],
+    MAIL_AGENT: [
+        r"(?ia)메일|\b(?:e-?|g)?mails?\b|\binbox\b|받은\s*편지",
+    ],
+    TASKS_AGENT: [
+        r"(?ia)할\s*일|태스크|\btasks?\b|\btodos?\b|\bto-dos?\b",
+    ],
+}
+
+
+def issue_key_pattern(project_key: str | None) -> str | None:
+    """
+    설정된 JIRA 프로젝트 키(JIRA_PROJECT_KEY)의 이슈 키만 매칭하는 패턴. 키가 없으면 None.
+    임의의 "대문자-숫자" 를 이슈 키로 보면 GPT-4, UTF-8, COVID-19 같은 표기도 SDD 로 잘못 라우팅되기 때문.
+    """
+    if not project_key or not project_key.strip():
+        return None
+    return rf"(?<![A-Za-z0-9_-]){re.escape(project_key.strip().upper())}-\d+(?!\d)"
+
+# 임베딩 분류용 예시 문장 (에이전트별 중심 벡터 계산에 사용)
+LABELED_EXAMPLES: dict[str, list[str]] = {
+    MAIL_AGENT: [
+        "오늘 온 메일 보여줘",
+        "안 읽은 메일 제목 알려줘",
+        "최근 이메일 요약해줘",
+        "김팀장에게 회의 일정 메일 보내줘",
+        "받은 편지함에 중요한 거 있어?",
+        "show my unread emails",
+    ],
+    TASKS_AGENT: [
+        "오늘 할 일 목록 보여줘",
+        "내일까지 보고서 작성 할 일로 추가해줘",
+        "구글 태스크에 장보기 등록해줘",
+        "이번 주 마감인 태스크 알려줘",
+        "해야 할 일 정리해줘",
+        "add a todo to call the bank",
+    ],
+    SDD_AGENT: [
+        "KAN-4 사양 티켓으로 개발 티켓 만들어줘",
+        "이 지라 티켓 내용 알려줘",
+        "GitHub 이슈 목록 보여줘",
+        "사양 티켓 기반으로 이슈 등록해줘",
+        "로그인 기능 관련 티켓 히스토리 조회해줘",
+        "create a github issue for the login bug",
+    ],
+}
+
+
+@dataclass
+class RouteDecision:
+    # 확정된 하위 에이전트 이름 (None 이면 마스터 에이전트가 처리)
+    agent: str | None
+    # "rule" | "embedding" | "fallback"
+    method: str
+    score: float = 0.0
+    reason: str = ""
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def _dot(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def azure_openai_embedder() -> Callable[[list[str]], list[list[float]]] | None:
+    """
+    AISearchTools 와 같은 Azure OpenAI 임베딩 배포로 문장 목록을 한 번에 임베딩하는 함수를 만듭니다.
+    라우팅은 빠르게 포기하고 마스터로 넘기는 편이 낫기 때문에 재시도 없이 짧은 타임아웃을 사용합니다.
+    설정이 없으면 None (규칙만 사용).
+    """
+    endpoint = os.getenv("FOUNDRY_PROJECT_ENDPOINT")
+    deployment = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+    if not endpoint or not deployment:
+        return None
+
+    client = AzureOpenAI(
+        api_key=os.getenv("FOUNDRY_PROJECT_KEY"),
+        azure_endpoint=endpoint,
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
+        max_retries=0,
+        timeout=EMBEDDING_TIMEOUT_SECONDS,
+    )
+
+    def embed(texts: list[str]) -> list[list[float]]:
+        response = client.embeddings.create(input=texts, model=deployment)
+        return [item.embedding for item in response.data]
+
+    return embed
+
+
+class IntentRouter:
+    """규칙 + 임베딩 중심 매칭으로 요청을 하위 에이전트에 배정합니다."""
+
+    def __init__(self,
+                 embed: Callable[[list[str]], list[list[float]]] | None = None,
+                 rules: dict[str, list[str]] | None = None,
+                 examples: dict[str, list[str]] | None = None,
+                 min_score: float = EMBEDDING_MIN_SCORE,
+                 min_margin: float = EMBEDDING_MIN_MARGIN,
+                 project_key: str | None = None):
+        self.embed = embed
+        if rules is None:
+            rules = {agent: list(patterns) for agent, patterns in ROUTING_RULES.items()}
+            key_pattern = issue_key_pattern(project_key or os.getenv("JIRA_PROJECT_KEY"))
+            if key_pattern:
+                rules[SDD_AGENT].append(key_pattern)
+        self.rules = {
+            agent: [re.compile(pattern) for pattern in patterns]
+            for agent, patterns in rules.items()
+        }
+        self.examples = examples or LABELED_EXAMPLES
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self._centroids: dict[str, list[float]] | None = None
+        self._centroid_lock = threading.Lock()
+        # 라우팅 결과 집계 (method/agent 별 건수)
+        self.counts: Counter = Counter()
+
+    # -------------------------------------------------------------- #
+    def match_rules(self, text: str) -> set[str]:
+        return {agent for agent, patterns in self.rules.items() if any(p.search(text) for p in patterns)}
+
+    def _get_centroids(self) -> dict[str, list[float]]:
+        """예시 문장을 한 번의 배치 호출로 임베딩해 에이전트별 중심 벡터를 계산합니다. (최초 1회)"""
+        with self._centroid_lock:
+            if self._centroids is None:
+                labels = [agent for agent, texts in self.examples.items() for _ in texts]
+                vectors = self.embed([text for texts in self.examples.values() for text in texts])
+                sums: dict[str, list[float]] = {}
+                for agent, vector in zip(labels, vectors):
+                    vector = _normalize(vector)
+                    total = sums.setdefault(agent, [0.0] * len(vector))
+                    for i, v in enumerate(vector):
+                        total[i] += v
+                self._centroids = {agent: _normalize(total) for agent, total in sums.items()}
+            return self._centroids
+
+    def classify(self, text: str) -> list[tuple[str, float]]:
+        """에이전트별 코사인 유사도를 높은 순으로 반환합니다."""
+        centroids = self._get_centroids()
+        query = _normalize(self.embed([text])[0])
+        scores = [(agent, _dot(query, centroid)) for agent, centroid in centroids.items()]
+        return sorted(scores, key=lambda item: item[1], reverse=True)
+
+    def route(self, text: str) -> RouteDecision:
+        decision = self._route(text)
+        self.counts[f"{decision.method}:{decision.agent or 'master'}"] += 1
+        logger.info(f"의도 라우팅: {decision.agent or '마스터 에이전트'} ({decision.method}, {decision.reason})")
+        return decision
+
+    def _route(self, text: str) -> RouteDecision:
+        if not text or not text.strip():
+            return RouteDecision(None, "fallback", reason="빈 요청")
+
+        matched = self.match_rules(text)
+        if len(matched) == 1:
+            agent = next(iter(matched))
+            return RouteDecision(agent, "rule", 1.0, reason="규칙 매칭")
+        if len(matched) > 1:
+            return RouteDecision(None, "fallback", reason=f"여러 에이전트 매칭: {sorted(matched)}")
+
+        if self.embed is None:
+            return RouteDecision(None, "fallback", reason="임베딩 분류 비활성")
+        try:
+            scores = self.classify(text)
+        except Exception as e:
+            logger.warning(f"임베딩 분류 실패, 마스터 에이전트로 처리: {str(e)}")
+            return RouteDecision(None, "fallback", reason="임베딩 분류 실패")
+
+        (best, best_score), runner_up = scores[0], scores[1][1] if len(scores) > 1 else 0.0
+        if best_score >= self.min_score and best_score - runner_up >= self.min_margin:
+            return RouteDecision(best, "embedding", best_score, reason=f"점수 {best_score:.3f}, 차이 {best_score - runner_up:.3f}")
+        return RouteDecision(None, "fallback", best_score, reason=f"낮은 확신 ({best} {best_score:.3f}, 차이 {best_score - runner_up:.3f})")
+
+
+def _last_user_text(messages) -> str:
+    """run() 입력(str / Message / 목록)에서 마지막 사용자 메시지 텍스트를 찾습니다."""
+    if messages is None:
+        return ""
+    if isinstance(messages, str):
+        return messages
+    if not isinstance(messages, (list, tuple)):
+        messages = [messages]
+    for message in reversed(messages):
+        if isinstance(message, str):
+            return message
+        if getattr(message, "role", None) == "user":
+            return getattr(message, "text", "") or ""
+    return ""
+
+
+class IntentRoutedAgent:
+    """
+    마스터 에이전트 앞에 IntentRouter 를 두는 래퍼.
+    확정된 요청은 routes 의 하위 에이전트를 직접 실행(stream 포함)하고, 나머지는 마스터 에이전트로 넘깁니다.
+    그 외 속성은 마스터 에이전트로 위임하므로 AG-UI 엔드포인트에 그대로 넘길 수 있습니다.
+    """
+
+    def __init__(self, master, routes: dict, router: IntentRouter | None = None):
+        self.master = master
+        self.routes = routes
+        self.router = router or IntentRouter(embed=azure_openai_embedder())
+
+    def __getattr__(self, name):
+        return getattr(self.master, name)
+
+    # SupportsAgentRun 프로토콜 검사(isinstance)는 __getattr__ 를 보지 않으므로 명시적으로 위임
+    @property
+    def id(self):
+        return self.master.id
+
+    @property
+    def name(self):
+        return self.master.name
+
+    @property
+    def description(self):
+        return self.master.description
+
+    def create_session(self, **kwargs):
+        return self.master.create_session(**kwargs)
+
+    def get_session(self, *, service_session_id, **kwargs):
+        return self.master.get_session(service_session_id=service_session_id, **kwargs)
+
+    async def _select(self, messages, kwargs: dict):
+        """실행할 에이전트와 run() 인자를 정합니다. 하위 에이전트로 가면 session 을 하위 에이전트 세션으로 바꿉니다."""
+        # 임베딩 호출은 동기 HTTP 이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        decision = await asyncio.to_thread(self.router.route, _last_user_text(messages))
+        agent = self.routes.get(decision.agent, self.master)
+        if agent is self.master:
+            return agent, kwargs
+
+        kwargs = dict(kwargs)
+        master_session = kwargs.pop("session", None)
+        if master_session is not None:
+            kwargs["session"] = self._routed_session(master_session, decision.agent, agent)
+        return agent, kwargs
+
+    @staticmethod
+    def _routed_session(master_session, agent_name: str, agent):
+        """마스터 세션에 딸린 하위 에이전트 세션 (없으면 생성)"""
+        sessions = master_session.state.setdefault(ROUTED_SESSIONS_STATE_KEY, {})
+        session = sessions.get(agent_name)
+        if isinstance(session, dict):
+            # 마스터 세션을 to_dict()/from_dict() 로 복원하면 dict 로 돌아옴
+            session = AgentSession.from_dict(session)
+        if session is None:
+            session = agent.create_session()
+        sessions[agent_name] = session
+        return session
+
+    def run(self, messages=None, *, stream: bool = False, **kwargs):
+        if stream:
+            return self._run_stream(messages, **kwargs)
+        return self._run(messages, **kwargs)
+
+    async def _run(self, messages, **kwargs):
+        agent, kwargs = await self._select(messages, kwargs)
+        return await agent.run(messages, **kwargs)
+
+    async def _run_stream(self, messages, **kwargs):
+        agent, kwargs = await self._select(messages, kwargs)
+        async for update in agent.run(messages, stream=True, **kwargs):
+            yield update
@@ -11,6 +11,11 @@ from agent_framework import Agent
 from agent_framework.azure import AzureOpenAIChatClient
 from azure.identity import DefaultAzureCredential
 from tools.gmail_tools import GmailAutomationTools
+from tools.memoize import SessionCacheMiddleware, tool_cache
+from agents.prompts import MAIL_INSTRUCTIONS
+from agents.prompt_cache import prompt_cache_meter
+from agents.history import history_window
+from agents.fanout import offload_sync_tools
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,18 +31,19 @@ def create_mail_agent():
     return Agent(
         client=chat_client,
         name="Email-Agent",
-        instructions="""이메일을 조회하고 분석하는 전문가입니다. 
-        1. 사용자의 요청에 따라 메일을 조회합니다. (기간 명시 없을시 오늘의 메일을 조회) 
-        2. 메일의 제목과 요약 내용을 읽고, 사용자가 직접 수행해야 하거나 기억해야 할 '할 일(Task)'을 식별합니다.
-        3. 필요한경우 메일을 발송할 수도 있습니다. 
-        4. 메일 발송 시에는 이메일 주소, 제목, 본문을 명확히 작성하여 보내도록 합니다. 필요한 경우 사용자에게 요청합니다.
-        """,
-        tools=[
-            gmail_tools.get_unread_email_titles,
-            gmail_tools.get_emails_received_today,
-            gmail_tools.get_recent_emails,
+        instructions=MAIL_INSTRUCTIONS,
+        # 동기 도구는 스레드에서 실행해 마스터가 동시에 부른 다른 하위 에이전트와 겹쳐 실행되게 함
+        # (Gmail service 는 스레드마다 따로 만들어지므로 lock 없이 다른 세션의 호출과도 겹쳐 실행됨)
+        tools=offload_sync_tools([
+            # 같은 대화 안의 반복 조회는 캐시 (새 메일 반영을 위해 TTL 은 짧게)
+            tool_cache.read(gmail_tools.get_unread_email_titles, ttl=60),
+            tool_cache.read(gmail_tools.get_emails_received_today, ttl=60),
+            tool_cache.read(gmail_tools.get_recent_emails, ttl=60),
+            # 메일 본문은 바뀌지 않으므로 기본 TTL
+            tool_cache.read(gmail_tools.get_email_body),
             gmail_tools.send_email
-        ]
+        ]),
+        middleware=[history_window.middleware(), SessionCacheMiddleware(), prompt_cache_meter.middleware("Email-Agent")]
     )
 
 async def main():
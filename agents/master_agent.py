@@ -15,6 +15,13 @@ from azure.identity import DefaultAzureCredential
 from agents.mail_agent import create_mail_agent
 from agents.task_agent import create_tasks_agent
 from agents.sdd import create_sdd_agent
+from agents.intent_router import IntentRoutedAgent, MAIL_AGENT, TASKS_AGENT, SDD_AGENT
+from agents.fanout import sub_agent_tool
+from agents.streaming import StreamingAgent, sub_agent_stream_callback
+from tools.memoize import SessionCacheMiddleware
+from agents.prompts import MASTER_INSTRUCTIONS
+from agents.prompt_cache import prompt_cache_meter
+from agents.history import HistoryWindow, llm_summarizer
 from agent_framework_ag_ui import add_agent_framework_fastapi_endpoint
 
 # 로깅 설정
@@ -29,30 +36,51 @@ def create_master_agent():
     
     # 각 하위 에이전트를 도구로 변환
     # Tip: 하위 에이전트 생성 시에도 같은 chat_client를 전달하면 리소스를 아낄 수 있습니다.
-    mail_agent_tool = create_mail_agent().as_tool(
-        name="MailAgent",
-        description="이메일 조회, 분석 및 발송 작업을 수행합니다."
+    # stream_callback: 하위 에이전트를 스트리밍으로 실행하고 토큰/도구 진행 이벤트를 마스터 스트림으로 전달
+    # sub_agent_tool: 분기별 타임아웃 (한 에이전트가 늦어도 나머지 결과로 답변)
+    mail_agent = create_mail_agent()
+    tasks_agent = create_tasks_agent()
+    sdd_agent = create_sdd_agent()
+
+    mail_agent_tool = sub_agent_tool(
+        mail_agent,
+        name=MAIL_AGENT,
+        description="이메일 조회, 분석 및 발송 작업을 수행합니다.",
+        stream_callback=sub_agent_stream_callback(MAIL_AGENT),
     )
     
-    tasks_agent_tool = create_tasks_agent().as_tool(
-        name="TasksAgent",
-        description="구글 태스크(할 일) 조회 및 관리 작업을 수행합니다."
+    tasks_agent_tool = sub_agent_tool(
+        tasks_agent,
+        name=TASKS_AGENT,
+        description="구글 태스크(할 일) 조회 및 관리 작업을 수행합니다.",
+        stream_callback=sub_agent_stream_callback(TASKS_AGENT),
     )
     
-    code_agent = create_sdd_agent().as_tool(
-        name="SDDAgent",
-        description="JIRA와 GitHub 이슈를 통합으로 관리하는 에이전트입니다. 이슈 조회 / 생성 / 티켓 기반 서비스 히스토리 조회도 가능합니다. jira 사양 티켓 기반으로 개발 티켓을 생성하고 issue를 등록해줍니다."
+    code_agent = sub_agent_tool(
+        sdd_agent,
+        name=SDD_AGENT,
+        description="JIRA와 GitHub 이슈를 통합으로 관리하는 에이전트입니다. 이슈 조회 / 생성 / 티켓 기반 서비스 히스토리 조회도 가능합니다. jira 사양 티켓 기반으로 개발 티켓을 생성하고 issue를 등록해줍니다.",
+        stream_callback=sub_agent_stream_callback(SDD_AGENT),
     )
     
-    return Agent(
+    # run(stream=True) 에서 마스터 에이전트 스트림과 하위 에이전트 업데이트를 합쳐서 내보냄
+    master_agent = StreamingAgent(Agent(
         client=chat_client,
         name="Master-Agent",
-        instructions="""당신은 이메일과 태스크를 관리하는 통합 비서입니다. 
-        1. 이메일 관련 요청은 MailAgent를 통해 처리하세요.
-        2. 할 일(태스크) 관련 요청은 TasksAgent를 통해 처리하세요.
-        3. 두 정보를 조합해 사용자에게 최적화된 비서 업무를 수행하세요.
-        """,
-        tools=[mail_agent_tool, tasks_agent_tool, code_agent]
+        instructions=MASTER_INSTRUCTIONS,
+        tools=[mail_agent_tool, tasks_agent_tool, code_agent],
+        # 한 턴에 여러 도구 호출 허용 → 프레임워크가 함께 실행 (지연 = 가장 느린 분기)
+        default_options={"allow_multiple_tool_calls": True},
+        # 긴 AG-UI 대화는 오래된 턴을 요약으로 접어 토큰 예산 안으로 유지 (접는 시점에만 LLM 요약)
+        # 대화(세션) 단위 도구 결과 캐시 키 설정 - 하위 에이전트 도구 호출에도 전달됨
+        middleware=[HistoryWindow(summarizer=llm_summarizer(chat_client)).middleware(),
+                    SessionCacheMiddleware(), prompt_cache_meter.middleware("Master-Agent")]
+    ))
+
+    # 명확한 요청(JIRA 링크, "안 읽은 메일" 등)은 마스터 LLM 호출 없이 하위 에이전트로 바로 전달
+    return IntentRoutedAgent(
+        master_agent,
+        routes={MAIL_AGENT: mail_agent, TASKS_AGENT: tasks_agent, SDD_AGENT: sdd_agent},
     )
 
 async def main():
@@ -79,19 +107,17 @@ async def main():
         logger.info("⏳ 처리 중...")
 
         try:
-            # 👈 RC1에서 agent.run()은 AgentResponse 객체를 반환합니다.
-            response = await agent.run(user_input)
-            
-            # 👈 에이전트의 마지막 응답 텍스트를 추출하는 가장 안전한 방법
-            # AgentResponse는 여러 개의 메시지를 담고 있을 수 있으므로 마지막 메시지의 텍스트를 가져옵니다.
-            final_text = ""
-            if response.messages:
-                last_msg = response.messages[-1]
-                # last_msg.text는 DurableAgentStateMessage의 편리한 속성입니다.
-                final_text = getattr(last_msg, "text", str(last_msg))
-
-            logger.info("-" * 50)
-            print(f"\n✨ [Agent]: {final_text}")
+            # 토큰이 도착하는 대로 출력 (하위 에이전트 출력은 [에이전트 이름] 으로 구분)
+            author = None
+            print("\n✨ [Agent]:", end="", flush=True)
+            async for update in agent.run(user_input, stream=True):
+                if not update.text:
+                    continue
+                if update.author_name != author:
+                    author = update.author_name
+                    print(f"\n  [{author or agent.name}] ", end="", flush=True)
+                print(update.text, end="", flush=True)
+            print()
             logger.info("-" * 50)
             
         except Exception as e:
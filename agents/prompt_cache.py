@@ -0,0 +1,121 @@
+"""
+Prompt Cache Meter - 에이전트별 캐시된 / 캐시되지 않은 입력 토큰 집계
+
+Azure OpenAI 응답의 usage.prompt_tokens_details.cached_tokens 는 agent_framework 에서
+usage_details["prompt/cached_tokens"] 로 전달됩니다. 각 에이전트에 ChatMiddleware 를 붙여
+LLM 호출마다 입력 토큰과 캐시 적중 토큰을 모읍니다. (스트리밍 응답은 마지막 usage 업데이트에서 집계)
+
+    middleware=[SessionCacheMiddleware(), prompt_cache_meter.middleware("Email-Agent")]
+
+    print(prompt_cache_meter.format_report())
+
+prefix_fingerprint(agent) 는 instructions + 도구 스키마의 해시와 길이를 반환합니다.
+실행 사이에 해시가 바뀌면 (도구 순서 / 설명 변경 등) 캐시가 처음부터 다시 쌓입니다.
+"""
+
+import json
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, asdict
+
+from agent_framework import ChatMiddleware
+
+logger = logging.getLogger(__name__)
+
+CACHED_TOKENS_KEY = "prompt/cached_tokens"
+
+
+@dataclass
+class PromptCacheStats:
+    calls: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def uncached_tokens(self) -> int:
+        return self.input_tokens - self.cached_tokens
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+
+class _PromptCacheMiddleware(ChatMiddleware):
+    def __init__(self, meter: "PromptCacheMeter", agent_name: str):
+        self.meter = meter
+        self.agent_name = agent_name
+
+    async def process(self, context, call_next):
+        if context.stream:
+            def record_usage(update):
+                for content in update.contents:
+                    if content.type == "usage":
+                        self.meter.record(self.agent_name, content.usage_details)
+                return update
+            context.stream_transform_hooks.append(record_usage)
+            await call_next()
+            return
+
+        await call_next()
+        if context.result is not None:
+            self.meter.record(self.agent_name, context.result.usage_details)
+
+
+class PromptCacheMeter:
+    def __init__(self):
+        self._stats: dict[str, PromptCacheStats] = {}
+        self._lock = threading.Lock()
+
+    def middleware(self, agent_name: str) -> ChatMiddleware:
+        """agent_name 으로 집계하는 ChatMiddleware 를 만듭니다."""
+        return _PromptCacheMiddleware(self, agent_name)
+
+    def record(self, agent_name: str, usage: dict | None):
+        if not usage:
+            return
+        with self._lock:
+            stats = self._stats.setdefault(agent_name, PromptCacheStats())
+            stats.calls += 1
+            stats.input_tokens += usage.get("input_token_count") or 0
+            stats.cached_tokens += usage.get(CACHED_TOKENS_KEY) or 0
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def report(self) -> dict[str, dict]:
+        """에이전트 이름 -> {calls, input_tokens, cached_tokens, uncached_tokens, hit_ratio}"""
+        with self._lock:
+            return {
+                name: {**asdict(stats), "uncached_tokens": stats.uncached_tokens, "hit_ratio": round(stats.hit_ratio, 4)}
+                for name, stats in sorted(self._stats.items())
+            }
+
+    def format_report(self) -> str:
+        lines = [f"{'agent':<24}{'calls':>7}{'input':>10}{'cached':>10}{'uncached':>10}{'hit':>8}"]
+        for name, row in self.report().items():
+            lines.append(
+                f"{name:<24}{row['calls']:>7}{row['input_tokens']:>10}{row['cached_tokens']:>10}"
+                f"{row['uncached_tokens']:>10}{row['hit_ratio']:>8.1%}"
+            )
+        return "\n".join(lines)
+
+
+def prefix_fingerprint(agent) -> dict:
+    """에이전트 요청 prefix(instructions + 도구 스키마)의 해시와 크기(문자 수)"""
+    options = getattr(agent, "default_options", None) or {}
+    tools = [tool.to_json_schema_spec() if hasattr(tool, "to_json_schema_spec") else str(tool)
+             for tool in options.get("tools") or []]
+    prefix = json.dumps({"instructions": options.get("instructions"), "tools": tools},
+                        ensure_ascii=False, sort_keys=True)
+    return {
+        "sha256": hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16],
+        "instructions_chars": len(options.get("instructions") or ""),
+        "prefix_chars": len(prefix),
+        "tools": len(tools),
+    }
+
+
+# agents/*.py 가 공유하는 기본 측정기
+prompt_cache_meter = PromptCacheMeter()
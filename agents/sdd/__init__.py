@@ -4,7 +4,11 @@ JIRA와 GitHub 통합 이슈 관리 Agent
 """
 
 from agents.sdd.sdd_agent import create_sdd_agent
+from agents.sdd.sdd_pipeline import SDDPipeline, SDDPipelineResult, create_sdd_pipeline
 
 __all__ = [
-    "create_sdd_agent"
+    "create_sdd_agent",
+    "create_sdd_pipeline",
+    "SDDPipeline",
+    "SDDPipelineResult",
 ]
@@ -14,6 +14,12 @@ from agent_framework.azure import AzureOpenAIChatClient
 from tools.jira_tools import JiraAutomationTools
 from tools.github_tools import GitHubAutomationTools
 from tools.ai_search_tools import AISearchTools
+from agents.sdd.sdd_pipeline import SDDPipeline
+from tools.memoize import SessionCacheMiddleware, tool_cache
+from agents.prompts import SDD_INSTRUCTIONS
+from agents.prompt_cache import prompt_cache_meter
+from agents.history import history_window
+from agents.fanout import offload_sync_tools
 
 
 def create_sdd_agent():
@@ -38,55 +44,31 @@ def create_sdd_agent():
         deployment_name=os.environ.get("AZURE_OPENAI_DEPLOYMENT_NAME"),
         endpoint=os.environ.get("FOUNDRY_PROJECT_ENDPOINT"),
     )
+
+    # 사양 티켓 처리 흐름 전체를 코드로 실행하는 파이프라인 (LLM 은 문안 작성에 1회만 사용)
+    pipeline = SDDPipeline(jira_tools, github_tools, ai_search_tools, chat_client=client)
     
     agent = client.as_agent(
         name="Coding Agent",
-        instructions="""당신은 JIRA와 GitHub 이슈를 통합으로 관리하는 도움이 되는 어시스턴트입니다.
-
-당신의 역할:
-- JIRA 이슈를 생성, 수정, 조회할 수 있습니다.
-- GitHub Issue를 생성, 수정, 조회할 수 있습니다.
-
-## 처리 흐름
-
-사용자가 사양 티켓 링크를 입력하면 아래 순서대로 처리하세요:
-
-### 1단계: 사양 티켓 내용 조회
-- `get_jira_issue`를 사용하여 사양 티켓의 description을 가져옵니다.
-
-### 2단계: 기존 티켓 검색
-- `search_similar_tickets`를 사용하여 사양 티켓의 description으로 유사한 기존 개발 티켓을 검색합니다.
-- 유사 티켓이 이미 존재하면: 기존 개발 티켓 링크와 GitHub 이슈 링크, 티켓 내용을 사용자에게 반환하고 종료합니다.
-
-### 3단계: 새 티켓 생성 (기존 티켓이 없는 경우)
-- `create_jira_issue`를 사용하여 사양 내용 기반 개발 티켓("개발" 타입)을 생성합니다.
-- `create_github_issue`를 사용하여 개발 티켓 내용 기반 GitHub 이슈를 생성합니다.
-
-### 4단계: 결과 저장
-- `save_ticket_mapping`을 사용하여 아래 정보를 저장합니다:
-  - 사양 티켓 링크
-  - 사양 티켓 내용(description)
-  - 생성된 개발 티켓 링크
-  - 생성된 GitHub 이슈 링크
-
-### 히스토리 조회
-- 사용자가 히스토리/이력을 요청하면 `get_ticket_history`를 사용하여 최근 티켓 기록을 보여줍니다.
-- 기본 5개를 반환하며, 사용자가 더 많은 수를 요청하면 해당 수만큼 반환합니다.
-
-명확하고 유용한 이슈를 작성해야 합니다. 기술적인 내용보다는 어떤 기능이 필요한 지에 초점을 맞춰 작성하세요. 
-사양 티켓의 description을 최대한 활용하여 이슈를 작성하되, 불필요한 내용은 제거하고 실제 개발에 도움이 되도록 작성하는 것이 좋습니다.
-""",
-        tools=[
+        instructions=SDD_INSTRUCTIONS,
+        # 동기 도구는 스레드에서 실행해 마스터가 동시에 부른 다른 하위 에이전트와 겹쳐 실행되게 함
+        # (requests / PyGithub / Azure SDK 클라이언트는 스레드 안전하므로 lock 없음)
+        tools=offload_sync_tools([
+            # 매핑을 새로 저장하는 도구는 유사 티켓 검색 / 히스토리 캐시를 비움
+            tool_cache.write(pipeline.process_spec_ticket, evicts=["search_similar_tickets", "get_ticket_history"]),
+            tool_cache.write(pipeline.ticket_tools.create_dev_ticket_and_issue,
+                             evicts=["search_similar_tickets", "get_ticket_history"]),
             jira_tools.create_jira_issue,
-            jira_tools.update_jira_issue,
-            jira_tools.get_jira_issue,
+            tool_cache.write(jira_tools.update_jira_issue, evicts={"get_jira_issue": "issue_key"}),
+            tool_cache.read(jira_tools.get_jira_issue),
             github_tools.create_github_issue,
             github_tools.add_pr_comment,
-            github_tools.get_issue,
-            ai_search_tools.search_similar_tickets,
-            ai_search_tools.save_ticket_mapping,
-            ai_search_tools.get_ticket_history,
-        ]
+            tool_cache.read(github_tools.get_issue),
+            tool_cache.read(ai_search_tools.search_similar_tickets),
+            tool_cache.write(ai_search_tools.save_ticket_mapping, evicts=["search_similar_tickets", "get_ticket_history"]),
+            tool_cache.read(ai_search_tools.get_ticket_history),
+        ]),
+        middleware=[history_window.middleware(), SessionCacheMiddleware(), prompt_cache_meter.middleware("Coding Agent")]
     )
     
     return agent
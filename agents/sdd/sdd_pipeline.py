@@ -0,0 +1,235 @@
+"""
+SDD Pipeline - 사양 티켓 처리 흐름을 LLM 오케스트레이션 없이 코드로 실행
+
+create_sdd_agent 의 고정된 4단계 흐름(사양 조회 → 유사 티켓 검색 → 개발 티켓/GitHub 이슈 생성 → 매핑 저장)은
+단계마다 다음 도구를 고르기 위한 chat completion 왕복이 필요합니다.
+이 모듈은 결정적인 단계를 직접 호출하고, LLM 은 개발 티켓 문안 작성에 한 번만 사용합니다.
+JIRA 개발 티켓과 GitHub 이슈 생성은 서로 의존하지 않으므로 동시에 실행합니다. (tools/sdd_tools.py)
+
+사용:
+- 코드에서: `await create_sdd_pipeline().run("https://xxx.atlassian.net/browse/KAN-4")`
+- 에이전트 도구로: `pipeline.process_spec_ticket` (SDD Agent 에 등록되어 있음)
+"""
+
+import os
+import re
+import time
+import asyncio
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Annotated
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+from agent_framework import Message
+from agent_framework.azure import AzureOpenAIChatClient
+
+from tools.jira_tools import JiraAutomationTools
+from tools.github_tools import GitHubAutomationTools
+from tools.ai_search_tools import AISearchTools
+from tools.sdd_tools import SDDTicketTools, TicketCreationError
+
+logger = logging.getLogger(__name__)
+
+_ISSUE_KEY_PATTERN = re.compile(r"([A-Z][A-Z0-9_]+-\d+)")
+
+DRAFT_INSTRUCTIONS = """당신은 JIRA 사양 티켓을 개발 티켓으로 옮겨 쓰는 작성자입니다.
+사양 티켓의 description 을 최대한 활용하되 불필요한 내용은 제거하고, 기술적인 내용보다는
+어떤 기능이 필요한지에 초점을 맞춰 실제 개발에 도움이 되도록 작성하세요.
+- title: 개발 티켓 제목 (한 줄)
+- body: 개발 티켓 본문 (요구 기능, 완료 조건 위주)
+이 문안은 JIRA 개발 티켓과 GitHub 이슈에 그대로 사용됩니다."""
+
+
+class DevTicketDraft(BaseModel):
+    """LLM 이 작성하는 개발 티켓 문안 (JIRA 개발 티켓과 GitHub 이슈에 공통 사용)"""
+    title: str = Field(description="개발 티켓 제목")
+    body: str = Field(description="개발 티켓 본문")
+
+
+@dataclass
+class SDDPipelineResult:
+    spec_key: str
+    spec_link: str | None = None
+    # "existing": 유사 티켓 존재 / "created": 새로 생성 / "failed": 중간 단계 실패
+    status: str = "failed"
+    dev_ticket_link: str | None = None
+    github_issue_link: str | None = None
+    similar: list[dict] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+    def to_text(self) -> str:
+        """에이전트 도구 응답용 요약 문자열"""
+        if self.status == "existing":
+            lines = [f"✅ 유사한 기존 티켓 {len(self.similar)}개가 있어 새로 생성하지 않았습니다. (사양: {self.spec_key})"]
+            for i, item in enumerate(self.similar, 1):
+                lines.append(f"\n[{i}] 유사도 점수: {item['score']:.4f}")
+                lines.append(f"    사양 티켓: {item['spec_ticket_link']}")
+                lines.append(f"    개발 티켓: {item['dev_ticket_link']}")
+                lines.append(f"    GitHub 이슈: {item['github_issue_link']}")
+            return "\n".join(lines)
+
+        if self.status == "created":
+            lines = [
+                f"✅ 사양 티켓 {self.spec_key} 기반 개발 티켓과 GitHub 이슈를 생성했습니다.",
+                f"  사양 티켓: {self.spec_link}",
+                f"  개발 티켓: {self.dev_ticket_link}",
+                f"  GitHub 이슈: {self.github_issue_link}",
+            ]
+        else:
+            lines = [f"❌ 사양 티켓 {self.spec_key} 처리 중 오류가 발생했습니다."]
+            if self.dev_ticket_link:
+                lines.append(f"  생성된 개발 티켓: {self.dev_ticket_link}")
+            if self.github_issue_link:
+                lines.append(f"  생성된 GitHub 이슈: {self.github_issue_link}")
+        lines.extend(f"  - {error}" for error in self.errors)
+        return "\n".join(lines)
+
+
+def parse_issue_key(spec_ticket: str) -> str:
+    """JIRA 링크 또는 키 문자열에서 이슈 키(예: KAN-4)를 추출합니다."""
+    match = _ISSUE_KEY_PATTERN.search(spec_ticket or "")
+    if not match:
+        raise ValueError(f"JIRA 이슈 키를 찾을 수 없습니다: {spec_ticket}")
+    return match.group(1)
+
+
+class SDDPipeline:
+    """
+    사양 티켓 하나를 개발 티켓 + GitHub 이슈 + 매핑으로 처리하는 파이프라인.
+    chat_client 가 없으면 LLM 없이 사양 티켓 요약/본문을 그대로 문안으로 사용합니다.
+    """
+
+    def __init__(self,
+                 jira_tools: JiraAutomationTools | None = None,
+                 github_tools: GitHubAutomationTools | None = None,
+                 ai_search_tools: AISearchTools | None = None,
+                 chat_client: AzureOpenAIChatClient | None = None):
+        self.jira_tools = jira_tools or JiraAutomationTools()
+        self.github_tools = github_tools or GitHubAutomationTools()
+        self.ai_search_tools = ai_search_tools or AISearchTools()
+        self.ticket_tools = SDDTicketTools(self.jira_tools, self.github_tools, self.ai_search_tools)
+        self.chat_client = chat_client
+
+    @staticmethod
+    @contextmanager
+    def _timed(result: SDDPipelineResult, step: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            result.timings_ms[step] = round((time.perf_counter() - started) * 1000, 2)
+
+    async def draft_dev_ticket(self, spec: dict) -> DevTicketDraft:
+        """개발 티켓 문안 작성 (LLM 호출 1회). 실패하면 사양 티켓 내용으로 대체합니다."""
+        fallback = DevTicketDraft(title=f"[개발] {spec['summary']}", body=spec["description"])
+        if self.chat_client is None:
+            return fallback
+
+        try:
+            response = await self.chat_client.get_response(
+                [
+                    Message("system", text=DRAFT_INSTRUCTIONS),
+                    Message("user", text=f"사양 티켓 요약: {spec['summary']}\n\n사양 티켓 내용:\n{spec['description']}"),
+                ],
+                options={"response_format": DevTicketDraft},
+            )
+            if isinstance(response.value, DevTicketDraft):
+                return response.value
+            logger.warning("개발 티켓 문안 파싱 실패, 사양 티켓 내용으로 대체")
+        except Exception as e:
+            logger.warning(f"개발 티켓 문안 작성 실패, 사양 티켓 내용으로 대체: {str(e)}")
+        return fallback
+
+    async def run(self, spec_ticket: str) -> SDDPipelineResult:
+        """사양 티켓 링크(또는 키)를 받아 전체 흐름을 실행합니다."""
+        try:
+            spec_key = parse_issue_key(spec_ticket)
+        except ValueError as e:
+            return SDDPipelineResult(spec_key=spec_ticket, errors=[str(e)])
+
+        result = SDDPipelineResult(spec_key=spec_key)
+        logger.info(f"SDD 파이프라인 시작: {spec_key}")
+
+        try:
+            # 1단계: 사양 티켓 조회
+            with self._timed(result, "get_spec"):
+                spec = await asyncio.to_thread(self.jira_tools.fetch_issue, spec_key)
+            result.spec_link = spec["link"]
+
+            # 2단계: 유사 티켓 검색 → 있으면 종료
+            with self._timed(result, "search_similar"):
+                result.similar = await asyncio.to_thread(self.ai_search_tools.find_similar_tickets, spec["description"])
+            if result.similar:
+                result.status = "existing"
+                return result
+
+            # 3단계: 문안 작성(LLM 1회) 후 JIRA / GitHub 동시 생성 (SDDTicketTools)
+            with self._timed(result, "draft"):
+                draft = await self.draft_dev_ticket(spec)
+
+            # 4단계: 매핑 저장은 생성과 하나의 작업으로 처리 (부분 실패 시 보상)
+            with self._timed(result, "create_and_save"):
+                try:
+                    created = await asyncio.to_thread(
+                        self.ticket_tools.create_linked_tickets,
+                        spec["link"], spec["description"], draft.title, draft.body,
+                    )
+                except TicketCreationError as e:
+                    result.errors.append(str(e))
+                    result.errors.extend(f"되돌림: {item}" for item in e.compensated)
+                    return result
+            result.dev_ticket_link = created["dev_ticket_link"]
+            result.github_issue_link = created["github_issue_link"]
+
+            if created["status"] == "existing":
+                # 유사도 검색에는 걸리지 않았지만 같은 사양 링크로 이미 매핑됨 (재시도 등)
+                result.similar = [{"score": 1.0, "spec_ticket_link": spec["link"], **created}]
+            result.status = created["status"]
+            return result
+
+        except Exception as e:
+            logger.error(f"SDD 파이프라인 실패: {spec_key} - {str(e)}", exc_info=True)
+            result.errors.append(str(e))
+            return result
+
+        finally:
+            logger.info(f"SDD 파이프라인 종료: {spec_key} ({result.status}) {result.timings_ms}")
+
+    async def process_spec_ticket(self,
+        spec_ticket_link: Annotated[str, Field(description="JIRA 사양 티켓 링크 또는 키 (예: https://xxx.atlassian.net/browse/KAN-4)")]
+    ) -> str:
+        """
+        사양 티켓 하나를 끝까지 처리합니다: 사양 조회 → 유사 티켓 검색 → (없으면) 개발 티켓과 GitHub 이슈 동시 생성 → 매핑 저장.
+        유사 티켓이 이미 있으면 기존 링크를 반환하고 새로 생성하지 않습니다.
+        """
+        return (await self.run(spec_ticket_link)).to_text()
+
+
+def create_sdd_pipeline(chat_client: AzureOpenAIChatClient | None = None) -> SDDPipeline:
+    """환경 변수 설정으로 도구와 (문안 작성용) chat client 를 만들어 파이프라인을 생성합니다."""
+    if chat_client is None and os.environ.get("AZURE_OPENAI_DEPLOYMENT_NAME"):
+        chat_client = AzureOpenAIChatClient(
+            api_key=os.environ.get("FOUNDRY_PROJECT_KEY"),
+            deployment_name=os.environ.get("AZURE_OPENAI_DEPLOYMENT_NAME"),
+            endpoint=os.environ.get("FOUNDRY_PROJECT_ENDPOINT"),
+        )
+    return SDDPipeline(chat_client=chat_client)
+
+
+async def main():
+    """SDD 파이프라인 테스트용 메인 함수"""
+    load_dotenv(override=True)
+
+    pipeline = create_sdd_pipeline()
+    link = input("jira 사양 link 입력하세요.")
+
+    result = await pipeline.run(link)
+    print(result.to_text())
+    print(f"단계별 소요 시간(ms): {result.timings_ms}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+Streaming - 하위 에이전트 토큰/도구 진행 이벤트를 마스터 에이전트 스트림으로 전달
+
+as_tool 로 감싼 하위 에이전트는 최종 텍스트만 상위 에이전트에 돌려주기 때문에, 마스터 에이전트를
+stream=True 로 실행해도 하위 에이전트(SDDAgent 의 여러 단계 등)가 끝날 때까지 클라이언트는 아무것도 받지 못합니다.
+
+- `sub_agent_stream_callback(name)` 을 as_tool(stream_callback=...) 에 넘기면 하위 에이전트가 스트리밍으로
+  실행되고, 각 업데이트(텍스트 토큰, function_call / function_result)가 현재 요청의 큐로 전달됩니다.
+- `StreamingAgent(agent)` 는 마스터 에이전트의 스트림과 큐에 쌓인 하위 에이전트 업데이트를 도착 순서대로 합쳐
+  하나의 스트림으로 내보냅니다. AG-UI 엔드포인트(add_agent_framework_fastapi_endpoint)와 로컬 main() 이 사용합니다.
+
+큐는 ContextVar 로 요청(스트림)마다 분리되며, 스트리밍이 아닌 실행에서는 콜백이 아무것도 하지 않습니다.
+"""
+
+import asyncio
+import logging
+from contextvars import ContextVar
+
+from agent_framework import AgentResponseUpdate
+
+logger = logging.getLogger(__name__)
+
+_update_queue: ContextVar[asyncio.Queue | None] = ContextVar("sub_agent_update_queue", default=None)
+
+_DONE = object()
+
+
+class _StreamFailure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def sub_agent_stream_callback(agent_name: str):
+    """as_tool(stream_callback=...) 용 콜백. 업데이트에 작성자(하위 에이전트 이름)를 채워 현재 요청 큐로 보냅니다."""
+
+    def forward(update: AgentResponseUpdate) -> None:
+        queue = _update_queue.get()
+        if queue is None:
+            return
+        if not update.author_name:
+            update.author_name = agent_name
+        queue.put_nowait(update)
+
+    return forward
+
+
+class StreamingAgent:
+    """
+    에이전트를 감싸 run(stream=True) 에 하위 에이전트 업데이트를 합쳐서 내보냅니다.
+    그 외 속성(name, default_options, client 등)은 감싼 에이전트로 위임하므로 AG-UI 에 그대로 넘길 수 있습니다.
+    """
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    def __getattr__(self, name):
+        return getattr(self.agent, name)
+
+    # SupportsAgentRun 프로토콜 검사(isinstance)는 __getattr__ 를 보지 않으므로 명시적으로 위임
+    @property
+    def id(self):
+        return self.agent.id
+
+    @property
+    def name(self):
+        return self.agent.name
+
+    @property
+    def description(self):
+        return self.agent.description
+
+    def create_session(self, **kwargs):
+        return self.agent.create_session(**kwargs)
+
+    def get_session(self, *, service_session_id, **kwargs):
+        return self.agent.get_session(service_session_id=service_session_id, **kwargs)
+
+    def run(self, messages=None, *, stream: bool = False, **kwargs):
+        if not stream:
+            return self.agent.run(messages, **kwargs)
+        return self._merged_stream(messages, **kwargs)
+
+    async def _merged_stream(self, messages, **kwargs):
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def pump():
+            try:
+                async for update in self.agent.run(messages, stream=True, **kwargs):
+                    queue.put_nowait(update)
+            except Exception as e:
+                queue.put_nowait(_StreamFailure(e))
+            finally:
+                queue.put_nowait(_DONE)
+
+        # 태스크가 생성 시점의 컨텍스트를 복사하므로, 도구 호출(하위 에이전트 콜백)에서도 같은 큐를 보게 됨
+        token = _update_queue.set(queue)
+        try:
+            task = asyncio.create_task(pump())
+        finally:
+            _update_queue.reset(token)
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _StreamFailure):
+                    raise item.error
+                yield item
+        finally:
+            if not task.done():
+                # 클라이언트 연결 종료 등으로 소비가 중단되면 마스터 에이전트 실행도 취소
+                task.cancel()
+                logger.info("스트림 소비 중단, 에이전트 실행 취소")
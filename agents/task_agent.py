@@ -11,6 +11,11 @@ from agent_framework import Agent
 from agent_framework.azure import AzureOpenAIChatClient
 from azure.identity import DefaultAzureCredential
 from tools.gtask_tools import GoogleTasksAutomationTools
+from tools.memoize import SessionCacheMiddleware, tool_cache
+from agents.prompts import TASKS_INSTRUCTIONS
+from agents.prompt_cache import prompt_cache_meter
+from agents.history import history_window
+from agents.fanout import offload_sync_tools
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,16 +31,17 @@ def create_tasks_agent():
     return Agent(
         client=chat_client,
         name="Google-Tasks-Agent",
-        instructions="""구글 태스크를 조회하고 분석하는 전문가입니다. 
-        1. 사용자의 요청에 따라 '오늘의 태스크' 혹은 '최근 태스크' 목록을 조회합니다. 
-        2. 태스크의 제목과 상세 내용을 읽고, 사용자가 직접 수행해야 하거나 기억해야 할 '할 일(Action Item)'을 식별합니다.
-        3. 필요한 경우 새로운 태스크를 생성하거나 기존 태스크 목록을 정리합니다. 
-        4. 태스크 생성 시에는 제목, 설명, 마감일 등을 명확히 작성하여 생성하도록 합니다. 정보가 부족한 경우 사용자에게 추가 정보를 요청합니다.
-        """,
-        tools=[
-            tasks_tools.add_google_task,
-            tasks_tools.list_tasks
-        ]
+        instructions=TASKS_INSTRUCTIONS,
+        # 동기 도구는 스레드에서 실행해 마스터가 동시에 부른 다른 하위 에이전트와 겹쳐 실행되게 함
+        # (Tasks service 는 스레드마다 따로 만들어지고, 중복 검사 인덱스는 도구 내부 lock 으로 보호)
+        tools=offload_sync_tools([
+            # 할 일을 추가하는 도구는 실행 후 list_tasks 캐시를 비움
+            tool_cache.write(tasks_tools.add_google_task, evicts=["list_tasks"]),
+            tool_cache.write(tasks_tools.add_google_tasks_bulk, evicts=["list_tasks"]),
+            tool_cache.write(tasks_tools.upsert_task, evicts=["list_tasks"]),
+            tool_cache.read(tasks_tools.list_tasks)
+        ]),
+        middleware=[history_window.middleware(), SessionCacheMiddleware(), prompt_cache_meter.middleware("Google-Tasks-Agent")]
     )
 
 async def main():
@@ -7,10 +7,11 @@ load_dotenv(override=True)
 
 # 2. 필수 클래스 임포트 (Agent 클래스가 추가되었습니다)
 from agent_framework import Agent  
-from agent_framework.azure import AgentFunctionApp, AzureOpenAIChatClient
+from agent_framework.azure import AzureOpenAIChatClient
 from azure.identity import DefaultAzureCredential
 from tools.gtask_tools import GoogleTasksAutomationTools
 from tools.gmail_tools import GmailAutomationTools
+from agents.durable_app import PushAgentFunctionApp
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -31,16 +32,16 @@ def create_agent():
         instructions="이메일을 분석하여 Google Tasks에 등록하는 전문가입니다.",
         tools=[
             gmail_tools.get_unread_email_titles,
-            tasks_tools.add_google_task,
+            tasks_tools.upsert_task,
             tasks_tools.list_tasks
         ]
     )
 
 # 4. 앱 정의
-app = AgentFunctionApp(
+app = PushAgentFunctionApp(
     agents=[create_agent()], 
     enable_health_check=True, 
-    max_poll_retries=50
+    timeout_seconds=50
 )
 
 if __name__ == "__main__":
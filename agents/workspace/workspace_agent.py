@@ -5,6 +5,9 @@ import asyncio
 from agent_framework.azure import AzureOpenAIChatClient
 from tools.gtask_tools import GoogleTasksAutomationTools
 from tools.gmail_tools import GmailAutomationTools
+from tools.memoize import SessionCacheMiddleware, tool_cache
+from agents.prompts import WORKSPACE_INSTRUCTIONS
+from agents.prompt_cache import prompt_cache_meter
 
 from dotenv import load_dotenv
 
@@ -32,31 +35,20 @@ def create_task_management_agent():
     # 3. 에이전트 생성
     agent = client.as_agent(
         name="Email-to-Task Agent",
-        instructions="""당신은 사용자의 이메일을 분석하여 중요한 할 일을 관리하는 '업무 효율화 전문가'입니다.
-
-당신의 주요 워크플로우:
-1. 사용자의 요청에 따라 '오늘 온 메일' 혹은 '최근 메일' 목록을 조회합니다.
-2. 메일의 제목과 요약 내용을 읽고, 사용자가 직접 수행해야 하거나 기억해야 할 '할 일(Task)'을 식별합니다.
-3. 할 일이 발견되면 다음 규칙에 따라 Google Tasks에 등록합니다:
-   - 제목: 메일의 핵심 목적을 10자 내외로 요약 (예: [메일] 보고서 수정 요청)
-   - 메모(Notes): 메일의 주요 내용 요약 및 발신자 정보 포함
-   - 마감 기한(Due Date): 메일 본문에 날짜가 명시되어 있다면 해당 날짜를 입력하고, 없다면 오늘 날짜를 기본값으로 사용합니다.
-4. 등록이 완료되면 어떤 메일을 바탕으로 어떤 할 일을 만들었는지 사용자에게 친절하게 보고합니다.
-
-주의 사항:
-- 단순 광고성 메일이나 공지사항은 할 일로 등록하지 마세요.
-- 할 일을 등록하기 전, 이미 비슷한 이름의 할 일이 'list_tasks'를 통해 확인된다면 중복 등록하지 않도록 주의하세요.
-""",
+        instructions=WORKSPACE_INSTRUCTIONS,
         tools=[
             # Gmail 관련 도구
-            gmail_tools.get_unread_email_titles,
-            gmail_tools.get_emails_received_today,
-            gmail_tools.get_recent_emails,
+            tool_cache.read(gmail_tools.get_unread_email_titles, ttl=60),
+            tool_cache.read(gmail_tools.get_emails_received_today, ttl=60),
+            tool_cache.read(gmail_tools.get_recent_emails, ttl=60),
+            tool_cache.read(gmail_tools.get_email_body),
             
             # Google Tasks 관련 도구
-            tasks_tools.add_google_task,
-            tasks_tools.list_tasks
-        ]
+            tool_cache.write(tasks_tools.upsert_task, evicts=["list_tasks"]),
+            tool_cache.write(tasks_tools.add_google_tasks_bulk, evicts=["list_tasks"]),
+            tool_cache.read(tasks_tools.list_tasks)
+        ],
+        middleware=[SessionCacheMiddleware(), prompt_cache_meter.middleware("Email-to-Task Agent")]
     )
     
     return agent
@@ -0,0 +1,76 @@
+"""
+Durable 에이전트 HTTP 응답 지연 측정 (로컬 func host 필요)
+
+function_app.py 를 `func start` 로 띄운 뒤 (AzureWebJobsStorage 는 Azurite 등 로컬 스토리지 에뮬레이터)
+같은 요청을 n 번 보내 요청별 응답 시간과 완료 경로(completed_via: push / poll), 상태 조회 수(polls)를 집계합니다.
+PushAgentFunctionApp 이면 대부분 push 로 끝나고 polls 가 0~1 이어야 합니다.
+
+사용 예:
+    python -m bench.durable_latency                              # Master-Agent, 5회
+    python -m bench.durable_latency -a Master-Agent -n 10 -p "할 일 목록 보여줘"
+    python -m bench.durable_latency --url http://localhost:7071 -o bench/durable_latency.json
+"""
+
+import sys
+import json
+import time
+import uuid
+import argparse
+import statistics
+import urllib.request
+from pathlib import Path
+
+
+def run_once(url: str, agent: str, prompt: str, thread_id: str, timeout: float) -> dict:
+    body = json.dumps({"message": prompt, "thread_id": thread_id}).encode("utf-8")
+    request = urllib.request.Request(f"{url}/api/agents/{agent}/run", data=body, method="POST",
+                                     headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        payload = json.loads(response.read().decode("utf-8"))
+    return {
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        "status": payload.get("status"),
+        "completed_via": payload.get("completed_via"),
+        "polls": payload.get("polls"),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Durable 에이전트 HTTP 응답 지연 측정")
+    parser.add_argument("--url", default="http://localhost:7071", help="func host 주소")
+    parser.add_argument("-a", "--agent", default="Master-Agent", help="에이전트 이름 (/api/agents/<이름>/run)")
+    parser.add_argument("-n", "--iterations", type=int, default=5, help="요청 횟수")
+    parser.add_argument("-p", "--prompt", default="안 읽은 메일 제목만 알려줘", help="보낼 요청")
+    parser.add_argument("--timeout", type=float, default=120, help="요청별 HTTP 제한 시간 (초)")
+    parser.add_argument("-o", "--output", help="결과 JSON 저장 경로 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    runs = []
+    for i in range(args.iterations):
+        # 요청마다 새 스레드 → 대화 기록 길이가 지연에 섞이지 않음
+        run = run_once(args.url, args.agent, args.prompt, f"bench-{uuid.uuid4().hex[:8]}", args.timeout)
+        print(f"▶ {i + 1}/{args.iterations} {run}", file=sys.stderr)
+        runs.append(run)
+
+    elapsed = [r["elapsed_ms"] for r in runs]
+    result = {
+        "agent": args.agent,
+        "runs": runs,
+        "p50_ms": statistics.median(elapsed),
+        "max_ms": max(elapsed),
+        "push": sum(r["completed_via"] == "push" for r in runs),
+        "total_polls": sum(r["polls"] or 0 for r in runs),
+    }
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+임베딩 차원 축소 평가 - 축소 차원(256 / 512 ...) 벡터의 유사 티켓 recall 을 1536 차원 기준과 비교 (실제 Azure OpenAI 배포 필요)
+
+코퍼스의 각 사양 티켓을 질의로 보고, 나머지 티켓 중 기준 차원 벡터의 cosine top-k 를 정답으로 삼아
+축소 차원 벡터의 top-k 가 그중 몇 개를 찾는지(recall@k) 측정합니다. 벡터당 저장 크기와 전수 비교 질의 시간도 함께 냅니다.
+임베딩은 저장 경로와 같게 (청크 → dimensions= 로 임베딩 → 청크 평균 방향) 만듭니다. (text-embedding-3 계열만 dimensions 지원)
+
+사용 예:
+    python -m bench.embedding_dimensions_eval                              # 현재 인덱스의 사양 티켓, 256 / 512 / 1024
+    python -m bench.embedding_dimensions_eval -d 256 512 -k 5 --limit 300
+    python -m bench.embedding_dimensions_eval --corpus specs.jsonl -o bench/dimensions.json   # 줄마다 {"text": ...}
+
+출력(JSON): 차원별 recall_at_k, bytes_per_vector, query_ms (질의 1건의 전수 cosine 비교 평균)
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+
+from tools.ai_search_tools import EMBED_BATCH_SIZE, VECTOR_DIMENSIONS, AISearchTools, _centroid, _preprocess_text
+from tools.chunking import chunk_text
+
+
+def load_corpus_from_index(tools: AISearchTools, limit: int) -> list[str]:
+    """alias 가 가리키는 인덱스의 매핑 문서(청크 자식 문서 제외) 내용"""
+    results = tools._make_search_client().search(
+        search_text="*", filter="parent_id eq null", select=["spec_ticket_content"], top=limit,
+    )
+    return [r["spec_ticket_content"] for r in results if r.get("spec_ticket_content")]
+
+
+def load_corpus_file(path: str, limit: int) -> list[str]:
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [json.loads(line)["text"] for line in lines if line.strip()][:limit]
+
+
+def embed_corpus(tools: AISearchTools, texts: list[str], dimensions: int) -> np.ndarray:
+    """저장 경로와 같은 방식으로 문서 벡터를 만듭니다. (청크 임베딩의 평균 방향)"""
+    chunked = [chunk_text(_preprocess_text(text)) for text in texts]
+    flat = [chunk for chunks in chunked for chunk in chunks]
+    vectors = []
+    for start in range(0, len(flat), EMBED_BATCH_SIZE):
+        vectors.extend(tools._embed_many(flat[start:start + EMBED_BATCH_SIZE], dimensions=dimensions))
+    documents = []
+    for chunks in chunked:
+        documents.append(_centroid(vectors[:len(chunks)]))
+        vectors = vectors[len(chunks):]
+    return np.asarray(documents, dtype=np.float32)
+
+
+def _neighbors(vectors: np.ndarray, k: int) -> np.ndarray:
+    """각 벡터의 (자기 자신 제외) cosine top-k 인덱스"""
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    similarities = unit @ unit.T
+    np.fill_diagonal(similarities, -np.inf)
+    return np.argpartition(-similarities, k, axis=1)[:, :k]
+
+
+def recall_at_k(baseline: np.ndarray, reduced: np.ndarray, k: int) -> float:
+    """기준 벡터의 top-k 이웃 중 축소 벡터의 top-k 가 찾은 비율 (질의 평균)"""
+    k = min(k, len(baseline) - 1)
+    expected = _neighbors(baseline, k)
+    found = _neighbors(reduced, k)
+    return float(np.mean([len(set(e) & set(f)) / k for e, f in zip(expected, found)]))
+
+
+def query_ms(vectors: np.ndarray, repeat: int = 20) -> float:
+    """질의 1건을 전체 벡터와 전수 비교하는 평균 시간"""
+    started = time.perf_counter()
+    for i in range(repeat):
+        np.argmax(vectors @ vectors[i % len(vectors)])
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def evaluate(vectors_by_dimensions: dict[int, np.ndarray], baseline_dimensions: int, k: int) -> dict:
+    baseline = vectors_by_dimensions[baseline_dimensions]
+    return {
+        str(dimensions): {
+            "recall_at_k": round(recall_at_k(baseline, vectors, k), 4),
+            "bytes_per_vector": dimensions * 4,
+            "query_ms": round(query_ms(vectors), 4),
+        }
+        for dimensions, vectors in sorted(vectors_by_dimensions.items())
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="축소 차원 임베딩의 recall 손실 측정 (기준: 1536 차원)")
+    parser.add_argument("-d", "--dimensions", type=int, nargs="+", default=[256, 512, 1024], help="평가할 축소 차원")
+    parser.add_argument("--baseline", type=int, default=VECTOR_DIMENSIONS, help="기준 차원")
+    parser.add_argument("-k", type=int, default=5, help="recall@k 의 k")
+    parser.add_argument("--corpus", help="코퍼스 JSONL ({\"text\": ...}). 없으면 현재 인덱스의 사양 티켓 사용")
+    parser.add_argument("--limit", type=int, default=1000, help="최대 티켓 수")
+    parser.add_argument("-o", "--output", help="결과 JSON 저장 경로 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    load_dotenv(override=True)
+    tools = AISearchTools()
+    texts = load_corpus_file(args.corpus, args.limit) if args.corpus else load_corpus_from_index(tools, args.limit)
+    if len(texts) <= args.k:
+        print(f"코퍼스가 너무 작습니다: {len(texts)}건 (k={args.k})", file=sys.stderr)
+        return 1
+
+    vectors = {}
+    for dimensions in sorted({args.baseline, *args.dimensions}):
+        print(f"▶ {dimensions} 차원 임베딩 ({len(texts)}건)", file=sys.stderr)
+        vectors[dimensions] = embed_corpus(tools, texts, dimensions)
+
+    result = {
+        "deployment": tools._embedding_deployment,
+        "corpus_size": len(texts),
+        "k": args.k,
+        "baseline_dimensions": args.baseline,
+        "dimensions": evaluate(vectors, args.baseline, args.k),
+    }
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,689 @@
+"""
+벤치마크용 로컬 API 대역(fake server)
+
+각 서비스는 별도 포트의 ThreadingHTTPServer 로 실행되며, 실제 클라이언트 라이브러리
+(googleapiclient, jira, PyGithub, azure-search-documents, openai)가 그대로 붙을 수 있도록
+필요한 엔드포인트만 흉내냅니다.
+
+- latency_ms: 요청마다 응답 전에 대기하는 시간 (네트워크/서버 지연 모사)
+- request_count / bytes_sent / bytes_received: 서버 측에서 집계한 요청 수와 바이트
+"""
+
+import os
+import re
+import ssl
+import json
+import time
+import tempfile
+import ipaddress
+import uuid
+import random
+import hashlib
+import threading
+from email import message_from_bytes
+from email.policy import HTTP
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+def make_self_signed_cert(directory: str | None = None) -> tuple[str, str]:
+    """127.0.0.1 용 자체 서명 인증서를 만들어 (cert_path, key_path)를 반환합니다."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    directory = directory or tempfile.mkdtemp(prefix="bench-tls-")
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(minutes=1))
+        .not_valid_after(now + timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption(),
+        ))
+    return cert_path, key_path
+
+
+def _now_rfc3339() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class FakeService:
+    """경로 정규식 → 핸들러 라우팅과 지연/카운터를 제공하는 기본 클래스"""
+
+    name = "fake"
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        # (cert_path, key_path) 가 지정되면 HTTPS 로 실행 (https 만 허용하는 SDK 용)
+        self.tls: tuple[str, str] | None = None
+        self.routes: list[tuple[str, re.Pattern, callable]] = []
+        self.request_count = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self.register_routes()
+
+    # -------------------------------------------------------------- #
+    def register_routes(self):
+        raise NotImplementedError
+
+    def route(self, method: str, pattern: str, handler):
+        self.routes.append((method, re.compile(f"^{pattern}$"), handler))
+
+    def dispatch(self, method: str, raw_path: str, body: bytes) -> tuple[int, dict, bytes]:
+        """(status, headers, body) 반환. 배치 요청 내부 요청도 이 경로를 다시 탑니다."""
+        parts = urlsplit(raw_path)
+        path = unquote(parts.path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                payload = json.loads(body) if body and body[:1] in (b"{", b"[") else body
+                result = handler(match, query, payload)
+                if isinstance(result, tuple) and len(result) == 3:
+                    return result
+                status, data = result if isinstance(result, tuple) else (200, result)
+                return status, {"Content-Type": "application/json"}, json.dumps(data).encode()
+        return 404, {"Content-Type": "application/json"}, json.dumps({"error": f"no route {method} {path}"}).encode()
+
+    # -------------------------------------------------------------- #
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        scheme = "https" if self.tls else "http"
+        return f"{scheme}://{host}:{port}"
+
+    def reset_counters(self):
+        with self._lock:
+            self.request_count = 0
+            self.bytes_received = 0
+            self.bytes_sent = 0
+
+    def counters(self) -> dict:
+        return {
+            "requests": self.request_count,
+            "bytes_received": self.bytes_received,
+            "bytes_sent": self.bytes_sent,
+        }
+
+    def start(self) -> "FakeService":
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                if service.latency_ms:
+                    time.sleep(service.latency_ms / 1000)
+                status, headers, payload = service.dispatch(self.command, self.path, body)
+                with service._lock:
+                    service.request_count += 1
+                    service.bytes_received += len(body)
+                    service.bytes_sent += len(payload)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        if self.tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(*self.tls)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        threading.Thread(target=self._server.serve_forever, name=f"fake-{self.name}", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class _GoogleBatchMixin:
+    """Google API 배치 요청(multipart/mixed)을 내부 요청으로 풀어 처리합니다."""
+
+    def handle_batch(self, match, query, body):
+        # 배치 본문은 JSON 이 아니므로 bytes 로 전달됨. 첫 줄(--boundary)에서 경계 문자열을 얻음
+        # (googleapiclient 는 줄바꿈으로 \n, 경계로 "===...==" 를 쓰므로 \r\n 으로 통일하고 경계는 따옴표로 감쌈)
+        body = body.replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+        boundary_in = body.split(b"\r\n", 1)[0][2:].decode()
+        raw = f'Content-Type: multipart/mixed; boundary="{boundary_in}"\r\n\r\n'.encode() + body
+        envelope = message_from_bytes(raw, policy=HTTP)
+        boundary = f"batch_{uuid.uuid4().hex}"
+        out = []
+        for part in envelope.iter_parts():
+            content_id = (part.get("Content-ID") or "").strip("<>")
+            inner = part.get_payload(decode=True).replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+            head, _, inner_body = inner.partition(b"\r\n\r\n")
+            request_line = head.split(b"\r\n")[0].decode()
+            method, path, _ = request_line.split(" ", 2)
+            status, _, payload = self.dispatch(method, path, inner_body.strip())
+            out.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n\r\n{payload.decode()}\r\n"
+            )
+        out.append(f"--{boundary}--")
+        return 200, {"Content-Type": f"multipart/mixed; boundary={boundary}"}, "".join(out).encode()
+
+
+def _parse_fields(mask: str) -> dict:
+    """Google 부분 응답 fields 문자열("id,payload(headers,parts)")을 {필드: 하위 mask 또는 None} 으로 변환"""
+    selected, depth, start = {}, 0, 0
+    for i, ch in enumerate(mask + ","):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            item = mask[start:i].strip()
+            start = i + 1
+            if item:
+                name, _, sub = item.partition("(")
+                selected[name.strip()] = _parse_fields(sub[:-1]) if sub else None
+    return selected
+
+
+def apply_fields(value, mask):
+    """fields 로 고른 필드만 남깁니다. 하위 선택이 없는 필드는 그 아래 전체를 그대로 둠"""
+    if isinstance(mask, str):
+        mask = _parse_fields(mask)
+    if mask is None:
+        return value
+    if isinstance(value, list):
+        return [apply_fields(item, mask) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: apply_fields(value[key], sub) for key, sub in mask.items() if key in value}
+
+
+class FakeGmail(_GoogleBatchMixin, FakeService):
+    name = "gmail"
+
+    def __init__(self, message_count: int = 100, body_bytes: int = 2048, latency_ms: float = 0.0):
+        today = datetime.now(timezone.utc)
+        self.messages = {}
+        for i in range(message_count):
+            msg_id = f"m{i:05d}"
+            self.messages[msg_id] = {
+                "id": msg_id,
+                "threadId": msg_id,
+                "labelIds": ["INBOX", "UNREAD"] if i % 3 == 0 else ["INBOX"],
+                "snippet": f"[{i}] 회의 자료 검토 부탁드립니다. 금요일까지 회신 바랍니다.",
+                "internalDate": str(int((today - timedelta(minutes=i)).timestamp() * 1000)),
+                "payload": {
+                    "mimeType": "text/plain",
+                    "headers": [
+                        {"name": "Subject", "value": f"업무 요청 #{i}"},
+                        {"name": "From", "value": f"sender{i}@example.com"},
+                        {"name": "Date", "value": (today - timedelta(minutes=i)).strftime("%a, %d %b %Y %H:%M:%S +0000")},
+                    ],
+                    "body": {"size": body_bytes, "data": "QQ" * (body_bytes // 2)},
+                },
+            }
+        self._order = list(self.messages)
+        # attachmentId → base64url data (첨부 / 분리된 큰 파트), 받은 data 문자 수
+        self.attachments: dict[str, str] = {}
+        self.attachment_bytes = 0
+        super().__init__(latency_ms)
+
+    def register_routes(self):
+        self.route("GET", r"/gmail/v1/users/me/messages", self.list_messages)
+        self.route("GET", r"/gmail/v1/users/me/messages/(?P<id>[^/]+)", self.get_message)
+        self.route("GET", r"/gmail/v1/users/me/messages/(?P<id>[^/]+)/attachments/(?P<attachment>[^/]+)",
+                   self.get_attachment)
+        self.route("POST", r"/gmail/v1/users/me/messages/send", self.send_message)
+        self.route("POST", r"/batch(/gmail/v1)?", self.handle_batch)
+
+    def list_messages(self, match, query, body):
+        ids = self._order
+        if "is:unread" in query.get("q", ""):
+            ids = [i for i in ids if "UNREAD" in self.messages[i]["labelIds"]]
+        start = int(query.get("pageToken") or 0)
+        size = int(query.get("maxResults") or 100)
+        page = {
+            "messages": [{"id": i, "threadId": i} for i in ids[start:start + size]],
+            "resultSizeEstimate": len(ids),
+        }
+        if start + size < len(ids):
+            page["nextPageToken"] = str(start + size)
+        return page
+
+    def get_message(self, match, query, body):
+        msg = self.messages.get(match["id"])
+        if msg is None:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        if query.get("format") == "metadata":
+            msg = {**msg, "payload": {"headers": msg["payload"]["headers"]}}
+        if query.get("fields"):
+            msg = apply_fields(msg, query["fields"])
+        return msg
+
+    def get_attachment(self, match, query, body):
+        data = self.attachments.get(match["attachment"])
+        if data is None:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        with self._lock:
+            self.attachment_bytes += len(data)
+        return {"size": len(data) * 3 // 4, "data": data}
+
+    def send_message(self, match, query, body):
+        return {"id": f"sent-{uuid.uuid4().hex[:8]}", "labelIds": ["SENT"]}
+
+
+class FakeGoogleTasks(_GoogleBatchMixin, FakeService):
+    name = "gtasks"
+
+    def __init__(self, task_count: int = 0, latency_ms: float = 0.0):
+        self.tasks = [
+            {"id": f"t{i}", "title": f"기존 할 일 {i}", "notes": "", "status": "needsAction", "updated": _now_rfc3339()}
+            for i in range(task_count)
+        ]
+        super().__init__(latency_ms)
+
+    def register_routes(self):
+        self.route("GET", r"/tasks/v1/lists/(?P<list>[^/]+)/tasks", self.list_tasks)
+        self.route("POST", r"/tasks/v1/lists/(?P<list>[^/]+)/tasks", self.insert_task)
+        self.route("PATCH", r"/tasks/v1/lists/(?P<list>[^/]+)/tasks/(?P<id>[^/]+)", self.patch_task)
+        self.route("POST", r"/batch(/tasks/v1)?", self.handle_batch)
+
+    def list_tasks(self, match, query, body):
+        items = self.tasks
+        if "updatedMin" in query:
+            items = [t for t in items if t["updated"] >= query["updatedMin"]]
+        elif query.get("showCompleted", "true") == "false":
+            items = [t for t in items if t["status"] != "completed"]
+        start = int(query.get("pageToken") or 0)
+        size = int(query.get("maxResults") or 20)
+        page = {"items": items[start:start + size]}
+        if start + size < len(items):
+            page["nextPageToken"] = str(start + size)
+        return page
+
+    def insert_task(self, match, query, body):
+        task = dict(body, id=f"t{len(self.tasks)}", status="needsAction", updated=_now_rfc3339())
+        self.tasks.append(task)
+        return task
+
+    def patch_task(self, match, query, body):
+        for task in self.tasks:
+            if task["id"] == match["id"]:
+                task.update(body, updated=_now_rfc3339())
+                return task
+        return 404, {"error": {"code": 404, "message": "Not Found"}}
+
+
+def build_google_service(api: str, version: str, fake: FakeService):
+    """
+    정적 discovery 문서의 rootUrl 을 대역 서버 주소로 바꿔 서비스 객체를 만듭니다.
+    (client_options 의 api_endpoint 는 배치 요청 URI 에는 적용되지 않기 때문)
+    """
+    import httplib2
+    from googleapiclient.discovery import build_from_document
+    from googleapiclient.discovery_cache import get_static_doc
+
+    document = json.loads(get_static_doc(api, version))
+    document["rootUrl"] = fake.url + "/"
+    return build_from_document(document, http=httplib2.Http())
+
+
+class FakeJira(FakeService):
+    name = "jira"
+
+    def __init__(self, spec_count: int = 50, latency_ms: float = 0.0):
+        self.issues = {}
+        for i in range(1, spec_count + 1):
+            self._add_issue(f"KAN-{i}", "사양", f"사양 {i}", f"사양 설명 {i}: 사용자는 보고서를 PDF로 내보낼 수 있어야 한다. 변형 {i % 7}")
+        self._next_key = spec_count + 1
+        super().__init__(latency_ms)
+
+    def _add_issue(self, key, issue_type, summary, description):
+        self.issues[key] = {
+            "id": str(10000 + len(self.issues)),
+            "key": key,
+            "self": f"/rest/api/2/issue/{key}",
+            "fields": {
+                "summary": summary,
+                "description": description,
+                "issuetype": {"id": "1", "name": issue_type},
+                "project": {"key": "KAN"},
+                "comment": {"comments": []},
+            },
+        }
+
+    def register_routes(self):
+        self.route("GET", r"/rest/api/2/serverInfo", lambda m, q, b: {"versionNumbers": [1001, 0, 0], "deploymentType": "Cloud"})
+        self.route("GET", r"/rest/api/2/issue/(?P<key>[^/]+)", self.get_issue)
+        self.route("POST", r"/rest/api/2/issue", self.create_issue)
+        self.route("POST", r"/rest/api/2/issue/(?P<key>[^/]+)/comment", self.add_comment)
+        self.route("DELETE", r"/rest/api/2/issue/(?P<key>[^/]+)", self.delete_issue)
+
+    def get_issue(self, match, query, body):
+        issue = self.issues.get(match["key"])
+        if issue is None:
+            return 404, {"errorMessages": ["Issue does not exist"]}
+        # jira 라이브러리는 self 링크로 후속 요청(delete 등)을 보내므로 절대 주소로 응답
+        return {**issue, "self": f"{self.url}{issue['self']}"}
+
+    def create_issue(self, match, query, body):
+        fields = body["fields"]
+        with self._lock:
+            key = f"KAN-{self._next_key}"
+            self._next_key += 1
+        self._add_issue(key, fields["issuetype"].get("name", "개발"), fields["summary"], fields["description"])
+        issue = self.issues[key]
+        return 201, {"id": issue["id"], "key": key, "self": issue["self"]}
+
+    def add_comment(self, match, query, body):
+        return 201, {"id": uuid.uuid4().hex[:6], "body": body.get("body")}
+
+    def delete_issue(self, match, query, body):
+        self.issues.pop(match["key"], None)
+        return 204, {}, b""
+
+
+class FakeGitHub(FakeService):
+    name = "github"
+
+    def __init__(self, repo_name: str = "owner/repo", latency_ms: float = 0.0):
+        self.repo_name = repo_name
+        self.issues = {}
+        super().__init__(latency_ms)
+
+    def register_routes(self):
+        self.route("GET", rf"/repos/{re.escape(self.repo_name)}", self.get_repo)
+        self.route("POST", rf"/repos/{re.escape(self.repo_name)}/issues", self.create_issue)
+        self.route("GET", rf"/repos/{re.escape(self.repo_name)}/issues/(?P<number>\d+)", self.get_issue)
+        self.route("PATCH", rf"/repos/{re.escape(self.repo_name)}/issues/(?P<number>\d+)", self.edit_issue)
+        self.route("POST", rf"/repos/{re.escape(self.repo_name)}/issues/(?P<number>\d+)/labels", self.add_labels)
+
+    def _repo_json(self):
+        owner, name = self.repo_name.split("/")
+        return {
+            "id": 1,
+            "name": name,
+            "full_name": self.repo_name,
+            "owner": {"login": owner, "id": 1},
+            "url": f"{self.url}/repos/{self.repo_name}",
+            "html_url": f"https://github.com/{self.repo_name}",
+        }
+
+    def _issue_json(self, number):
+        issue = self.issues[number]
+        return {
+            "id": number,
+            "number": number,
+            "title": issue["title"],
+            "body": issue["body"],
+            "state": issue["state"],
+            "labels": [{"name": label} for label in issue["labels"]],
+            "url": f"{self.url}/repos/{self.repo_name}/issues/{number}",
+            "html_url": f"https://github.com/{self.repo_name}/issues/{number}",
+        }
+
+    def get_repo(self, match, query, body):
+        return self._repo_json()
+
+    def create_issue(self, match, query, body):
+        with self._lock:
+            number = len(self.issues) + 1
+            self.issues[number] = {
+                "title": body["title"],
+                "body": body.get("body", ""),
+                "labels": body.get("labels", []),
+                "state": "open",
+            }
+        return 201, self._issue_json(number)
+
+    def get_issue(self, match, query, body):
+        number = int(match["number"])
+        if number not in self.issues:
+            return 404, {"message": "Not Found"}
+        return self._issue_json(number)
+
+    def edit_issue(self, match, query, body):
+        number = int(match["number"])
+        self.issues[number].update({k: v for k, v in body.items() if k in ("title", "body", "state")})
+        return self._issue_json(number)
+
+    def add_labels(self, match, query, body):
+        number = int(match["number"])
+        if number not in self.issues:
+            return 404, {"message": "Not Found"}
+        labels = self.issues[number]["labels"]
+        labels.extend(label for label in body if label not in labels)
+        return [{"name": label} for label in labels]
+
+
+def fake_embedding(text: str, dimensions: int = 1536) -> list[float]:
+    """
+    텍스트 해시로 시드를 정해 재현 가능한 단위 벡터를 만듭니다.
+    text-embedding-3 처럼 축소 차원 벡터는 전체(1536) 벡터의 앞부분을 다시 정규화한 값입니다.
+    """
+    seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+    vector = [rng.uniform(-1, 1) for _ in range(max(dimensions, 1536))][:dimensions]
+    norm = sum(v * v for v in vector) ** 0.5
+    return [v / norm for v in vector]
+
+
+class FakeAzureOpenAI(FakeService):
+    name = "azure_openai"
+
+    def __init__(self, dimensions: int = 1536, latency_ms: float = 0.0):
+        self.dimensions = dimensions
+        self.embedded_inputs = 0
+        super().__init__(latency_ms)
+
+    def register_routes(self):
+        self.route("POST", r"/openai/deployments/(?P<deployment>[^/]+)/embeddings", self.embeddings)
+
+    def embeddings(self, match, query, body):
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        dimensions = body.get("dimensions") or self.dimensions
+        with self._lock:
+            self.embedded_inputs += len(inputs)
+        return {
+            "object": "list",
+            "model": match["deployment"],
+            "data": [
+                {"object": "embedding", "index": i, "embedding": fake_embedding(text, dimensions)}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": sum(len(t) for t in inputs), "total_tokens": sum(len(t) for t in inputs)},
+        }
+
+
+class FakeAzureSearch(FakeService):
+    name = "azure_search"
+
+    def __init__(self, latency_ms: float = 0.0, tls: tuple[str, str] | None = None):
+        self.indexes: dict[str, dict] = {}
+        self.aliases: dict[str, dict] = {}
+        self.documents: dict[str, dict[str, dict]] = {}
+        super().__init__(latency_ms)
+        # azure-search-documents 는 https 엔드포인트만 허용
+        self.tls = tls
+
+    def seed_mappings(self, index_name: str, count: int, dimensions: int = 1536, alias: str | None = None):
+        """히스토리 시나리오용 매핑 문서를 미리 채웁니다. (alias 를 주면 그 alias 가 index_name 을 가리킴)"""
+        docs = self.documents.setdefault(index_name, {})
+        self.indexes.setdefault(index_name, {"name": index_name, "fields": []})
+        if alias:
+            self.aliases[alias] = {"name": alias, "indexes": [index_name]}
+        base = datetime.now(timezone.utc)
+        for i in range(count):
+            link = f"https://example.atlassian.net/browse/SEED-{i}"
+            content = f"과거 사양 {i}"
+            docs[hashlib.md5(link.encode()).hexdigest()] = {
+                "id": hashlib.md5(link.encode()).hexdigest(),
+                "spec_ticket_link": link,
+                "spec_ticket_content": content,
+                "spec_ticket_vector": fake_embedding(content, dimensions),
+                "dev_ticket_link": f"https://example.atlassian.net/browse/DEV-{i}",
+                "github_issue_link": f"https://github.com/owner/repo/issues/{i}",
+                "created_at": (base - timedelta(minutes=i)).isoformat(),
+            }
+
+    def register_routes(self):
+        self.route("GET", r"/aliases", self.list_aliases)
+        self.route("PUT", r"/aliases\('(?P<name>[^']+)'\)", self.put_alias)
+        self.route("GET", r"/indexes", self.list_indexes)
+        self.route("GET", r"/indexes\('(?P<name>[^']+)'\)", self.get_index)
+        self.route("PUT", r"/indexes\('(?P<name>[^']+)'\)", self.put_index)
+        self.route("DELETE", r"/indexes\('(?P<name>[^']+)'\)", self.delete_index)
+        self.route("POST", r"/indexes\('(?P<name>[^']+)'\)/docs/search\.index", self.index_documents)
+        self.route("POST", r"/indexes\('(?P<name>[^']+)'\)/docs/search\.post\.search", self.search)
+        self.route("GET", r"/indexes\('(?P<name>[^']+)'\)/docs/\$count", self.count)
+        self.route("GET", r"/indexes\('(?P<name>[^']+)'\)/docs\('(?P<key>[^']+)'\)", self.get_document)
+
+    def _index(self, match) -> str:
+        """문서 API 의 이름이 alias 면 가리키는 인덱스 이름으로 바꿈"""
+        alias = self.aliases.get(match["name"])
+        return alias["indexes"][0] if alias else match["name"]
+
+    def list_aliases(self, match, query, body):
+        return {"value": list(self.aliases.values())}
+
+    def put_alias(self, match, query, body):
+        created = match["name"] not in self.aliases
+        self.aliases[match["name"]] = {"name": match["name"], "indexes": body["indexes"]}
+        return 201 if created else 200, self.aliases[match["name"]]
+
+    def list_indexes(self, match, query, body):
+        return {"value": list(self.indexes.values())}
+
+    def get_index(self, match, query, body):
+        index = self.indexes.get(match["name"])
+        if index is None:
+            return 404, {"error": {"code": "ResourceNotFound", "message": "Index not found"}}
+        return index
+
+    def put_index(self, match, query, body):
+        self.indexes[match["name"]] = body
+        self.documents.setdefault(match["name"], {})
+        return 201, body
+
+    def delete_index(self, match, query, body):
+        self.indexes.pop(match["name"], None)
+        self.documents.pop(match["name"], None)
+        return 204, {}, b""
+
+    def index_documents(self, match, query, body):
+        docs = self.documents.setdefault(self._index(match), {})
+        results = []
+        for action in body["value"]:
+            op = action.pop("@search.action", "upload")
+            key = action["id"]
+            if op == "delete":
+                docs.pop(key, None)
+            elif op in ("merge", "mergeOrUpload") and key in docs:
+                docs[key].update(action)
+            else:
+                docs[key] = action
+            results.append({"key": key, "status": True, "errorMessage": None, "statusCode": 200})
+        return {"value": results}
+
+    def get_document(self, match, query, body):
+        doc = self.documents.get(self._index(match), {}).get(match["key"])
+        if doc is None:
+            return 404, {"error": {"code": "", "message": "Document not found"}}
+        select = [s.strip() for s in query.get("$select", "").split(",") if s.strip()]
+        return {k: v for k, v in doc.items() if not select or k in select}
+
+    @staticmethod
+    def _matches_filter(doc: dict, expression: str | None) -> bool:
+        """field eq 'value' / field eq null / 날짜 field ge 값 조건만 지원 (and 로 연결)"""
+        if not expression:
+            return True
+        for clause in expression.split(" and "):
+            field, op, value = clause.strip().split(" ", 2)
+            if op == "ge":
+                actual = doc.get(field)
+                if actual is None or datetime.fromisoformat(actual) < datetime.fromisoformat(value):
+                    return False
+            elif doc.get(field) != (None if value == "null" else value.strip("'")):
+                return False
+        return True
+
+    def count(self, match, query, body):
+        return 200, {"Content-Type": "text/plain"}, str(len(self.documents.get(self._index(match), {}))).encode()
+
+    def search(self, match, query, body):
+        docs = list(self.documents.get(self._index(match), {}).values())
+        select = [s.strip() for s in body.get("select", "").split(",") if s.strip()]
+        top = body.get("top") or 50
+        vector_queries = body.get("vectorQueries") or []
+
+        docs = [doc for doc in docs if self._matches_filter(doc, body.get("filter"))]
+
+        if vector_queries:
+            # 질의별 상위 k 개의 합집합 (문서 점수는 질의 중 최고값)
+            best: dict[str, tuple[float, dict]] = {}
+            for vq in vector_queries:
+                field = vq["fields"].split(",")[0]
+                target = vq["vector"]
+                scored = []
+                for doc in docs:
+                    vector = doc.get(field)
+                    if not vector:
+                        continue
+                    cosine = sum(a * b for a, b in zip(target, vector))
+                    # Azure AI Search cosine 점수: 1 / (1 + (1 - cos))
+                    scored.append((1 / (2 - cosine), doc))
+                scored.sort(key=lambda x: x[0], reverse=True)
+                for score, doc in scored[:vq.get("k", top)]:
+                    if doc["id"] not in best or score > best[doc["id"]][0]:
+                        best[doc["id"]] = (score, doc)
+            scored = sorted(best.values(), key=lambda x: x[0], reverse=True)[:top]
+        else:
+            order = body.get("orderby")
+            if order:
+                field, _, direction = order.partition(" ")
+                docs.sort(key=lambda d: d.get(field) or "", reverse=direction == "desc")
+            scored = [(1.0, doc) for doc in docs[body.get("skip", 0):body.get("skip", 0) + top]]
+
+        values = []
+        for score, doc in scored:
+            item = {k: v for k, v in doc.items() if not select or k in select}
+            item["@search.score"] = score
+            values.append(item)
+
+        result = {"value": values}
+        if body.get("count"):
+            result["@odata.count"] = len(docs)
+        return result
+
+
+ALL_SERVICES = (FakeGmail, FakeGoogleTasks, FakeJira, FakeGitHub, FakeAzureSearch, FakeAzureOpenAI)
@@ -0,0 +1,87 @@
+"""
+에이전트별 프롬프트 캐시 측정 (실제 Azure OpenAI 배포 필요)
+
+같은 요청을 에이전트마다 n 번 보내고 LLM 호출별 입력 토큰 중 캐시에서 처리된 토큰을 집계합니다.
+첫 호출은 캐시를 채우고, 이후 호출부터 instructions + 도구 스키마 prefix 가 캐시에 적중해야 합니다.
+(prefix 가 1024 토큰 미만이면 Azure OpenAI 는 캐시하지 않으므로 cached 가 0 으로 나옵니다)
+
+사용 예:
+    python -m bench.prompt_cache_report                         # 전체 에이전트, 3회
+    python -m bench.prompt_cache_report -a sdd -n 5 -p "최근 티켓 히스토리 보여줘"
+    python -m bench.prompt_cache_report -o bench/prompt_cache.json
+
+출력(JSON): 에이전트별 prefix 지문(해시 / 문자 수 / 도구 수)과 calls, input_tokens, cached_tokens, uncached_tokens, hit_ratio
+"""
+
+import sys
+import json
+import asyncio
+import argparse
+import logging
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+
+from agents.prompt_cache import prefix_fingerprint, prompt_cache_meter
+
+# 에이전트 키 -> (생성 함수 경로, 기본 요청) - 쓰기 도구를 부르지 않는 조회 요청만 사용
+AGENTS = {
+    "mail": ("agents.mail_agent:create_mail_agent", "안 읽은 메일 제목만 알려줘"),
+    "tasks": ("agents.task_agent:create_tasks_agent", "할 일 목록 보여줘"),
+    "sdd": ("agents.sdd.sdd_agent:create_sdd_agent", "최근 티켓 히스토리 3개 보여줘"),
+    "workspace": ("agents.workspace.workspace_agent:create_task_management_agent", "오늘 온 메일 제목만 알려줘. 할 일은 등록하지 마."),
+}
+
+
+def _create(path: str):
+    module_name, func_name = path.split(":")
+    module = __import__(module_name, fromlist=[func_name])
+    return getattr(module, func_name)()
+
+
+async def measure(keys: list[str], iterations: int, prompt: str | None) -> dict:
+    prompt_cache_meter.reset()
+    prefixes = {}
+    for key in keys:
+        factory, default_prompt = AGENTS[key]
+        agent = _create(factory)
+        prefixes[agent.name] = prefix_fingerprint(agent)
+        for i in range(iterations):
+            print(f"▶ {key} {i + 1}/{iterations}", file=sys.stderr)
+            # 세션 없이 매번 새 대화로 실행 → 요청마다 달라지는 부분은 마지막 사용자 메시지뿐
+            await agent.run(prompt or default_prompt)
+
+    usage = prompt_cache_meter.report()
+    return {name: {"prefix": prefixes[name], **usage.get(name, {})} for name in prefixes}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="에이전트별 캐시된/캐시되지 않은 입력 토큰 측정")
+    parser.add_argument("-a", "--agent", action="append", choices=sorted(AGENTS),
+                        help="측정할 에이전트 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("-n", "--iterations", type=int, default=3, help="에이전트별 요청 횟수")
+    parser.add_argument("-p", "--prompt", help="모든 에이전트에 보낼 요청 (기본: 에이전트별 조회 요청)")
+    parser.add_argument("-o", "--output", help="결과 JSON 저장 경로 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    load_dotenv(override=True)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    result = asyncio.run(measure(args.agent or list(AGENTS), args.iterations, args.prompt))
+    print(prompt_cache_meter.format_report(), file=sys.stderr)
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
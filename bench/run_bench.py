@@ -0,0 +1,188 @@
+"""
+오프라인 성능 벤치마크 실행기
+
+사용 예:
+    python -m bench.run_bench                                  # 전체 시나리오
+    python -m bench.run_bench -s gmail_today -s sdd_specs -n 5
+    python -m bench.run_bench --latency jira=80 --default-latency-ms 20
+    python -m bench.run_bench --size sdd_specs=10 -o bench/result.json
+    python -m bench.run_bench --baseline bench/baseline.json --max-regression 0.2
+
+결과(JSON):
+    시나리오별 반복 전체 p50/p95, 동작별 p50/p95, 대역 서버별 요청 수·바이트(반복당 평균),
+    tracemalloc 기준 최대 메모리, 도구 계측 통계(tools.instrumentation)
+--baseline 이 주어지면 p95 / 요청 수가 max-regression 비율 이상 나빠진 항목을 출력하고 종료 코드 1 을 반환합니다.
+"""
+
+import sys
+import json
+import time
+import argparse
+import logging
+import platform
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from bench.scenarios import SCENARIOS, BenchEnv, OpTimer
+from tools.instrumentation import dump_tool_stats, install_http_hooks, reset_tool_stats
+
+
+def percentile(values: list[float], q: float) -> float:
+    """선형 보간 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def _summary(samples: list[float]) -> dict:
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 0.50), 2),
+        "p95_ms": round(percentile(samples, 0.95), 2),
+        "max_ms": round(max(samples), 2) if samples else 0.0,
+    }
+
+
+def run_scenario(name: str, iterations: int = 3, size: int | None = None,
+                 latency_ms: dict[str, float] | None = None, default_latency_ms: float = 0.0,
+                 warmup: int = 1) -> dict:
+    """시나리오 하나를 실행하고 결과 dict 를 반환합니다."""
+    scenario = SCENARIOS[name]
+    size = size or scenario.default_size
+    services = scenario.make_services(size)
+    latency = {svc: default_latency_ms for svc in services}
+    latency.update(latency_ms or {})
+    install_http_hooks()  # 도구 계측 통계의 HTTP 요청 수 / 바이트 집계
+
+    with BenchEnv(services, latency) as env:
+        # 워밍업: import / 인덱스 생성 / 인증서 로드 등 1회성 비용 제외
+        for i in range(warmup):
+            scenario.run(env, OpTimer(), size, -1 - i)
+
+        env.reset_counters()
+        reset_tool_stats()
+        timer = OpTimer()
+        totals = []
+        tracemalloc.start()
+        try:
+            for i in range(iterations):
+                started = time.perf_counter()
+                scenario.run(env, timer, size, i)
+                totals.append((time.perf_counter() - started) * 1000)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        services_result = {}
+        for svc, counters in env.counters().items():
+            services_result[svc] = {k: round(v / iterations, 1) for k, v in counters.items()}
+            services_result[svc]["latency_ms"] = env[svc].latency_ms
+
+    return {
+        "description": scenario.description,
+        "size": size,
+        "iterations": iterations,
+        "total": _summary(totals),
+        "operations": {op: _summary(samples) for op, samples in timer.samples.items()},
+        "requests_per_iteration": sum(s["requests"] for s in services_result.values()),
+        "services": services_result,
+        "peak_memory_kb": round(peak / 1024, 1),
+        "tools": {
+            tool: {k: v for k, v in stats.items() if k != "buckets_ms"}
+            for tool, stats in dump_tool_stats().items()
+        },
+    }
+
+
+def compare_with_baseline(result: dict, baseline: dict, max_regression: float) -> list[str]:
+    """p95 지연과 반복당 요청 수가 기준 대비 max_regression 비율 이상 증가한 항목을 반환합니다."""
+    regressions = []
+    for name, current in result["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None or base.get("size") != current.get("size"):
+            continue
+        checks = [("total.p95_ms", base["total"]["p95_ms"], current["total"]["p95_ms"]),
+                  ("requests_per_iteration", base["requests_per_iteration"], current["requests_per_iteration"])]
+        for label, before, after in checks:
+            if before and after > before * (1 + max_regression):
+                regressions.append(f"{name} {label}: {before} → {after} (+{(after / before - 1) * 100:.1f}%)")
+    return regressions
+
+
+def _parse_pairs(values: list[str], cast) -> dict:
+    pairs = {}
+    for item in values or []:
+        key, _, value = item.partition("=")
+        if not value:
+            raise argparse.ArgumentTypeError(f"'이름=값' 형식이어야 합니다: {item}")
+        pairs[key] = cast(value)
+    return pairs
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="로컬 대역 서버 기반 도구 성능 벤치마크")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="실행할 시나리오 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("-n", "--iterations", type=int, default=3, help="시나리오별 측정 반복 횟수")
+    parser.add_argument("--warmup", type=int, default=1, help="측정 전 워밍업 반복 횟수")
+    parser.add_argument("--size", action="append", metavar="SCENARIO=N", help="시나리오 크기 변경")
+    parser.add_argument("--latency", action="append", metavar="SERVICE=MS",
+                        help="대역 서버별 응답 지연 (gmail, gtasks, jira, github, azure_search, azure_openai)")
+    parser.add_argument("--default-latency-ms", type=float, default=0.0, help="모든 대역 서버의 기본 응답 지연")
+    parser.add_argument("-o", "--output", help="결과 JSON 저장 경로 (기본: 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용 악화 비율 (기본 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    # 도구 모듈이 import 시 INFO 로깅을 설정하므로 벤치 출력에서는 경고 이상만 표시
+    logging.getLogger().setLevel(logging.WARNING)
+    sizes = _parse_pairs(args.size, int)
+    latency = _parse_pairs(args.latency, float)
+
+    result = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "default_latency_ms": args.default_latency_ms,
+        "scenarios": {},
+    }
+    for name in args.scenario or list(SCENARIOS):
+        print(f"▶ {name} 실행 중...", file=sys.stderr)
+        result["scenarios"][name] = run_scenario(
+            name,
+            iterations=args.iterations,
+            size=sizes.get(name),
+            latency_ms=latency,
+            default_latency_ms=args.default_latency_ms,
+            warmup=args.warmup,
+        )
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_with_baseline(result, baseline, args.max_regression)
+        if regressions:
+            print("❌ 성능 회귀 발견:", file=sys.stderr)
+            for line in regressions:
+                print(f"  - {line}", file=sys.stderr)
+            return 1
+        print("✅ 기준 대비 회귀 없음", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
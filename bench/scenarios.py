@@ -0,0 +1,307 @@
+"""
+벤치마크 시나리오
+
+각 시나리오는 필요한 대역 서버를 띄우고(BenchEnv), 도구 클래스를 실제 클라이언트
+라이브러리 그대로 대역 서버에 연결한 뒤 한 번의 반복(iteration)을 실행합니다.
+반복 안의 세부 동작은 timer.op("이름") 으로 감싸 동작별 지연 시간을 따로 집계합니다.
+
+시나리오 크기(size)는 CLI 의 --size 로 바꿀 수 있으며, 기본값은 실사용 규모에 맞춥니다.
+"""
+
+import os
+import time
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable
+
+from bench.fake_servers import (
+    FakeAzureOpenAI,
+    FakeAzureSearch,
+    FakeGitHub,
+    FakeGmail,
+    FakeGoogleTasks,
+    FakeJira,
+    FakeService,
+    build_google_service,
+    make_self_signed_cert,
+)
+from tools.ai_search_tools import INDEX_ALIAS, INDEX_VERSION_PREFIX, VECTOR_DIMENSIONS
+
+logger = logging.getLogger(__name__)
+
+
+class OpTimer:
+    """한 시나리오 동안 동작 이름별 소요 시간(ms)을 모읍니다."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+
+    @contextmanager
+    def op(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+
+
+class BenchEnv:
+    """
+    시나리오에 필요한 대역 서버를 실행하고 도구가 읽는 환경 변수를 대역 주소로 설정합니다.
+    종료 시 서버를 내리고 환경 변수를 원래대로 되돌립니다.
+    """
+
+    def __init__(self, services: dict[str, FakeService], latency_ms: dict[str, float] | None = None):
+        self.services = services
+        for name, fake in services.items():
+            fake.latency_ms = (latency_ms or {}).get(name, fake.latency_ms)
+        self._saved_env: dict[str, str | None] = {}
+
+    def __getitem__(self, name: str) -> FakeService:
+        return self.services[name]
+
+    def _set_env(self, **values: str):
+        for key, value in values.items():
+            self._saved_env.setdefault(key, os.environ.get(key))
+            os.environ[key] = value
+
+    def __enter__(self) -> "BenchEnv":
+        search = self.services.get("azure_search")
+        if search is not None:
+            # azure-search-documents 는 https 만 허용하므로 자체 서명 인증서로 TLS 실행
+            cert_path, key_path = make_self_signed_cert()
+            search.tls = (cert_path, key_path)
+            self._set_env(REQUESTS_CA_BUNDLE=cert_path)
+
+        for fake in self.services.values():
+            fake.start()
+
+        if "jira" in self.services:
+            self._set_env(
+                JIRA_SERVER_URL=self["jira"].url,
+                JIRA_USER_EMAIL="bench@example.com",
+                JIRA_API_TOKEN="bench-token",
+                JIRA_PROJECT_KEY="KAN",
+            )
+        if "github" in self.services:
+            self._set_env(
+                GITHUB_TOKEN="bench-token",
+                GITHUB_REPO_NAME=self["github"].repo_name,
+                GITHUB_BASE_URL=self["github"].url,
+            )
+        if search is not None:
+            self._set_env(SEARCH_ENDPOINT=search.url, SEARCH_ADMIN_KEY="bench-key")
+        if "azure_openai" in self.services:
+            self._set_env(
+                FOUNDRY_PROJECT_ENDPOINT=self["azure_openai"].url,
+                FOUNDRY_PROJECT_KEY="bench-key",
+                AZURE_OPENAI_EMBEDDING_DEPLOYMENT="text-embedding-3-small",
+            )
+        return self
+
+    def __exit__(self, *exc):
+        for fake in self.services.values():
+            fake.stop()
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        return False
+
+    def reset_counters(self):
+        for fake in self.services.values():
+            fake.reset_counters()
+
+    def counters(self) -> dict[str, dict]:
+        return {name: fake.counters() for name, fake in self.services.items()}
+
+
+# ------------------------------------------------------------------ #
+# 도구 생성 헬퍼                                                      #
+# ------------------------------------------------------------------ #
+
+def _gmail_tools(env: BenchEnv):
+    from tools.gmail_tools import GmailAutomationTools
+    return GmailAutomationTools(service=build_google_service("gmail", "v1", env["gmail"]))
+
+
+def _gtask_tools(env: BenchEnv):
+    from tools.gtask_tools import GoogleTasksAutomationTools
+    return GoogleTasksAutomationTools(service=build_google_service("tasks", "v1", env["gtasks"]))
+
+
+def _github_tools():
+    from github import Github
+    from tools.github_tools import GitHubAutomationTools
+
+    tools = GitHubAutomationTools()
+    # PyGithub 기본 쓰기 간격(1초)은 GitHub 의 secondary rate limit 대응용이므로 대역 서버에서는 제거
+    tools._client = Github(tools.token, base_url=tools.base_url, seconds_between_writes=0)
+    return tools
+
+
+# ------------------------------------------------------------------ #
+# 시나리오                                                            #
+# ------------------------------------------------------------------ #
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    default_size: int
+    # size -> {서비스 이름: 대역 서버}
+    make_services: Callable[[int], dict[str, FakeService]]
+    # (env, timer, size, iteration) -> None
+    run: Callable[[BenchEnv, OpTimer, int, int], None]
+    tags: list[str] = field(default_factory=list)
+
+
+def _run_gmail_today(env, timer, size, iteration):
+    tools = _gmail_tools(env)
+    with timer.op("get_emails_received_today"):
+        tools.get_emails_received_today()
+
+
+def _run_gmail_unread(env, timer, size, iteration):
+    tools = _gmail_tools(env)
+    with timer.op("get_unread_email_titles"):
+        tools.get_unread_email_titles()
+
+
+def _run_tasks_bulk(env, timer, size, iteration):
+    tools = _gtask_tools(env)
+    items = [{"title": f"벤치 할 일 {iteration}-{i}", "notes": "회의록에서 추출"} for i in range(size)]
+    with timer.op("add_google_tasks_bulk"):
+        tools.add_google_tasks_bulk(items)
+
+
+def _run_sdd(env, timer, size, iteration):
+    from tools.jira_tools import JiraAutomationTools
+    from tools.ai_search_tools import AISearchTools
+
+    # 매 반복은 빈 매핑 인덱스에서 시작 (이전 반복 결과가 유사 티켓으로 걸리지 않도록)
+    for docs in env["azure_search"].documents.values():
+        docs.clear()
+
+    jira = JiraAutomationTools()
+    github = _github_tools()
+    search = AISearchTools()
+
+    for i in range(1, size + 1):
+        spec_key = f"KAN-{i}"
+        with timer.op("get_jira_issue"):
+            spec = jira.get_jira_issue(spec_key)
+        with timer.op("search_similar_tickets"):
+            similar = search.search_similar_tickets(spec)
+        if similar.startswith("유사 티켓:"):
+            continue
+        with timer.op("create_jira_issue"):
+            created = jira.create_jira_issue(f"[개발] {spec_key}", spec, "개발")
+        dev_key = created.rsplit(" ", 1)[-1]
+        with timer.op("create_github_issue"):
+            issue = github.create_github_issue(f"[{dev_key}] 구현", spec)
+        with timer.op("save_ticket_mapping"):
+            search.save_ticket_mapping(
+                f"{env['jira'].url}/browse/{spec_key}-{iteration}",
+                spec,
+                f"{env['jira'].url}/browse/{dev_key}",
+                issue.rsplit(" ", 1)[-1],
+            )
+
+
+def _run_sdd_pipeline(env, timer, size, iteration):
+    import asyncio
+    from tools.jira_tools import JiraAutomationTools
+    from tools.ai_search_tools import AISearchTools
+    from agents.sdd.sdd_pipeline import SDDPipeline
+
+    for docs in env["azure_search"].documents.values():
+        docs.clear()
+
+    # 문안 작성 LLM 호출 없이 결정적 단계만 측정
+    pipeline = SDDPipeline(JiraAutomationTools(), _github_tools(), AISearchTools(), chat_client=None)
+    for i in range(1, size + 1):
+        with timer.op("process_spec_ticket"):
+            result = asyncio.run(pipeline.run(f"KAN-{i}"))
+        for step, elapsed in result.timings_ms.items():
+            timer.samples.setdefault(step, []).append(elapsed)
+
+
+def _run_ticket_history(env, timer, size, iteration):
+    from tools.ai_search_tools import AISearchTools
+
+    search = AISearchTools()
+    with timer.op("get_ticket_history"):
+        search.get_ticket_history(top=size)
+
+
+def _history_services(size):
+    search = FakeAzureSearch()
+    search.seed_mappings(f"{INDEX_VERSION_PREFIX}1", size, VECTOR_DIMENSIONS, alias=INDEX_ALIAS)
+    return {"azure_search": search, "azure_openai": FakeAzureOpenAI()}
+
+
+SCENARIOS: dict[str, Scenario] = {
+    s.name: s for s in [
+        Scenario(
+            name="gmail_today",
+            description="오늘 받은 메일 size 건 요약 조회",
+            default_size=300,
+            make_services=lambda size: {"gmail": FakeGmail(message_count=size)},
+            run=_run_gmail_today,
+            tags=["gmail"],
+        ),
+        Scenario(
+            name="gmail_unread",
+            description="받은편지함 size 건 중 읽지 않은 메일 제목 조회",
+            default_size=300,
+            make_services=lambda size: {"gmail": FakeGmail(message_count=size)},
+            run=_run_gmail_unread,
+            tags=["gmail"],
+        ),
+        Scenario(
+            name="tasks_bulk",
+            description="기존 할 일 200건이 있는 목록에 size 건 일괄 추가",
+            default_size=30,
+            make_services=lambda size: {"gtasks": FakeGoogleTasks(task_count=200)},
+            run=_run_tasks_bulk,
+            tags=["gtasks"],
+        ),
+        Scenario(
+            name="sdd_specs",
+            description="사양 티켓 size 건에 대한 SDD 흐름 (조회 → 유사 검색 → 개발 티켓/이슈 생성 → 매핑 저장)",
+            default_size=50,
+            make_services=lambda size: {
+                "jira": FakeJira(spec_count=size),
+                "github": FakeGitHub(),
+                "azure_search": FakeAzureSearch(),
+                "azure_openai": FakeAzureOpenAI(),
+            },
+            run=_run_sdd,
+            tags=["jira", "github", "ai_search"],
+        ),
+        Scenario(
+            name="sdd_pipeline",
+            description="sdd_specs 와 같은 흐름을 SDDPipeline 으로 실행 (JIRA/GitHub 동시 생성)",
+            default_size=50,
+            make_services=lambda size: {
+                "jira": FakeJira(spec_count=size),
+                "github": FakeGitHub(),
+                "azure_search": FakeAzureSearch(),
+                "azure_openai": FakeAzureOpenAI(),
+            },
+            run=_run_sdd_pipeline,
+            tags=["jira", "github", "ai_search"],
+        ),
+        Scenario(
+            name="ticket_history",
+            description="티켓 매핑 size 건 히스토리 조회",
+            default_size=1000,
+            make_services=_history_services,
+            run=_run_ticket_history,
+            tags=["ai_search"],
+        ),
+    ]
+}
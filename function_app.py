@@ -1,10 +1,17 @@
+import os
 import azure.functions as func
 import logging
-from agent_framework.azure import AgentFunctionApp
+from agents.durable_app import PushAgentFunctionApp
 from agents.master_agent import create_master_agent
+from tools.instrumentation import install_http_hooks
 
-app = AgentFunctionApp(
+# 도구 호출별 HTTP 요청 수 / 바이트 집계는 전송 라이브러리를 monkeypatch 하므로 설정한 경우에만
+if os.getenv("TOOL_HTTP_HOOKS") == "1":
+    install_http_hooks()
+
+# 응답 완료는 엔티티 콜백으로 바로 받고, 다른 인스턴스에서 끝난 경우만 backoff 폴링으로 확인
+app = PushAgentFunctionApp(
     agents=[create_master_agent()], 
     enable_health_check=True, 
-    max_poll_retries=50
+    timeout_seconds=50
 )
\ No newline at end of file
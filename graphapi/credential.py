@@ -1,50 +1,113 @@
+import os
 import asyncio
 import datetime
+from dotenv import load_dotenv
 from azure.identity.aio import ClientSecretCredential
+from kiota_abstractions.base_request_configuration import RequestConfiguration
 from msgraph import GraphServiceClient
+from msgraph.generated.users.item.chats.chats_request_builder import ChatsRequestBuilder
+from msgraph.generated.users.item.chats.item.messages.messages_request_builder import MessagesRequestBuilder
 
-# 1. 인증 정보 (실제 환경에서는 .env 사용을 강력 추천합니다)
-AZURE_CLIENT_ID=your_client_id_here
-AZURE_TENANT_ID=your_tenant_id_here
-AZURE_CLIENT_SECRET=your_client_secret_here
-AZURE_USER_ID=your_user_object_id_here
+# 인증 정보는 환경 변수(AZURE_CLIENT_ID / AZURE_TENANT_ID / AZURE_CLIENT_SECRET / AZURE_USER_ID)에서 호출 시점에 읽습니다.
+# .env 로드는 스크립트 실행(main)에서만 합니다. (teams_delta 등이 import 할 때 환경 변수를 덮어쓰지 않도록)
+
+# 동시에 메시지를 조회할 최대 채팅방 수 (Graph 스로틀링 방지)
+MAX_CONCURRENT_CHATS = 8
+# 채팅 메시지 목록 $top 최대값
+MESSAGES_PAGE_SIZE = 50
 
 ### [메서드 1: 인증 및 클라이언트 생성] ###
 async def get_authenticated_client():
     # 비동기 환경에 맞는 ClientSecretCredential 사용
     credential = ClientSecretCredential(
-        tenant_id=TENANT_ID,
-        client_id=CLIENT_ID,
-        client_secret=CLIENT_SECRET
+        tenant_id=os.getenv("AZURE_TENANT_ID"),
+        client_id=os.getenv("AZURE_CLIENT_ID"),
+        client_secret=os.getenv("AZURE_CLIENT_SECRET")
     )
     scopes = ["https://graph.microsoft.com/.default"]
     return GraphServiceClient(credential, scopes)
 
 ### [메서드 2: 팀즈 메시지 수집 로직] ###
-async def fetch_recent_teams_messages(graph_client: GraphServiceClient):
-    lookback_time = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=1)
-    
-    # [변경 전] chats = await graph_client.me.chats.get()
-    # [변경 후] 특정 사용자의 채팅 목록을 가져옵니다.
-    chats = await graph_client.users.by_user_id(USER_ID).chats.get()
-    
+def _to_graph_datetime(value: datetime.datetime) -> str:
+    return value.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+async def _list_recent_chats(graph_client: GraphServiceClient, user_id: str, lookback_time: datetime.datetime):
+    """
+    사용자의 채팅 목록을 @odata.nextLink 로 끝까지 가져옵니다.
+    lastMessagePreview 를 함께 받아 마지막 메시지가 조회 기간 이전인 채팅방은 제외합니다.
+    """
+    chats_builder = graph_client.users.by_user_id(user_id).chats
+    config = RequestConfiguration(
+        query_parameters=ChatsRequestBuilder.ChatsRequestBuilderGetQueryParameters(
+            expand=["lastMessagePreview"],
+        )
+    )
+
+    chats = []
+    page = await chats_builder.get(request_configuration=config)
+    while page:
+        for chat in page.value or []:
+            preview = chat.last_message_preview
+            if preview and preview.created_date_time and preview.created_date_time <= lookback_time:
+                continue
+            chats.append(chat)
+        if not page.odata_next_link:
+            break
+        page = await chats_builder.with_url(page.odata_next_link).get()
+    return chats
+
+
+async def _fetch_chat_messages(graph_client: GraphServiceClient, user_id: str, chat_id: str,
+                               lookback_time: datetime.datetime, semaphore: asyncio.Semaphore):
+    """한 채팅방의 최근 메시지를 서버 측 필터($filter/$orderby/$top)와 페이징으로 가져옵니다."""
+    messages_builder = graph_client.users.by_user_id(user_id).chats.by_chat_id(chat_id).messages
+    config = RequestConfiguration(
+        query_parameters=MessagesRequestBuilder.MessagesRequestBuilderGetQueryParameters(
+            filter=f"lastModifiedDateTime gt {_to_graph_datetime(lookback_time)}",
+            orderby=["lastModifiedDateTime desc"],
+            top=MESSAGES_PAGE_SIZE,
+        )
+    )
+
     results = []
-    if chats and chats.value:
-        for chat in chats.value:
-            # [변경 전] messages = await graph_client.me.chats.by_chat_id(chat.id).messages.get()
-            # [변경 후] 특정 사용자의 특정 채팅방 메시지를 가져옵니다.
-            messages = await graph_client.users.by_user_id(USER_ID).chats.by_chat_id(chat.id).messages.get()
-            
-            if messages and messages.value:
-                for msg in messages.value:
-                    # 시간대 비교 및 내용 존재 여부 확인
-                    if msg.created_date_time > lookback_time and msg.body and msg.body.content:
-                        sender = msg.from_.user.display_name if msg.from_ and msg.from_.user else "Unknown"
-                        results.append({"from": sender, "content": msg.body.content})
+    async with semaphore:
+        page = await messages_builder.get(request_configuration=config)
+        while page:
+            for msg in page.value or []:
+                # 수정 시각으로 걸렀으므로 생성 시각 기준 조건을 한 번 더 확인
+                if msg.created_date_time and msg.created_date_time > lookback_time and msg.body and msg.body.content:
+                    sender = msg.from_.user.display_name if msg.from_ and msg.from_.user else "Unknown"
+                    results.append({"time": msg.created_date_time, "from": sender, "content": msg.body.content})
+            if not page.odata_next_link:
+                break
+            page = await messages_builder.with_url(page.odata_next_link).get()
+    return results
+
+
+async def fetch_recent_teams_messages(graph_client: GraphServiceClient,
+                                      max_concurrency: int = MAX_CONCURRENT_CHATS,
+                                      user_id: str | None = None):
+    user_id = user_id or os.getenv("AZURE_USER_ID")
+    lookback_time = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=1)
+
+    chats = await _list_recent_chats(graph_client, user_id, lookback_time)
+
+    # 채팅방별 조회를 세마포어로 동시 실행 수를 제한하여 병렬 처리
+    semaphore = asyncio.Semaphore(max_concurrency)
+    per_chat = await asyncio.gather(*[
+        _fetch_chat_messages(graph_client, user_id, chat.id, lookback_time, semaphore)
+        for chat in chats
+    ])
+
+    results = [msg for messages in per_chat for msg in messages]
+    results.sort(key=lambda m: m["time"], reverse=True)
     return results
 
 ### [메인 실행부: 결과 출력] ###
 async def main():
+    # .env 에서 인증 정보 로드
+    load_dotenv(override=True)
     try:
         # 1. 인증된 클라이언트 확보
         print("🔐 인증 진행 중...")
@@ -0,0 +1,189 @@
+"""
+Teams 메시지 증분 수집 (Microsoft Graph delta query)
+
+매 실행마다 최근 24시간을 다시 훑는 대신, 채팅방별 messages/delta 의
+@odata.deltaLink 를 로컬 파일에 저장해 두고 다음 실행에서는 새로 생기거나
+변경/삭제된 메시지만 가져옵니다. 결과는 에이전트가 바로 쓸 수 있는
+정규화된 이벤트(dict)의 비동기 스트림으로 내보냅니다.
+
+이벤트 형식:
+    {"event": "created" | "updated" | "deleted",
+     "chat_id": ..., "message_id": ..., "time": datetime, "from": ..., "content": ...}
+"""
+
+import os
+import json
+import asyncio
+import logging
+import tempfile
+import datetime
+from typing import AsyncIterator
+
+from dotenv import load_dotenv
+from kiota_abstractions.api_error import APIError
+from msgraph import GraphServiceClient
+
+from graphapi.credential import MAX_CONCURRENT_CHATS, get_authenticated_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = "./credentials/teams_delta_state.json"
+
+# 큐에 넣는 채팅방 완료 신호 (이벤트를 모두 내보낸 뒤 deltaLink 를 저장하기 위함)
+_CHAT_DONE = "__chat_done__"
+
+
+class DeltaTokenStore:
+    """채팅방 ID -> deltaLink 를 JSON 파일로 보관합니다. (임시 파일 + os.replace 로 저장)"""
+
+    def __init__(self, path: str | None = None):
+        # 경로 환경 변수는 main() 의 .env 로드 이후에 읽도록 생성 시점에 확인
+        path = path or os.getenv("TEAMS_DELTA_STATE_PATH", DEFAULT_STATE_PATH)
+        self.path = path
+        self._links: dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._links = json.load(f).get("delta_links", {})
+
+    def get(self, chat_id: str) -> str | None:
+        return self._links.get(chat_id)
+
+    def set(self, chat_id: str, delta_link: str):
+        self._links[chat_id] = delta_link
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".teams-delta-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                json.dump({"delta_links": self._links}, tmp, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def normalize_message(chat_id: str, msg) -> dict:
+    """Graph chatMessage 를 에이전트용 이벤트로 변환합니다."""
+    if msg.deleted_date_time is not None:
+        event = "deleted"
+    elif msg.last_modified_date_time and msg.created_date_time and msg.last_modified_date_time > msg.created_date_time:
+        event = "updated"
+    else:
+        event = "created"
+
+    sender = msg.from_.user.display_name if msg.from_ and msg.from_.user else "Unknown"
+    return {
+        "event": event,
+        "chat_id": chat_id,
+        "message_id": msg.id,
+        "time": msg.last_modified_date_time or msg.created_date_time,
+        "from": sender,
+        "content": msg.body.content if msg.body and msg.body.content else "",
+    }
+
+
+async def _list_chat_ids(graph_client: GraphServiceClient, user_id: str) -> list[str]:
+    chats_builder = graph_client.users.by_user_id(user_id).chats
+    chat_ids = []
+    page = await chats_builder.get()
+    while page:
+        chat_ids.extend(chat.id for chat in page.value or [])
+        if not page.odata_next_link:
+            break
+        page = await chats_builder.with_url(page.odata_next_link).get()
+    return chat_ids
+
+
+async def _sync_chat(graph_client: GraphServiceClient, user_id: str, chat_id: str,
+                     store: DeltaTokenStore, queue: asyncio.Queue, semaphore: asyncio.Semaphore):
+    """한 채팅방의 delta 를 끝까지(nextLink -> deltaLink) 따라가며 이벤트를 큐에 넣습니다."""
+    delta_builder = graph_client.users.by_user_id(user_id).chats.by_chat_id(chat_id).messages.delta
+
+    delta_link = None
+    async with semaphore:
+        try:
+            saved_link = store.get(chat_id)
+            try:
+                page = await (delta_builder.with_url(saved_link).get() if saved_link else delta_builder.get())
+            except APIError as e:
+                if saved_link and e.response_status_code == 410:
+                    # deltaLink 만료 → 처음부터 다시 동기화
+                    logger.warning(f"deltaLink 만료, 전체 재동기화: {chat_id}")
+                    page = await delta_builder.get()
+                else:
+                    raise
+
+            while page:
+                for msg in page.value or []:
+                    await queue.put(normalize_message(chat_id, msg))
+                if page.odata_next_link:
+                    page = await delta_builder.with_url(page.odata_next_link).get()
+                    continue
+                delta_link = page.odata_delta_link
+                break
+        except Exception as e:
+            # 한 채팅방 실패가 전체 수집을 막지 않도록 기록만 하고, deltaLink 는 갱신하지 않음
+            logger.error(f"채팅방 delta 조회 실패: {chat_id} - {str(e)}", exc_info=True)
+            delta_link = None
+
+    await queue.put((_CHAT_DONE, chat_id, delta_link))
+
+
+async def stream_teams_message_events(graph_client: GraphServiceClient,
+                                      store: DeltaTokenStore | None = None,
+                                      user_id: str | None = None,
+                                      max_concurrency: int = MAX_CONCURRENT_CHATS) -> AsyncIterator[dict]:
+    """
+    모든 채팅방의 변경분을 동시에 수집하여 이벤트 단위로 yield 합니다.
+    채팅방의 이벤트를 모두 내보낸 뒤에만 해당 deltaLink 를 저장하므로,
+    소비 도중 중단되면 다음 실행에서 같은 변경분을 다시 받습니다. (at-least-once)
+    """
+    store = store or DeltaTokenStore()
+    user_id = user_id or os.getenv("AZURE_USER_ID")
+
+    chat_ids = await _list_chat_ids(graph_client, user_id)
+    if not chat_ids:
+        return
+
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = [
+        asyncio.create_task(_sync_chat(graph_client, user_id, chat_id, store, queue, semaphore))
+        for chat_id in chat_ids
+    ]
+
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if isinstance(item, tuple) and item[0] == _CHAT_DONE:
+                _, chat_id, delta_link = item
+                if delta_link:
+                    store.set(chat_id, delta_link)
+                    store.save()
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+async def main():
+    load_dotenv(override=True)
+    graph_client = await get_authenticated_client()
+    store = DeltaTokenStore()
+
+    count = 0
+    async for event in stream_teams_message_events(graph_client, store):
+        count += 1
+        time = event["time"].strftime('%m/%d %H:%M') if isinstance(event["time"], datetime.datetime) else "-"
+        print(f"[{event['event']}] {time} | {event['from']}: {event['content'][:100].strip()}")
+    print(f"📊 수집된 변경 이벤트: {count}개 (deltaLink 저장 위치: {store.path})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
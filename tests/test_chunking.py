@@ -0,0 +1,114 @@
+"""
+긴 사양 청크 테스트 - 겹치는 청크 분할 / 청크 자식 문서 저장 / 청크 단위 max-sim 매칭
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from tools.ai_search_tools import AISearchTools
+from tools.chunking import chunk_text, spread
+
+TOPICS = ["결제", "알림", "로그인", "검색"]
+
+
+def topic_embedding(text: str) -> list[float]:
+    """주제 단어 빈도 벡터 (청크 내용이 어느 주제인지에 따라 방향이 정해짐)"""
+    vector = np.array([text.count(topic) for topic in TOPICS], dtype=float) + 1e-3
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class MemorySearchClient:
+    def __init__(self):
+        self.docs = {}
+        self.deleted = []
+
+    def merge_or_upload_documents(self, documents):
+        for doc in documents:
+            self.docs.setdefault(doc["id"], {}).update(doc)
+
+        class Result:
+            succeeded, key, error_message = True, documents[0]["id"], None
+        return [Result()]
+
+    def delete_documents(self, documents):
+        for doc in documents:
+            self.deleted.append(doc["id"])
+            self.docs.pop(doc["id"], None)
+
+    def search(self, search_text=None, vector_queries=None, filter=None, select=None, top=None, **kwargs):
+        docs = list(self.docs.values())
+        if filter:
+            field, _, value = filter.partition(" eq ")
+            docs = [d for d in docs if d.get(field) == (None if value == "null" else value.strip("'"))]
+        return iter([{**d, "@search.score": 0.5} for d in docs])
+
+
+def make_tools(monkeypatch):
+    tools = AISearchTools()
+    tools._index_checked = True
+    tools._search_client = MemorySearchClient()
+    embedded = []
+
+    def embed_many(texts):
+        embedded.append(len(texts))
+        return [topic_embedding(t) for t in texts]
+
+    monkeypatch.setattr(tools, "_embed_many", embed_many)
+    monkeypatch.setattr(tools, "_get_embedding", topic_embedding)
+    return tools, embedded
+
+
+def section(topic: str, sentences: int) -> str:
+    return " ".join(f"{topic} 요구사항 {i} 를 처리한다." for i in range(sentences))
+
+
+def test_chunks_overlap_and_respect_max_size():
+    text = "\n\n".join(section(topic, 40) for topic in TOPICS)
+    chunks = chunk_text(text, max_chars=500, overlap=80)
+
+    print(len(text), [len(c) for c in chunks])
+    assert all(len(c) <= 500 for c in chunks)
+    # 이웃 청크는 앞 청크의 끝부분을 공유
+    assert all(a[-40:].strip()[:20] in b for a, b in zip(chunks, chunks[1:]))
+    assert chunk_text("짧은 사양") == ["짧은 사양"]
+    assert spread(list(range(10)), 4) == [0, 3, 6, 9]
+
+
+def test_long_spec_is_stored_as_chunk_children_and_shrinking_removes_stale(monkeypatch):
+    tools, embedded = make_tools(monkeypatch)
+    link = "https://example.atlassian.net/browse/KAN-7"
+    long_spec = section("결제", 120) + "\n\n" + section("알림", 120)
+
+    assert tools.save_ticket_mapping(link, long_spec, "dev", "gh").startswith("✅")
+    docs = tools._search_client.docs
+    parent_id = tools.mapping_id(link)
+    children = [d for d in docs.values() if d.get("parent_id") == parent_id]
+    assert len(children) >= 3 and embedded == [len(children)]
+    assert all(len(d["spec_ticket_content"]) <= 1500 for d in children)
+
+    # 짧아진 사양으로 다시 저장하면 이전 청크 문서는 삭제
+    assert tools.save_ticket_mapping(link, "결제 요구사항 요약", "dev", "gh").startswith("✅")
+    assert list(tools._search_client.docs) == [parent_id]
+    assert len(tools._search_client.deleted) == len(children)
+
+
+def test_section_query_matches_long_spec_by_max_sim(monkeypatch):
+    tools, _ = make_tools(monkeypatch)
+    monkeypatch.setattr(tools, "_similarity_thresholds", {"KAN": 0.9})
+    link = "https://example.atlassian.net/browse/KAN-8"
+    long_spec = section("결제", 120) + "\n\n" + section("알림", 120)
+    tools.save_ticket_mapping(link, long_spec, "dev", "gh")
+
+    # 문서 전체 벡터(평균 방향)로는 임계치 미만이지만, 알림 구간 청크와는 거의 같음
+    parent = tools._search_client.docs[tools.mapping_id(link)]
+    assert float(np.dot(parent["spec_ticket_vector"], topic_embedding("알림"))) < 0.9
+
+    matched = tools.find_similar_tickets(section("알림", 5))
+    assert len(matched) == 1
+    assert matched[0]["id"] == tools.mapping_id(link) and matched[0]["score"] > 0.95
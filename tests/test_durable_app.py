@@ -0,0 +1,139 @@
+"""
+Push Agent Function App 테스트 - 엔티티 콜백 알림으로 바로 응답 / 다른 인스턴스 완료는 backoff 폴링 / 시간 초과
+/ 알림 응답과 폴링 응답의 필드 일치
+(Functions 호스트 없이 HTTP 트리거의 응답 대기 부분만 실행)
+"""
+
+import sys
+import time
+import asyncio
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from agent_framework import AgentResponse, Message
+from agent_framework_durabletask import DurableAgentState, RunRequest
+from agent_framework_durabletask._durable_agent_state import DurableAgentStateRequest, DurableAgentStateResponse
+
+from agents.durable_app import PushAgentFunctionApp, backoff_intervals
+
+
+class EmptyStateClient:
+    """엔티티 상태가 아직 없는 DurableOrchestrationClient 대역 (조회 수 기록)"""
+
+    def __init__(self):
+        self.reads = 0
+
+    async def read_entity_state(self, entity_instance_id):
+        self.reads += 1
+        return None
+
+
+class StateClient:
+    """이전 대화 1턴(요청 + 응답)이 저장된 엔티티 상태를 돌려주는 대역"""
+
+    def __init__(self):
+        self.state = DurableAgentState()
+        self.add_turn("old", "이전 질문", "이전 답변")
+
+    def add_turn(self, correlation_id, question, answer):
+        request = RunRequest(message=question, correlation_id=correlation_id, created_at=datetime.now(timezone.utc))
+        response = AgentResponse(messages=[Message("assistant", text=answer)])
+        self.state.data.conversation_history.append(DurableAgentStateRequest.from_run_request(request))
+        self.state.data.conversation_history.append(DurableAgentStateResponse.from_run_response(correlation_id, response))
+
+    async def read_entity_state(self, entity_instance_id):
+        return SimpleNamespace(entity_exists=True, entity_state=self.state.to_dict())
+
+
+def _wait(app, client, correlation_id="c-1"):
+    return app._get_response_from_entity(client=client, entity_instance_id=None, correlation_id=correlation_id,
+                                         message="오늘 메일 알려줘", thread_id="t-1")
+
+
+def test_entity_callback_wakes_waiting_request_immediately():
+    app = PushAgentFunctionApp(agents=[], timeout_seconds=10)
+    client = EmptyStateClient()
+
+    def entity_worker():
+        # 엔티티는 별도 스레드의 이벤트 루프에서 콜백을 호출
+        time.sleep(0.3)
+        asyncio.run(app.notifier.on_agent_response(SimpleNamespace(text="메일 3통"),
+                                                   SimpleNamespace(correlation_id="c-1")))
+
+    async def run():
+        threading.Thread(target=entity_worker).start()
+        start = time.perf_counter()
+        result = await _wait(app, client)
+        return result, time.perf_counter() - start
+
+    result, elapsed = asyncio.run(run())
+    print(result, f"{elapsed:.3f}s", client.reads)
+
+    assert result["status"] == "success" and result["response"] == "메일 3통"
+    assert result["completed_via"] == "push"
+    assert elapsed < 0.45
+    assert client.reads <= 2
+
+
+def test_response_finished_before_wait_is_not_lost():
+    app = PushAgentFunctionApp(agents=[], timeout_seconds=10)
+    app.notifier.notify("c-2", "이미 끝남")
+
+    result = asyncio.run(_wait(app, EmptyStateClient(), correlation_id="c-2"))
+    assert result["response"] == "이미 끝남" and result["polls"] == 0
+
+
+def test_falls_back_to_backoff_polling_and_times_out():
+    app = PushAgentFunctionApp(agents=[], timeout_seconds=1.5, poll_initial_seconds=0.1, poll_max_seconds=0.4)
+    done_at = time.perf_counter() + 0.6
+
+    async def poll(**kwargs):
+        # 다른 인스턴스에서 끝나 알림 없이 상태에만 응답이 생기는 경우
+        if time.perf_counter() >= done_at:
+            return {"status": "success", "response": "완료"}
+        return None
+
+    app._poll_entity_for_response = poll
+    result = asyncio.run(_wait(app, EmptyStateClient()))
+    assert result["completed_via"] == "poll" and result["polls"] <= 5
+
+    client = EmptyStateClient()
+    del app._poll_entity_for_response
+    timed_out = asyncio.run(_wait(app, client, correlation_id="c-3"))
+    print(timed_out, client.reads)
+    assert timed_out["status"] == "timeout"
+    # 1초 고정 간격이 아니라 0.1 → 0.4 초로 늘어나는 간격
+    assert 3 <= client.reads <= 7
+
+
+def test_push_and_poll_results_have_the_same_fields():
+    app = PushAgentFunctionApp(agents=[], timeout_seconds=10, poll_initial_seconds=0.05)
+    client = StateClient()
+
+    # 알림이 먼저 옴 (엔티티가 아직 이번 요청/응답을 저장하기 전)
+    app.notifier.notify("c-4", "메일 3통")
+    pushed = asyncio.run(_wait(app, client, correlation_id="c-4"))
+
+    # 같은 대화가 저장된 뒤 폴링으로 받은 응답
+    client.add_turn("c-4", "오늘 메일 알려줘", "메일 3통")
+    polled = asyncio.run(_wait(app, client, correlation_id="c-4"))
+    print(pushed, polled)
+
+    assert pushed["completed_via"] == "push" and polled["completed_via"] == "poll"
+    assert set(pushed) == set(polled)
+    assert pushed["message_count"] == polled["message_count"] == 4
+
+    # 상태가 저장된 뒤에 알림을 받은 경우에도 같은 값
+    app.notifier.notify("c-4", "메일 3통")
+    assert asyncio.run(_wait(app, client, correlation_id="c-4"))["message_count"] == 4
+
+
+def test_backoff_intervals_grow_to_maximum():
+    intervals = backoff_intervals(0.25, 2.0, 2.0)
+    assert [next(intervals) for _ in range(6)] == [0.25, 0.5, 1.0, 2.0, 2.0, 2.0]
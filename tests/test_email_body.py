@@ -0,0 +1,141 @@
+"""
+메일 본문 조회 테스트 - 텍스트 파트만 / 첨부 미수신 / HTML → 텍스트 / 바이트 예산 / 메시지 ID 별 캐시
+/ 깊게 중첩된 전달 메일 (대역 Gmail 서버 사용, fields 부분 응답 적용)
+"""
+
+import sys
+import base64
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from bench.fake_servers import FakeGmail, build_google_service
+from bench.scenarios import BenchEnv
+from tools.gmail_tools import EMAIL_BODY_MAX_BYTES, GmailAutomationTools
+from tools.mail_body import BodyReader
+
+
+def b64(text: str, charset: str = "utf-8") -> str:
+    return base64.urlsafe_b64encode(text.encode(charset)).decode().rstrip("=")
+
+
+def part(part_id, mime_type, data=None, filename="", attachment_id=None, charset="utf-8", size=None):
+    body = {"size": size or len(data or "") * 3 // 4}
+    if data is not None:
+        body["data"] = data
+    if attachment_id:
+        body["attachmentId"] = attachment_id
+    return {"partId": part_id, "mimeType": mime_type, "filename": filename, "body": body,
+            "headers": [{"name": "Content-Type", "value": f"{mime_type}; charset={charset}"}]}
+
+
+def add_message(gmail: FakeGmail, msg_id: str, payload: dict, subject: str = "회의 안건"):
+    payload.setdefault("headers", []).extend([
+        {"name": "Subject", "value": subject}, {"name": "From", "value": "boss@example.com"},
+    ])
+    gmail.messages[msg_id] = {"id": msg_id, "threadId": msg_id, "labelIds": ["INBOX"], "payload": payload}
+
+
+def test_reads_plain_alternative_without_downloading_attachment():
+    gmail = FakeGmail(message_count=0)
+    gmail.attachments["att-pdf"] = "QUJD" * 2_000_000  # 6 MB 첨부
+    add_message(gmail, "mixed", {
+        "partId": "", "mimeType": "multipart/mixed", "parts": [
+            {"partId": "0", "mimeType": "multipart/alternative", "parts": [
+                part("0.0", "text/plain", b64("금요일까지 보고서를 제출해 주세요.\r\n감사합니다.")),
+                part("0.1", "text/html", b64("<p>금요일까지 <b>보고서</b>를 제출해 주세요.</p>")),
+            ]},
+            part("1", "application/pdf", filename="report.pdf", attachment_id="att-pdf", size=6_000_000),
+        ],
+    })
+
+    with BenchEnv({"gmail": gmail}):
+        tools = GmailAutomationTools(service=build_google_service("gmail", "v1", gmail))
+        text = tools.get_email_body("mixed")
+        requests = gmail.request_count
+        assert tools.get_email_body("mixed") == text  # 메시지 ID 별 캐시
+
+    print(text)
+    assert text.splitlines()[0] == "제목: 회의 안건"
+    assert "금요일까지 보고서를 제출해 주세요.\n감사합니다." in text and "<b>" not in text
+    assert gmail.attachment_bytes == 0 and gmail.bytes_sent < 10_000
+    assert requests == 1 and gmail.request_count == 1
+
+
+def test_html_only_and_split_large_part_respect_byte_budget():
+    gmail = FakeGmail(message_count=0)
+    html = ("<html><head><style>p {color: red}</style></head><body><script>track()</script>"
+            "<h1>주간 보고</h1><ul><li>배포 일정 확정</li><li>리뷰 &amp; 테스트</li></ul>&nbsp;</body></html>")
+    add_message(gmail, "html", {"partId": "", **part("", "text/html", b64(html))})
+
+    long_text = "가나다라마바사 " * 10_000  # 약 220 KB, 분리된 텍스트 파트
+    gmail.attachments["att-text"] = b64(long_text)
+    add_message(gmail, "long", {
+        "partId": "", "mimeType": "multipart/mixed", "parts": [
+            part("0", "text/plain", attachment_id="att-text", size=len(long_text.encode())),
+            part("1", "text/plain", b64("두 번째 파트"), filename="notes.txt"),
+        ],
+    })
+
+    with BenchEnv({"gmail": gmail}):
+        tools = GmailAutomationTools(service=build_google_service("gmail", "v1", gmail))
+        html_text = tools.get_email_body("html")
+        long_body = tools.get_email_body("long")
+        missing = tools.get_email_body("nope")
+
+    print(html_text)
+    assert html_text.endswith("주간 보고\n- 배포 일정 확정\n- 리뷰 & 테스트")
+    assert "track()" not in html_text and "color" not in html_text
+
+    body = long_body.split("\n\n", 1)[1]
+    assert len(body.encode()) <= EMAIL_BODY_MAX_BYTES + 200
+    assert long_body.endswith(f"앞 {EMAIL_BODY_MAX_BYTES} bytes 만 표시)")
+    assert "두 번째 파트" not in long_body  # filename 이 있는 파트는 첨부로 취급
+    assert missing.startswith("메일 본문 조회 중 오류 발생")
+
+
+def test_deeply_nested_forwarded_message_keeps_text_parts():
+    # 전달의 전달: mixed > rfc822 > mixed > rfc822 > mixed > alternative > text/plain (7 단계)
+    inner = {"partId": "0.1.0.1.0", "mimeType": "multipart/mixed", "parts": [
+        {"partId": "0.1.0.1.0.0", "mimeType": "multipart/alternative", "parts": [
+            part("0.1.0.1.0.0.0", "text/plain", b64("원본 메일: 서버 점검은 토요일 02시입니다.")),
+            part("0.1.0.1.0.0.1", "text/html", b64("<p>원본 메일: 서버 점검은 토요일 02시입니다.</p>")),
+        ]},
+    ]}
+    forwarded = {"partId": "0.1", "mimeType": "message/rfc822", "parts": [
+        {"partId": "0.1.0", "mimeType": "multipart/mixed", "parts": [
+            part("0.1.0.0", "text/plain", b64("중간 전달: 확인 부탁드립니다.")),
+            {"partId": "0.1.0.1", "mimeType": "message/rfc822", "parts": [inner]},
+        ]},
+    ]}
+    gmail = FakeGmail(message_count=0)
+    add_message(gmail, "fwd", {
+        "partId": "", "mimeType": "multipart/mixed", "parts": [
+            {"partId": "0", "mimeType": "multipart/mixed", "parts": [
+                part("0.0", "text/plain", b64("FYI 아래 메일 전달합니다.")),
+                forwarded,
+            ]},
+        ],
+    }, subject="Fwd: Fwd: 서버 점검 안내")
+    gmail.messages["fwd"]["snippet"] = "FYI 아래 메일 전달합니다."
+
+    with BenchEnv({"gmail": gmail}):
+        tools = GmailAutomationTools(service=build_google_service("gmail", "v1", gmail))
+        text = tools.get_email_body("fwd")
+
+    print(text)
+    assert "FYI 아래 메일 전달합니다." in text
+    assert "중간 전달: 확인 부탁드립니다." in text
+    assert "원본 메일: 서버 점검은 토요일 02시입니다." in text
+
+
+def test_reader_decodes_in_chunks_with_charset_and_stops_at_budget():
+    reader = BodyReader(max_bytes=30)
+    reader.feed(b64("안녕하세요 회의 자료입니다", "euc-kr"), "euc-kr")
+    assert reader.text() == "안녕하세요 회의 자료입니다"
+
+    reader = BodyReader(max_bytes=10)
+    reader.feed(b64("가나다라마바사"))  # 한 글자 3 bytes → 10 bytes 안의 온전한 3 글자만
+    assert reader.text() == "가나다" and reader.truncated and reader.exhausted
@@ -0,0 +1,90 @@
+"""
+임베딩 요청 묶기 테스트 - 동시 요청은 한 번의 batch 호출로 / 결과는 각 호출자에게 / 실패는 묶음 전체에 전달
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from tools.embedding_batcher import EmbeddingBatcher
+
+
+class RecordingEmbedder:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        time.sleep(0.05)  # API 왕복
+        if self.fail:
+            raise RuntimeError("429 Too Many Requests")
+        return [[float(len(text)), float(hash(text) % 97)] for text in texts]
+
+
+def test_concurrent_requests_are_coalesced_and_fanned_back():
+    embedder = RecordingEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_batch=8, max_wait_ms=20)
+    texts = [f"사양 티켓 {i % 12}" for i in range(24)]
+
+    with ThreadPoolExecutor(max_workers=24) as pool:
+        vectors = list(pool.map(batcher.embed, texts))
+
+    print([len(c) for c in embedder.calls])
+    assert vectors == [[float(len(t)), float(hash(t) % 97)] for t in texts]
+    # 24개 요청 → 최대 8개씩 묶인 몇 번의 호출 (같은 텍스트는 한 번만 전송)
+    assert len(embedder.calls) <= 5
+    assert all(len(call) <= 8 and len(call) == len(set(call)) for call in embedder.calls)
+    assert batcher.requests == 24 and batcher.calls == len(embedder.calls)
+
+
+def test_single_request_waits_only_the_window():
+    batcher = EmbeddingBatcher(RecordingEmbedder(), max_wait_ms=10)
+    start = time.perf_counter()
+    assert batcher.embed("abc") == [3.0, float(hash("abc") % 97)]
+    assert time.perf_counter() - start < 0.2
+
+
+def test_failure_is_raised_to_every_caller_in_batch():
+    batcher = EmbeddingBatcher(RecordingEmbedder(fail=True), max_wait_ms=20)
+
+    def embed(text):
+        with pytest.raises(RuntimeError, match="429"):
+            batcher.embed(text)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(embed, ["a", "b", "c", "d"]))
+    # 다음 요청은 새 묶음으로 다시 시도 가능
+    batcher.embed_many = RecordingEmbedder()
+    assert batcher.embed("a") == [1.0, float(hash("a") % 97)]
+
+
+def test_short_response_fails_every_caller_instead_of_hanging():
+    def drops_one(texts):
+        time.sleep(0.02)
+        return [[1.0] for _ in texts[:-1]]
+
+    batcher = EmbeddingBatcher(drops_one, max_wait_ms=20)
+
+    def embed(text):
+        with pytest.raises(ValueError, match="응답 수"):
+            batcher.embed(text)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(embed, ["a", "b", "c", "d"]))
+
+
+def test_batchers_are_separated_by_client_settings():
+    from tools.embedding_batcher import get_batcher
+
+    first = get_batcher(("https://a", "emb", "2024-02-01", "key-1"), RecordingEmbedder())
+    other_key = get_batcher(("https://a", "emb", "2024-02-01", "key-2"), RecordingEmbedder())
+    assert first is not other_key
+    assert get_batcher(("https://a", "emb", "2024-02-01", "key-1"), RecordingEmbedder()) is first
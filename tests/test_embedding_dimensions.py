@@ -0,0 +1,62 @@
+"""
+임베딩 축소 차원 테스트 - dimensions= 전달 / 설정 차원으로 인덱스 생성 / recall 평가 스크립트
+(대역 Azure AI Search / Azure OpenAI 서버 사용)
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import numpy as np
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from bench.embedding_dimensions_eval import evaluate, main, recall_at_k
+from bench.fake_servers import FakeAzureOpenAI, FakeAzureSearch
+from bench.scenarios import BenchEnv
+from tools.ai_search_tools import AISearchTools
+
+
+def test_reduced_dimensions_flow_to_embeddings_and_index_schema(monkeypatch):
+    search = FakeAzureSearch()
+    with BenchEnv({"azure_search": search, "azure_openai": FakeAzureOpenAI()}):
+        monkeypatch.setenv("AZURE_OPENAI_EMBEDDING_DIMENSIONS", "256")
+        tools = AISearchTools()
+        tools.save_ticket_mapping("https://x.atlassian.net/browse/KAN-1", "로그인 기능", "d", "g")
+        matched = tools.find_similar_tickets("로그인 기능")
+
+    index = search.indexes["sdd-tickets-v1"]
+    vector_field = next(f for f in index["fields"] if f["name"] == "spec_ticket_vector")
+    stored = next(iter(search.documents["sdd-tickets-v1"].values()))
+    assert vector_field["dimensions"] == 256
+    assert len(stored["spec_ticket_vector"]) == 256
+    assert matched[0]["score"] > 0.99
+
+
+def test_recall_of_truncated_vectors_against_baseline():
+    rng = np.random.default_rng(7)
+    # 앞쪽 차원에 정보가 몰린 (text-embedding-3 와 비슷한) 벡터
+    baseline = rng.normal(size=(200, 1536)) * np.linspace(3, 0.1, 1536)
+    vectors = {1536: baseline, 64: baseline[:, :64], 512: baseline[:, :512]}
+
+    result = evaluate(vectors, 1536, k=5)
+    print(result)
+    assert result["1536"]["recall_at_k"] == 1.0
+    assert result["64"]["recall_at_k"] < result["512"]["recall_at_k"] < 1.0
+    assert result["512"]["bytes_per_vector"] == 2048
+    assert recall_at_k(baseline, baseline[:, ::-1], k=3) == 1.0  # 차원 순서만 바뀐 벡터는 같은 이웃
+
+
+def test_eval_script_runs_against_fake_servers(tmp_path):
+    corpus = tmp_path / "specs.jsonl"
+    corpus.write_text("\n".join(json.dumps({"text": f"사양 티켓 {i}"}) for i in range(20)), encoding="utf-8")
+    output = tmp_path / "dimensions.json"
+
+    with BenchEnv({"azure_search": FakeAzureSearch(), "azure_openai": FakeAzureOpenAI()}):
+        assert main(["-d", "256", "512", "--corpus", str(corpus), "-k", "3", "-o", str(output)]) == 0
+
+    result = json.loads(output.read_text(encoding="utf-8"))
+    assert result["corpus_size"] == 20 and set(result["dimensions"]) == {"256", "512", "1536"}
+    assert result["dimensions"]["1536"]["recall_at_k"] == 1.0
@@ -0,0 +1,107 @@
+"""
+Fan-out 테스트 - 동기 도구를 쓰는 하위 에이전트 두 개를 동시에 호출하면 지연이 max 가 되는지, 분기별 타임아웃 확인
+"""
+
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from agent_framework import AgentResponse, BaseAgent, Message
+
+from agents.fanout import offload_sync_tools, sub_agent_tool
+
+TOOL_DELAY = 0.3
+
+
+class ToolCallingAgent(BaseAgent):
+    """LLM 대신 등록된 도구 하나를 호출하고 그 결과로 답하는 가짜 하위 에이전트"""
+
+    def __init__(self, name, tool, **kwargs):
+        super().__init__(name=name, **kwargs)
+        self.tool = tool
+
+    async def run(self, messages=None, *, stream=False, session=None, **kwargs):
+        result = await self.tool(messages) if asyncio.iscoroutinefunction(self.tool) else self.tool(messages)
+        return AgentResponse(messages=[Message("assistant", text=result)])
+
+
+def slow_gmail_call(query: str) -> str:
+    """동기 HTTP 호출을 흉내 냄"""
+    time.sleep(TOOL_DELAY)
+    return f"메일 결과: {query}"
+
+
+def slow_tasks_call(query: str) -> str:
+    time.sleep(TOOL_DELAY)
+    return f"할 일 결과: {query}"
+
+
+async def _fan_out(*tools):
+    # 프레임워크가 한 턴의 function call 들을 실행하는 방식(asyncio.gather)과 동일
+    return await asyncio.gather(*[t.invoke(arguments={"task": "요약해줘"}) for t in tools])
+
+
+def test_sub_agents_with_sync_tools_run_concurrently():
+    lock = threading.Lock()
+    mail = sub_agent_tool(ToolCallingAgent("mail", offload_sync_tools([slow_gmail_call], lock=lock)[0]),
+                          name="MailAgent", description="메일")
+    tasks = sub_agent_tool(ToolCallingAgent("tasks", offload_sync_tools([slow_tasks_call])[0]),
+                           name="TasksAgent", description="할 일")
+
+    started = time.perf_counter()
+    results = asyncio.run(_fan_out(mail, tasks))
+    elapsed = time.perf_counter() - started
+    print(results, f"{elapsed:.3f}s")
+
+    assert [str(r) for r in results] == ["메일 결과: 요약해줘", "할 일 결과: 요약해줘"]
+    # 합(0.6초)이 아니라 가장 느린 분기(0.3초) 수준
+    assert elapsed < TOOL_DELAY * 1.7
+
+
+def test_branch_timeout_returns_error_without_blocking_other_branch():
+    async def hanging_call(query: str) -> str:
+        await asyncio.sleep(10)
+        return "never"
+
+    slow = sub_agent_tool(ToolCallingAgent("slow", hanging_call), name="TasksAgent", description="할 일", timeout=0.2)
+    mail = sub_agent_tool(ToolCallingAgent("mail", offload_sync_tools([slow_gmail_call])[0]),
+                          name="MailAgent", description="메일")
+
+    started = time.perf_counter()
+    mail_result, slow_result = asyncio.run(_fan_out(mail, slow))
+    elapsed = time.perf_counter() - started
+
+    assert str(mail_result) == "메일 결과: 요약해줘"
+    assert str(slow_result).startswith("Error: TasksAgent")
+    assert elapsed < TOOL_DELAY * 1.7
+
+
+def test_offload_keeps_tool_schema_and_lock_serializes():
+    active, peak = [0], [0]
+    guard = threading.Lock()
+
+    def call(query: str) -> str:
+        """동시 실행 수 기록"""
+        with guard:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with guard:
+            active[0] -= 1
+        return query
+
+    first, second = offload_sync_tools([call, call], lock=threading.Lock())
+    assert first.__name__ == "call" and asyncio.iscoroutinefunction(first)
+
+    async def run_both():
+        return await asyncio.gather(first("a"), second("b"))
+
+    assert asyncio.run(run_both()) == ["a", "b"]
+    # 같은 클라이언트를 쓰는 도구끼리는 겹치지 않음
+    assert peak[0] == 1
@@ -0,0 +1,145 @@
+"""
+Google 토큰 저장소 테스트 - 동시 갱신 시 single-flight / atomic write 확인
+"""
+
+import sys
+import json
+import threading
+import datetime
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from google.oauth2.credentials import Credentials
+from tools import google_credential_store
+
+SCOPES = ["https://www.googleapis.com/auth/tasks"]
+
+
+def _write_expired_token(token_path: Path):
+    token_path.write_text(json.dumps({
+        "token": "expired-token",
+        "refresh_token": "refresh-token",
+        "client_id": "client-id",
+        "client_secret": "client-secret",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "scopes": SCOPES,
+        "expiry": "2000-01-01T00:00:00Z",
+    }))
+
+
+def test_concurrent_refresh_is_single_flight(tmp_path, monkeypatch):
+    token_path = tmp_path / "task_token.json"
+    _write_expired_token(token_path)
+    google_credential_store.clear_cache()
+
+    refresh_calls = []
+
+    def fake_refresh(self, request):
+        refresh_calls.append(threading.get_ident())
+        self.token = "fresh-token"
+        self.expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(hours=1)
+
+    monkeypatch.setattr(Credentials, "refresh", fake_refresh)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            google_credential_store.get_credentials(str(token_path), None, SCOPES)
+        ))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(f"갱신 호출 횟수: {len(refresh_calls)}")
+    assert len(refresh_calls) == 1
+    # 프로세스 내에서는 하나의 Credentials 객체를 공유
+    assert len({id(c) for c in results}) == 1
+    assert json.loads(token_path.read_text())["token"] == "fresh-token"
+    # 임시 파일이 남지 않아야 함
+    assert not list(tmp_path.glob(".token-*.tmp"))
+
+
+def test_reuses_token_refreshed_by_other_worker(tmp_path, monkeypatch):
+    token_path = tmp_path / "mail_token.json"
+    _write_expired_token(token_path)
+    google_credential_store.clear_cache()
+
+    stale = google_credential_store._load_from_disk(str(token_path), SCOPES)
+    google_credential_store._credentials_cache[(str(token_path), tuple(SCOPES))] = stale
+
+    # 다른 프로세스가 이미 갱신해서 저장한 상황
+    data = json.loads(token_path.read_text())
+    data["token"] = "other-worker-token"
+    data["expiry"] = (datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    token_path.write_text(json.dumps(data))
+
+    def fail_refresh(self, request):
+        raise AssertionError("이미 갱신된 토큰이 있으면 refresh 를 호출하지 않아야 합니다.")
+
+    monkeypatch.setattr(Credentials, "refresh", fail_refresh)
+
+    creds = google_credential_store.get_credentials(str(token_path), None, SCOPES)
+    assert creds is stale
+    assert creds.token == "other-worker-token"
+    assert creds.valid
+
+
+def test_expiry_during_service_use_refreshes_once_and_persists(tmp_path, monkeypatch):
+    from googleapiclient.discovery import build_from_document
+    from googleapiclient.discovery_cache import get_static_doc
+    from bench.fake_servers import FakeGoogleTasks
+    from bench.scenarios import BenchEnv
+
+    token_path = tmp_path / "task_token.json"
+    _write_expired_token(token_path)
+    data = json.loads(token_path.read_text())
+    data["token"] = "valid-token"
+    data["expiry"] = (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    token_path.write_text(json.dumps(data))
+    google_credential_store.clear_cache()
+
+    refresh_calls = []
+
+    def fake_refresh(self, request):
+        refresh_calls.append(threading.get_ident())
+        self.token = "fresh-token"
+        self.expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(hours=1)
+
+    monkeypatch.setattr(Credentials, "refresh", fake_refresh)
+
+    fake = FakeGoogleTasks(task_count=3)
+    with BenchEnv({"gtasks": fake}):
+        creds = google_credential_store.get_credentials(str(token_path), None, SCOPES)
+        document = json.loads(get_static_doc("tasks", "v1"))
+        document["rootUrl"] = fake.url + "/"
+
+        # 도구처럼 스레드마다 service 를 만들되 Credentials 는 공유
+        services = [build_from_document(document, credentials=creds) for _ in range(6)]
+        services[0].tasks().list(tasklist="@default").execute()
+        assert refresh_calls == []
+
+        # 서비스가 쥐고 있는 토큰이 사용 중에 만료 → transport 의 before_request 가 refresh()
+        creds.expiry = datetime.datetime(2000, 1, 1)
+        errors = []
+
+        def use(service):
+            try:
+                service.tasks().list(tasklist="@default").execute()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=use, args=(s,)) for s in services]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert not errors
+    assert len(refresh_calls) == 1
+    assert json.loads(token_path.read_text())["token"] == "fresh-token"
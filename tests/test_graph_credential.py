@@ -0,0 +1,130 @@
+"""
+Teams 최근 메시지 수집 테스트 - 로컬 스텁 Graph 서버(aiohttp)를 상대로 채팅 목록 / 메시지 페이징과 동시 조회 제한 확인
+"""
+
+import sys
+import asyncio
+import datetime
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from aiohttp import web
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from msgraph import GraphServiceClient
+from msgraph.graph_request_adapter import GraphRequestAdapter
+
+from graphapi.credential import MESSAGES_PAGE_SIZE, fetch_recent_teams_messages
+
+USER_ID = "user-1"
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+
+def _iso(hours_ago: float) -> str:
+    return (NOW - datetime.timedelta(hours=hours_ago)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _message(msg_id, content, created_hours_ago, modified_hours_ago=None):
+    return {
+        "id": msg_id,
+        "createdDateTime": _iso(created_hours_ago),
+        "lastModifiedDateTime": _iso(modified_hours_ago if modified_hours_ago is not None else created_hours_ago),
+        "from": {"user": {"displayName": "김철수"}},
+        "body": {"contentType": "text", "content": content},
+    }
+
+
+class StubGraph:
+    """chats 목록(lastMessagePreview 포함)과 chats/{id}/messages 만 흉내내는 스텁 서버"""
+
+    def __init__(self):
+        self.base_url = None
+        self.chat_requests = []
+        self.message_requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def chats(self, request):
+        self.chat_requests.append(dict(request.query))
+        if request.query.get("$skiptoken") == "p2":
+            return web.json_response({"value": [
+                {"id": "chat-c"},  # 미리보기 없음 → 조회 대상
+                {"id": "chat-d", "lastMessagePreview": {"createdDateTime": _iso(3)}},
+            ]})
+        return web.json_response({
+            "value": [
+                {"id": "chat-a", "lastMessagePreview": {"createdDateTime": _iso(1)}},
+                # 마지막 메시지가 조회 기간(24시간) 이전인 채팅방은 메시지를 조회하지 않음
+                {"id": "chat-b", "lastMessagePreview": {"createdDateTime": _iso(48)}},
+            ],
+            "@odata.nextLink": f"{self.base_url}/users/{USER_ID}/chats?$skiptoken=p2",
+        })
+
+    async def messages(self, request):
+        chat_id = request.match_info["chat_id"]
+        self.message_requests.append((chat_id, dict(request.query)))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            self.in_flight -= 1
+
+        if chat_id == "chat-a" and request.query.get("$skiptoken") != "m2":
+            return web.json_response({
+                "value": [_message("a-3", "세 번째", 1), _message("a-2", "두 번째", 2)],
+                "@odata.nextLink": f"{self.base_url}/users/{USER_ID}/chats/chat-a/messages?$skiptoken=m2",
+            })
+        if chat_id == "chat-a":
+            # 최근 수정됐지만 생성은 조회 기간 이전인 메시지는 제외
+            return web.json_response({"value": [_message("a-1", "오래된 메시지", 30, modified_hours_ago=1)]})
+        hours_ago = {"chat-c": 5, "chat-d": 4}[chat_id]
+        return web.json_response({"value": [_message(f"{chat_id}-1", f"{chat_id} 메시지", hours_ago)]})
+
+
+async def _run():
+    stub = StubGraph()
+    app = web.Application()
+    app.router.add_get("/v1.0/users/{user_id}/chats", stub.chats)
+    app.router.add_get("/v1.0/users/{user_id}/chats/{chat_id}/messages", stub.messages)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    stub.base_url = f"http://127.0.0.1:{port}/v1.0"
+
+    try:
+        adapter = GraphRequestAdapter(AnonymousAuthenticationProvider())
+        adapter.base_url = stub.base_url
+        graph_client = GraphServiceClient(request_adapter=adapter)
+        messages = await fetch_recent_teams_messages(graph_client, max_concurrency=2, user_id=USER_ID)
+        return stub, messages
+    finally:
+        await runner.cleanup()
+
+
+def test_recent_messages_follow_paging_and_limit_concurrency():
+    stub, messages = asyncio.run(_run())
+    print([(m["from"], m["content"]) for m in messages], stub.max_in_flight)
+
+    # 채팅 목록은 nextLink 로 끝까지, lastMessagePreview 를 함께 요청
+    assert len(stub.chat_requests) == 2
+    assert stub.chat_requests[0]["$expand"] == "lastMessagePreview"
+
+    # chat-b 는 건너뛰고, chat-a 는 두 페이지 조회
+    requested = [chat_id for chat_id, _ in stub.message_requests]
+    assert sorted(requested) == ["chat-a", "chat-a", "chat-c", "chat-d"]
+    first_page = next(query for chat_id, query in stub.message_requests if chat_id == "chat-c")
+    assert first_page["$filter"].startswith("lastModifiedDateTime gt ")
+    assert first_page["$orderby"] == "lastModifiedDateTime desc"
+    assert first_page["$top"] == str(MESSAGES_PAGE_SIZE)
+
+    # 채팅방별 조회는 동시에 실행되지만 max_concurrency 를 넘지 않음
+    assert stub.max_in_flight == 2
+
+    # 생성 시각 기준으로 최신순 정렬, 조회 기간 이전에 생성된 메시지 제외
+    assert [m["content"] for m in messages] == ["세 번째", "두 번째", "chat-d 메시지", "chat-c 메시지"]
+    assert all(m["from"] == "김철수" for m in messages)
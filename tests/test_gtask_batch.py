@@ -0,0 +1,190 @@
+"""
+Google Tasks 일괄 추가 / 페이지 조회 / 중복 방지(upsert) 테스트 (로컬 가짜 서비스 사용)
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from tools.gtask_tools import GoogleTasksAutomationTools
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class _Batch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            self.callback(request_id, request.execute(), None)
+        # 배치는 묶인 요청 수와 관계없이 HTTP 왕복 1회
+        self.service.http_calls -= len(self.requests) - 1
+
+
+class FakeTasksService:
+    """tasks().list / tasks().insert / new_batch_http_request 만 흉내내는 가짜 서비스"""
+
+    def __init__(self, titles=()):
+        self.items = [
+            {"id": f"t{i}", "title": title, "status": "needsAction", "updated": "2026-01-01T00:00:00.000Z"}
+            for i, title in enumerate(titles)
+        ]
+        self.http_calls = 0
+        self.list_kwargs = []
+
+    def tasks(self):
+        return self
+
+    def list(self, **kwargs):
+        def run():
+            self.http_calls += 1
+            self.list_kwargs.append(kwargs)
+            items = self.items
+            if "updatedMin" in kwargs:
+                items = [t for t in items if t["updated"] >= kwargs["updatedMin"]]
+            elif not kwargs.get("showCompleted"):
+                items = [t for t in items if t["status"] != "completed"]
+            start = int(kwargs.get("pageToken") or 0)
+            end = start + kwargs["maxResults"]
+            page = {"items": items[start:end]}
+            if end < len(items):
+                page["nextPageToken"] = str(end)
+            return page
+        return _Request(run)
+
+    def insert(self, tasklist, body):
+        def run():
+            self.http_calls += 1
+            task = dict(body, id=f"t{len(self.items)}", status="needsAction", updated=_now())
+            self.items.append(task)
+            return task
+        return _Request(run)
+
+    def patch(self, tasklist, task, body):
+        def run():
+            self.http_calls += 1
+            target = next(t for t in self.items if t["id"] == task)
+            target.update(body, updated=_now())
+            return dict(target)
+        return _Request(run)
+
+    def new_batch_http_request(self, callback=None):
+        return _Batch(self, callback)
+
+
+def _make_tools(service):
+    return GoogleTasksAutomationTools(service=service)
+
+
+def test_list_tasks_follows_next_page_token():
+    service = FakeTasksService([f"할 일 {i}" for i in range(250)])
+    tools = _make_tools(service)
+
+    result = tools.list_tasks(max_results=230)
+    print(result.splitlines()[-1])
+
+    assert result.count("\n- ") == 230
+    assert [kw["maxResults"] for kw in service.list_kwargs] == [100, 100, 30]
+    assert all("nextPageToken" in kw["fields"] for kw in service.list_kwargs)
+
+
+def test_bulk_add_skips_duplicates_in_two_round_trips():
+    service = FakeTasksService(["[메일] 보고서 수정 요청"])
+    tools = _make_tools(service)
+
+    result = tools.add_google_tasks_bulk([
+        {"title": "[메일]  보고서 수정 요청"},  # 기존 할 일과 중복 (공백 차이)
+        {"title": "[메일] 회의 자료 준비", "due_date": "2026-10-20"},
+        {"title": "[메일] 회의 자료 준비"},     # 같은 요청 안에서 중복
+        {"title": "[메일] 계약서 검토", "notes": "법무팀 회신 필요"},
+    ])
+    print(result)
+
+    assert "할 일 2개를 추가했습니다." in result
+    assert "중복으로 건너뛴 할 일 2개" in result
+    # 목록 조회 1회 + 배치 요청 1회
+    assert service.http_calls == 2
+    assert service.items[-2]["due"] == "2026-10-20T00:00:00Z"
+
+
+def test_upsert_task_skips_merges_and_syncs_incrementally():
+    service = FakeTasksService(["[메일] 보고서 수정 요청"])
+    service.items[0]["notes"] = "김팀장 요청"
+    tools = _make_tools(service)
+
+    # 최초 호출: 전체 조회 후 건너뜀
+    skipped = tools.upsert_task("[메일] 보고서 수정 요청", notes="김팀장 요청")
+    print(skipped)
+    assert "건너뛰었습니다" in skipped
+    assert "updatedMin" not in service.list_kwargs[-1]
+
+    # 메모가 다르면 기존 할 일에 병합
+    merged = tools.upsert_task("[메일] 보고서  수정 요청", notes="금요일까지 제출")
+    print(merged)
+    assert "병합" in merged
+    assert service.items[0]["notes"] == "김팀장 요청\n---\n금요일까지 제출"
+    assert "updatedMin" in service.list_kwargs[-1]
+
+    # 다른 곳에서 완료 처리된 할 일은 증분 동기화로 인덱스에서 빠지고 새로 등록됨
+    service.items[0].update(status="completed", updated=_now())
+    created = tools.upsert_task("[메일] 보고서 수정 요청", notes="새 요청")
+    print(created)
+    assert "추가되었습니다" in created
+    assert len(service.items) == 2
+
+
+def test_renamed_task_drops_old_title_from_index():
+    service = FakeTasksService(["[메일] 초안 작성", "[메일] 회의록 정리"])
+    tools = _make_tools(service)
+    assert "건너뛰었습니다" in tools.upsert_task("[메일] 초안 작성")
+
+    # 다른 곳에서 제목이 바뀐 할 일: 증분 동기화 후 이전 제목은 새로 등록되고, 새 제목은 중복으로 판정
+    service.items[0].update(title="[메일] 최종본 작성", updated=_now())
+    created = tools.upsert_task("[메일] 초안 작성")
+    print(created)
+    assert "추가되었습니다" in created
+    assert "건너뛰었습니다" in tools.upsert_task("[메일] 최종본 작성")
+
+    # 같은 제목의 다른 할 일이 키를 차지한 뒤에는, 이전 할 일이 완료되어도 그 항목을 지우지 않음
+    service.items[1].update(title="[메일] 초안 작성", updated=_now())
+    assert "건너뛰었습니다" in tools.upsert_task("[메일] 초안 작성")
+    service.items[2].update(status="completed", updated=_now())
+    assert "건너뛰었습니다" in tools.upsert_task("[메일] 초안 작성")
+    assert len(service.items) == 3
+
+
+def test_completing_one_of_duplicate_titles_keeps_the_other_indexed():
+    service = FakeTasksService(["[메일] 예산 검토", "[메일] 예산  검토"])
+    tools = _make_tools(service)
+    assert "건너뛰었습니다" in tools.upsert_task("[메일] 예산 검토")
+
+    # 같은 제목의 미완료 할 일이 남아 있으면 하나가 완료되어도 중복으로 판정
+    service.items[1].update(status="completed", updated=_now())
+    skipped = tools.upsert_task("[메일] 예산 검토")
+    print(skipped)
+    assert "건너뛰었습니다" in skipped and "(ID: t0)" in skipped
+
+    # 모두 완료되면 새로 등록
+    service.items[0].update(status="completed", updated=_now())
+    assert "추가되었습니다" in tools.upsert_task("[메일] 예산 검토")
+    assert len(service.items) == 3
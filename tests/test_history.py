@@ -0,0 +1,121 @@
+"""
+대화 기록 창 테스트 - 도구 결과 자르기 / 예산 초과 시 접기 / 스레드별 rolling 요약 / 긴 세션에서 입력 크기 유지
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from agent_framework import (
+    Agent, AgentSession, BaseChatClient, ChatMiddlewareLayer, ChatResponse, Content,
+    FunctionInvocationLayer, Message,
+)
+
+from agents.history import SUMMARY_HEADER, HistoryWindow, estimate_tokens
+
+INBOX = "\n".join(f"📧 메일 {i}: 주간 보고서 검토 요청 - 발신자 팀장{i} - 본문 요약 ..." for i in range(60))
+
+
+def _turn(i: int) -> list[Message]:
+    call_id = f"call-{i}"
+    return [
+        Message("user", text=f"{i}번째 요청: 오늘 메일 보여줘"),
+        Message("assistant", [Content.from_function_call(call_id=call_id, name="get_emails_received_today", arguments="{}")]),
+        Message("tool", [Content.from_function_result(call_id=call_id, result=INBOX)]),
+        Message("assistant", text=f"{i}번째 답변: 오늘 메일은 60통입니다."),
+    ]
+
+
+def _conversation(turns: int) -> list[Message]:
+    messages = [Message("system", text="지시")]
+    for i in range(turns - 1):
+        messages.extend(_turn(i))
+    messages.append(Message("user", text="방금 목록에서 팀장3 메일 다시 알려줘"))
+    return messages
+
+
+def _tokens(messages):
+    return sum(estimate_tokens(m.text + "".join(str(c.result) for c in m.contents if c.type == "function_result"))
+               for m in messages)
+
+
+def test_old_tool_results_are_truncated_but_latest_turn_is_kept():
+    window = HistoryWindow(budget_tokens=100_000)
+    messages = _conversation(3)
+    messages[-1:] = _turn(99)
+
+    result = asyncio.run(window.apply(messages))
+
+    old_results = [c.result for m in result[:-4] for c in m.contents if c.type == "function_result"]
+    assert old_results and all("생략" in r and len(r) < len(INBOX) for r in old_results)
+    assert result[-2].contents[0].result == INBOX
+
+
+def test_long_session_is_folded_into_summary_and_stays_within_budget():
+    calls = []
+
+    async def summarizer(previous, messages):
+        calls.append(len(messages))
+        return (previous + "\n" if previous else "") + f"{len(messages)}개 메시지 요약"
+
+    window = HistoryWindow(budget_tokens=3000, summarizer=summarizer)
+    sizes = []
+    for turns in range(2, 40):
+        result = asyncio.run(window.apply(_conversation(turns), thread_key="thread-1"))
+        sizes.append(_tokens(result))
+
+        # 시스템 지시는 맨 앞, 이번 요청은 맨 뒤, function_call 과 결과는 같이 남음
+        assert result[0].text == "지시"
+        assert result[-1].text == "방금 목록에서 팀장3 메일 다시 알려줘"
+        call_ids = {c.call_id for m in result for c in m.contents if c.type == "function_call"}
+        result_ids = {c.call_id for m in result for c in m.contents if c.type == "function_result"}
+        assert call_ids == result_ids
+
+    print(sizes, calls)
+    assert result[1].text.startswith(SUMMARY_HEADER)
+    # 입력 크기는 예산 안에서 유지되고, 요약은 접을 때만 (턴마다가 아니라) 호출됨
+    assert max(sizes) <= 3000
+    assert len(calls) < len(sizes) / 3
+
+
+def test_changed_history_resets_rolling_state():
+    window = HistoryWindow(budget_tokens=2000)
+    asyncio.run(window.apply(_conversation(20), thread_key="t"))
+
+    # 같은 스레드 키라도 앞부분이 다르면 이전 요약을 쓰지 않음
+    other = _conversation(20)
+    other[1] = Message("user", text="전혀 다른 첫 요청")
+    result = asyncio.run(window.apply(other, thread_key="t"))
+    assert "전혀 다른 첫 요청" in result[1].text
+
+
+class RecordingChatClient(ChatMiddlewareLayer, FunctionInvocationLayer, BaseChatClient):
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    def _inner_get_response(self, *, messages, stream, options, **kwargs):
+        self.sent.append(list(messages))
+
+        async def _response():
+            return ChatResponse(messages=[Message("assistant", text="확인했습니다.")])
+        return _response()
+
+
+def test_middleware_uses_ag_ui_thread_id():
+    client = RecordingChatClient()
+    window = HistoryWindow(budget_tokens=2000)
+    agent = Agent(client=client, name="A", middleware=[window.middleware()])
+
+    session = AgentSession()
+    session.metadata = {"ag_ui_thread_id": "thread-9"}
+    asyncio.run(agent.run(_conversation(20), session=session))
+
+    sent = client.sent[0]
+    assert any(m.text.startswith(SUMMARY_HEADER) for m in sent)
+    assert _tokens(sent) <= 2000
+    assert "thread-9" in window._states
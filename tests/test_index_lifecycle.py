@@ -0,0 +1,64 @@
+"""
+인덱스 버전 관리 테스트 - alias 초기화 / 기존 단일 인덱스 이전 / 재임베딩 reindex 후 alias 전환과 이전 인덱스 삭제
+(대역 Azure AI Search / Azure OpenAI 서버 사용)
+"""
+
+import sys
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from bench.fake_servers import FakeAzureOpenAI, FakeAzureSearch
+from bench.scenarios import BenchEnv
+from tools.ai_search_tools import INDEX_ALIAS, LEGACY_INDEX_NAME, AISearchTools
+
+
+def test_new_deployment_starts_on_v1_alias():
+    search = FakeAzureSearch()
+    with BenchEnv({"azure_search": search, "azure_openai": FakeAzureOpenAI()}):
+        tools = AISearchTools()
+        assert tools.save_ticket_mapping("https://x.atlassian.net/browse/KAN-1", "로그인 기능", "d", "g").startswith("✅")
+
+    assert search.aliases[INDEX_ALIAS]["indexes"] == ["sdd-tickets-v1"]
+    assert len(search.documents["sdd-tickets-v1"]) == 1
+
+
+def test_reindex_migrates_legacy_index_and_switches_alias():
+    search = FakeAzureSearch()
+    openai = FakeAzureOpenAI()
+    search.seed_mappings(LEGACY_INDEX_NAME, 25)
+    long_spec = "\n\n".join(f"결제 요구사항 {i} " * 40 for i in range(6))
+
+    with BenchEnv({"azure_search": search, "azure_openai": openai}):
+        tools = AISearchTools()
+        # alias 가 없으면 기존 단일 인덱스를 가리키며 시작 (중복 검사가 바로 동작)
+        assert tools.current_index_name() is None
+        assert tools.get_ticket_history(top=3).startswith("티켓 매핑 히스토리: 1-3/25건")
+        assert tools.current_index_name() == LEGACY_INDEX_NAME
+        tools.save_ticket_mapping("https://x.atlassian.net/browse/KAN-9", long_spec, "d", "g")
+
+        embedded_before = openai.embedded_inputs
+        result = tools.start_reindex(workers=3).result(timeout=60)
+        print(result, openai.embedded_inputs - embedded_before)
+
+        assert result["old_index"] == LEGACY_INDEX_NAME and result["new_index"] == "sdd-tickets-v1"
+        assert result["copied"] == 26
+        assert LEGACY_INDEX_NAME not in search.indexes and LEGACY_INDEX_NAME not in search.documents
+        # 매핑 문서는 다시 임베딩되고, 긴 사양의 청크 자식 문서도 새 인덱스에 다시 만들어짐
+        new_docs = search.documents["sdd-tickets-v1"]
+        children = [d for d in new_docs.values() if d.get("parent_id")]
+        assert len(new_docs) == 26 + len(children) and len(children) > 1
+        assert openai.embedded_inputs - embedded_before == 25 + len(children)
+
+        # 같은 인스턴스(alias 클라이언트)로 계속 조회 / 검색
+        assert tools.get_ticket_history(top=3).startswith("티켓 매핑 히스토리: 1-3/26건")
+        assert tools.find_similar_tickets("과거 사양 3")[0]["spec_ticket_link"].endswith("SEED-3")
+
+        # 다음 reindex 는 v2 로, 복사만 (재임베딩 없이)
+        embedded_before = openai.embedded_inputs
+        second = tools.reindex(re_embed=False, drop_old=False)
+        assert second["new_index"] == "sdd-tickets-v2" and second["copied"] == len(new_docs)
+        assert openai.embedded_inputs == embedded_before
+        assert search.aliases[INDEX_ALIAS]["indexes"] == ["sdd-tickets-v2"] and "sdd-tickets-v1" in search.indexes
@@ -0,0 +1,159 @@
+"""
+의도 라우터 테스트 - 규칙 / 임베딩 중심 매칭 / 마스터 폴백과 하위 에이전트 직접 실행 확인
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from agent_framework import AgentSession, Message, SupportsAgentRun
+
+from agents.intent_router import IntentRoutedAgent, IntentRouter, MAIL_AGENT, SDD_AGENT, TASKS_AGENT, issue_key_pattern
+
+VOCABULARY = ["편지", "답장", "보내", "마감", "추가", "정리", "버그", "배포", "코드"]
+
+
+def fake_embed(texts):
+    """단어 포함 여부로 만든 가짜 임베딩 (호출 횟수 기록)"""
+    fake_embed.calls += 1
+    return [[1.0 if word in text else 0.0 for word in VOCABULARY] + [0.1] for text in texts]
+
+
+fake_embed.calls = 0
+
+EXAMPLES = {
+    MAIL_AGENT: ["편지 답장", "편지 보내"],
+    TASKS_AGENT: ["마감 추가", "마감 정리"],
+    SDD_AGENT: ["버그 배포", "코드 버그"],
+}
+
+
+def test_rules_route_obvious_requests():
+    router = IntentRouter(project_key="KAN")
+
+    assert router.route("https://x.atlassian.net/browse/KAN-4 처리해줘").agent == SDD_AGENT
+    assert router.route("KAN-12를 개발 티켓으로 만들어줘").agent == SDD_AGENT
+    assert router.route("안 읽은 메일 알려줘").agent == MAIL_AGENT
+    assert router.route("오늘 할 일 보여줘").agent == TASKS_AGENT
+    assert router.route("Show my unread MAIL").agent == MAIL_AGENT
+    assert router.route("todo에 추가해줘").agent == TASKS_AGENT
+
+
+def test_rules_ignore_lookalike_keys_and_partial_words(monkeypatch):
+    router = IntentRouter(project_key="KAN")
+
+    # 다른 프로젝트 키 / 버전·표준 표기는 이슈 키가 아님
+    for text in ["GPT-4 로 요약하는 방법", "UTF-8 로 저장해줘", "COVID-19 관련 뉴스", "ABC-12 는 뭐야?", "XKAN-3 확인"]:
+        assert router.match_rules(text) == set(), text
+    # 영문 키워드는 단어 단위로만
+    for text in ["multitasking 잘하는 법", "taskbar 가 안 보여"]:
+        assert router.match_rules(text) == set(), text
+
+    # 프로젝트 키가 설정되지 않았으면 이슈 키 규칙 없음 (임베딩 / 마스터가 처리)
+    monkeypatch.delenv("JIRA_PROJECT_KEY", raising=False)
+    assert issue_key_pattern(None) is None
+    assert IntentRouter().match_rules("KAN-4 처리해줘") == set()
+
+
+def test_multi_intent_and_unknown_fall_back_to_master():
+    router = IntentRouter()
+
+    multi = router.route("메일 읽고 할 일로 추가해줘")
+    assert multi.agent is None and multi.method == "fallback"
+    # 임베딩 설정이 없으면 규칙에 안 걸린 요청은 마스터가 처리
+    assert router.route("오늘 날씨 어때?").agent is None
+
+
+def test_embedding_centroids_route_when_confident():
+    fake_embed.calls = 0
+    router = IntentRouter(embed=fake_embed, examples=EXAMPLES, min_score=0.5, min_margin=0.1)
+
+    decision = router.route("어제 배포에서 생긴 버그 봐줘")
+    assert (decision.agent, decision.method) == (SDD_AGENT, "embedding")
+    assert router.route("마감 정리 부탁해").agent == TASKS_AGENT
+    # 예시 임베딩은 최초 1회 배치 호출, 이후에는 요청 문장만 임베딩
+    assert fake_embed.calls == 3
+
+    low = router.route("점심 뭐 먹지")
+    assert low.agent is None and low.method == "fallback"
+
+
+def test_embedding_failure_falls_back():
+    def broken_embed(texts):
+        raise TimeoutError("embedding timeout")
+
+    decision = IntentRouter(embed=broken_embed).route("점심 뭐 먹지")
+    assert decision.agent is None and decision.reason == "임베딩 분류 실패"
+
+
+class FakeAgent:
+    description = None
+
+    def __init__(self, name):
+        self.id = self.name = name
+        self.calls = []
+        self.sessions = []
+
+    def create_session(self, **kwargs):
+        return AgentSession()
+
+    def get_session(self, *, service_session_id, **kwargs):
+        return None
+
+    def run(self, messages=None, *, stream=False, **kwargs):
+        self.calls.append(messages)
+        self.sessions.append(kwargs.get("session"))
+        if not stream:
+            async def _response():
+                return f"{self.name} 응답"
+            return _response()
+
+        async def _stream():
+            yield f"{self.name} 토큰"
+        return _stream()
+
+
+def test_routed_agent_dispatches_directly_or_to_master():
+    master, mail, sdd = FakeAgent("Master-Agent"), FakeAgent("Email-Agent"), FakeAgent("SDD-Agent")
+    agent = IntentRoutedAgent(master, routes={MAIL_AGENT: mail, SDD_AGENT: sdd}, router=IntentRouter(project_key="KAN"))
+    assert isinstance(agent, SupportsAgentRun)
+
+    assert asyncio.run(agent.run("안 읽은 메일 알려줘")) == "Email-Agent 응답"
+    assert asyncio.run(agent.run("오늘 날씨 어때?")) == "Master-Agent 응답"
+
+    async def collect(messages):
+        return [update async for update in agent.run(messages, stream=True)]
+
+    # AG-UI 처럼 대화 목록이 들어오면 마지막 사용자 메시지로 판단
+    history = [Message("user", text="안녕"), Message("assistant", text="안녕하세요"),
+               Message("user", text="KAN-4 사양 티켓 처리해줘")]
+    assert asyncio.run(collect(history)) == ["SDD-Agent 토큰"]
+    assert sdd.calls == [history]
+    assert len(master.calls) == 1
+
+
+def test_routed_agent_keeps_sub_agent_session_per_master_session():
+    master, mail = FakeAgent("Master-Agent"), FakeAgent("Email-Agent")
+    agent = IntentRoutedAgent(master, routes={MAIL_AGENT: mail}, router=IntentRouter(project_key="KAN"))
+    session, other = agent.create_session(), agent.create_session()
+
+    asyncio.run(agent.run("안 읽은 메일 알려줘", session=session))
+    asyncio.run(agent.run("첫 번째 메일 본문 보여줘", session=session))
+    asyncio.run(agent.run("메일 몇 통 왔어?", session=other))
+    asyncio.run(agent.run("오늘 날씨 어때?", session=session))
+    print([s.session_id for s in mail.sessions])
+
+    # 마스터 세션은 하위 에이전트로 넘어가지 않고, 대화마다 하위 에이전트 세션이 하나씩 유지됨
+    assert all(s is not session and s is not other for s in mail.sessions)
+    assert mail.sessions[0] is mail.sessions[1]
+    assert mail.sessions[2] is not mail.sessions[0]
+    assert master.sessions == [session]
+
+    # 마스터 세션을 직렬화했다가 복원해도 같은 하위 에이전트 세션으로 이어짐
+    restored = AgentSession.from_dict(session.to_dict())
+    asyncio.run(agent.run("메일 답장 보내줘", session=restored))
+    assert mail.sessions[3].session_id == mail.sessions[0].session_id
@@ -0,0 +1,87 @@
+"""
+간결한 도구 출력 테스트 - 필드 자르기 / 토큰 예산 안에서 목록 자르기와 cursor / 오늘 메일 페이지 조회
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from tools.gmail_tools import TODAY_EMAILS_PAGE_SIZE, GmailAutomationTools
+from tools.output_format import MORE_PREFIX, clip, estimate_tokens, render_records
+
+
+def test_clip_collapses_whitespace_and_escapes_separator():
+    assert clip("  주간\n 보고서 | 검토  ") == "주간 보고서 / 검토"
+    assert clip("가" * 50, 10) == "가" * 9 + "…"
+    assert clip(None) == "-"
+
+
+def test_render_stays_within_budget_and_returns_cursor():
+    records = [{"subject": f"업무 요청 #{i}", "snippet": "회의 자료 검토 부탁드립니다. " * 10} for i in range(100)]
+    text = render_records("메일", records, [("subject", 40), ("snippet", 80)], budget_tokens=500)
+    print(text)
+
+    lines = text.splitlines()
+    assert estimate_tokens(text) <= 500
+    assert lines[0].startswith("메일: 1-") and lines[1] == "#|subject|snippet"
+    next_cursor = int(lines[-1].removeprefix(MORE_PREFIX))
+    assert 0 < next_cursor < 100 and len(lines) == next_cursor + 3
+
+    # 다음 페이지는 번호가 이어지고, 마지막 페이지에는 cursor 가 없음
+    rest = render_records("메일", records[next_cursor:], [("subject", 40)], budget_tokens=10_000, offset=next_cursor)
+    assert rest.splitlines()[2].startswith(f"{next_cursor + 1}|")
+    assert MORE_PREFIX not in rest
+
+
+class _Request:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+class FakeGmailService:
+    """users().messages() 의 list / get 만 흉내내는 대역 (get 호출 수 기록)"""
+
+    def __init__(self, count):
+        now = int(datetime.now().timestamp() * 1000)
+        self.store = {f"m{i}": {"id": f"m{i}", "internalDate": str(now), "snippet": "본문 " * 200,
+                              "payload": {"headers": [{"name": "Subject", "value": f"제목 {i}"},
+                                                      {"name": "From", "value": f"s{i}@example.com"}]}}
+                      for i in range(count)}
+        self.gets = []
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, userId, q, maxResults, pageToken=None):
+        return _Request({"messages": [{"id": i} for i in self.store]})
+
+    def get(self, userId, id, format, metadataHeaders):
+        self.gets.append(id)
+        return _Request(self.store[id])
+
+
+def test_emails_received_today_fetches_one_bounded_page():
+    service = FakeGmailService(300)
+    tools = GmailAutomationTools(service=service)
+
+    first = tools.get_emails_received_today()
+    print(first)
+    assert len(service.gets) == TODAY_EMAILS_PAGE_SIZE
+    assert "/300건" in first and first.splitlines()[-1].startswith(MORE_PREFIX)
+    assert estimate_tokens(first) < 1000
+
+    cursor = int(first.splitlines()[-1].removeprefix(MORE_PREFIX))
+    second = tools.get_emails_received_today(cursor=cursor)
+    assert second.splitlines()[0].split(": ")[1].startswith(f"{cursor + 1}-")
+
+    assert "오늘 수신된 메일이 없습니다" in GmailAutomationTools(service=FakeGmailService(0)).get_emails_received_today()
@@ -0,0 +1,83 @@
+"""
+프롬프트 캐시 측정 테스트 - usage 의 cached_tokens 를 에이전트별로 집계하는지 (일반 / 스트리밍), prefix 지문 확인
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from agent_framework import (
+    Agent, BaseChatClient, ChatMiddlewareLayer, ChatResponse, ChatResponseUpdate,
+    Content, FunctionInvocationLayer, Message, ResponseStream,
+)
+
+from agents import prompts
+from agents.prompt_cache import PromptCacheMeter, prefix_fingerprint
+
+USAGE = {"input_token_count": 1500, "output_token_count": 20, "prompt/cached_tokens": 1280}
+
+
+class FakeChatClient(ChatMiddlewareLayer, FunctionInvocationLayer, BaseChatClient):
+    """고정된 usage 를 돌려주는 가짜 chat client"""
+
+    def _inner_get_response(self, *, messages, stream, options, **kwargs):
+        if stream:
+            async def _stream():
+                yield ChatResponseUpdate(role="assistant", contents=[Content.from_text("완료")])
+                yield ChatResponseUpdate(role="assistant", contents=[Content.from_usage(usage_details=USAGE)])
+            return ResponseStream(_stream(), finalizer=ChatResponse.from_updates)
+
+        async def _response():
+            return ChatResponse(messages=[Message("assistant", text="완료")], usage_details=USAGE)
+        return _response()
+
+
+def list_tasks(limit: int = 10) -> str:
+    """할 일 목록 조회"""
+    return "없음"
+
+
+def _agent(meter, name="Google-Tasks-Agent", instructions=prompts.TASKS_INSTRUCTIONS):
+    return Agent(client=FakeChatClient(), name=name, instructions=instructions, tools=[list_tasks],
+                 middleware=[meter.middleware(name)])
+
+
+def test_meter_records_cached_and_uncached_tokens_per_agent():
+    meter = PromptCacheMeter()
+    agent = _agent(meter)
+
+    async def run():
+        await agent.run("할 일 보여줘")
+        async for _ in agent.run("할 일 보여줘", stream=True):
+            pass
+
+    asyncio.run(run())
+    report = meter.report()
+    print(meter.format_report())
+
+    assert report["Google-Tasks-Agent"] == {
+        "calls": 2, "input_tokens": 3000, "cached_tokens": 2560, "uncached_tokens": 440, "hit_ratio": 0.8533,
+    }
+
+
+def test_prefix_fingerprint_is_stable_and_detects_changes():
+    meter = PromptCacheMeter()
+    first, second = prefix_fingerprint(_agent(meter)), prefix_fingerprint(_agent(meter))
+    changed = prefix_fingerprint(_agent(meter, instructions=prompts.TASKS_INSTRUCTIONS + " "))
+
+    assert first == second
+    assert first["tools"] == 1
+    assert changed["sha256"] != first["sha256"]
+
+
+def test_instructions_have_no_indentation_padding():
+    # 들여쓰기 공백은 매 호출 입력 토큰만 늘림
+    for name in ["MASTER_INSTRUCTIONS", "MAIL_INSTRUCTIONS", "TASKS_INSTRUCTIONS",
+                 "SDD_INSTRUCTIONS", "WORKSPACE_INSTRUCTIONS"]:
+        text = getattr(prompts, name)
+        assert text == text.strip()
+        assert not any(line.startswith("    ") for line in text.splitlines()), name
@@ -0,0 +1,89 @@
+"""
+유사 티켓 재순위화 테스트 - 정확한 cosine / 프로젝트별 임계치 / MMR 다양화 / 임계치 보정
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from tools.ai_search_tools import AISearchTools
+from tools.rerank import calibrate_threshold, cosine_similarities, load_thresholds, project_key, rerank
+
+QUERY = [1.0, 0.0, 0.0]
+
+
+def candidate(key: str, vector, search_score=0.5):
+    return {
+        "spec_ticket_link": f"https://example.atlassian.net/browse/{key}",
+        "dev_ticket_link": f"https://example.atlassian.net/browse/DEV-{key}",
+        "spec_ticket_vector": vector,
+        "@search.score": search_score,
+    }
+
+
+def test_cosine_is_recomputed_exactly_and_ignores_search_score():
+    vectors = [[3.0, 4.0, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]
+    assert np.allclose(cosine_similarities(QUERY, vectors), [0.6, 0.0, 1.0])
+
+    # 근사 검색 점수가 뒤바뀌어 와도 정확한 cosine 순서로 정렬
+    results = rerank(QUERY, [candidate("KAN-1", [0.9, 0.1, 0.0], 0.99),
+                             candidate("KAN-2", [1.0, 0.0, 0.0], 0.80)], lambda_=1.0)
+    assert [r["spec_ticket_link"][-5:] for r in results] == ["KAN-2", "KAN-1"]
+    assert results[0]["score"] == 1.0 and results[0]["search_score"] == 0.80
+    assert "spec_ticket_vector" not in results[0] and "@search.score" not in results[0]
+
+
+def test_per_project_thresholds():
+    thresholds = load_thresholds('{"KAN": 0.9, "OPS": 0.5}')
+    assert project_key("https://example.atlassian.net/browse/OPS-12") == "OPS"
+    assert load_thresholds("not json") == {}
+
+    close = [0.8, 0.6, 0.0]  # cosine 0.8
+    results = rerank(QUERY, [candidate("KAN-1", close), candidate("OPS-1", close), candidate("ETC-1", close)],
+                     thresholds=thresholds)
+    # KAN 은 0.9 미만이라 제외, 설정 없는 ETC 는 기본 0.82 미만이라 제외
+    assert [r["spec_ticket_link"][-5:] for r in results] == ["OPS-1"]
+
+
+def test_mmr_pushes_near_duplicates_below_distinct_match():
+    duplicates = [candidate(f"KAN-{i}", [0.9, 0.43 + i * 1e-3, 0.0]) for i in range(3)]
+    distinct = candidate("KAN-9", [0.88, -0.47, 0.0])
+    results = rerank(QUERY, duplicates + [distinct], top_n=2, thresholds={"KAN": 0.8})
+
+    print([(r["spec_ticket_link"][-5:], round(r["score"], 3)) for r in results])
+    # 관련도만 보면 거의 같은 매핑 3개가 상위를 차지하지만, MMR 은 두 번째 자리에 다른 매핑을 올림
+    assert results[0]["spec_ticket_link"].endswith("KAN-0")
+    assert results[1]["spec_ticket_link"].endswith("KAN-9")
+
+
+def test_calibrate_threshold_keeps_target_precision():
+    scores = [0.95, 0.93, 0.90, 0.88, 0.86, 0.84, 0.80]
+    labels = [True, True, True, False, True, False, False]
+    assert calibrate_threshold(scores, labels, min_precision=1.0) == 0.90
+    assert calibrate_threshold(scores, labels, min_precision=0.8) == 0.86
+    assert calibrate_threshold([0.9], [False]) is None
+
+
+def test_find_similar_tickets_requests_vectors_and_reranks(monkeypatch):
+    monkeypatch.setenv("SDD_SIMILARITY_THRESHOLDS", '{"KAN": 0.5}')
+    calls = []
+
+    class FakeSearchClient:
+        def search(self, **kwargs):
+            calls.append(kwargs)
+            return iter([candidate("KAN-1", [0.6, 0.8, 0.0], 0.7), candidate("KAN-2", [0.0, 1.0, 0.0], 0.6)])
+
+    tools = AISearchTools()
+    tools._index_checked = True
+    tools._search_client = FakeSearchClient()
+    monkeypatch.setattr(tools, "_get_embedding", lambda text: QUERY)
+
+    matched = tools.find_similar_tickets("사양 내용")
+    assert "spec_ticket_vector" in calls[0]["select"]
+    assert [m["spec_ticket_link"][-5:] for m in matched] == ["KAN-1"]
+    assert abs(matched[0]["score"] - 0.6) < 1e-6
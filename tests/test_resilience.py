@@ -0,0 +1,216 @@
+"""
+재시도 / 속도 제한 / 서킷 브레이커 테스트 - Retry-After 준수, 클라이언트 오류는 바로 실패, 서킷이 열리면 호출 없이 실패
+(sleep / clock 을 주입해 실제로 기다리지 않음)
+"""
+
+import sys
+import random
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from tools.resilience import (
+    CircuitBreaker, CircuitOpenError, EndpointGuard, RetryPolicy, TokenBucket,
+    full_jitter_delay, retry_after_seconds,
+)
+
+
+class ApiError(Exception):
+    """openai.APIStatusError 처럼 status_code 와 response.headers 를 가진 예외"""
+
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.status_code = status
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+class FlakyCall:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_retry_after_header_sets_minimum_delay():
+    sleeps = []
+    guard = EndpointGuard("test", policy=RetryPolicy(max_attempts=3, base_delay=0.1),
+                          sleep=sleeps.append, rng=random.Random(0))
+    call = FlakyCall([ApiError(429, {"retry-after-ms": "1500"}), ApiError(503)])
+
+    assert guard.call(call) == "ok"
+    assert call.calls == 3
+    assert sleeps[0] == 1.5 and 0 <= sleeps[1] <= 0.2
+
+    assert retry_after_seconds(ApiError(429, {"Retry-After": "7"})) == 7.0
+    assert retry_after_seconds(ApiError(429)) is None
+
+
+def test_client_errors_fail_immediately_without_opening_circuit():
+    breaker = CircuitBreaker(failure_threshold=1)
+    guard = EndpointGuard("test", breaker=breaker, sleep=lambda s: None)
+    call = FlakyCall([ApiError(400)])
+
+    with pytest.raises(ApiError):
+        guard.call(call)
+    assert call.calls == 1 and breaker.state == "closed"
+
+
+def test_circuit_opens_after_failures_and_probes_after_timeout():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=lambda: now[0])
+    guard = EndpointGuard("test", policy=RetryPolicy(max_attempts=3), breaker=breaker, sleep=lambda s: None)
+
+    down = FlakyCall([ApiError(503)] * 3)
+    with pytest.raises(ApiError):
+        guard.call(down)
+    assert breaker.state == "open"
+
+    # 열려 있는 동안은 호출하지 않고 바로 실패
+    with pytest.raises(CircuitOpenError):
+        guard.call(down)
+    assert down.calls == 3
+
+    now[0] = 31
+    assert breaker.state == "half-open"
+    assert guard.call(FlakyCall([])) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_token_bucket_spaces_out_calls_after_burst():
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    bucket = TokenBucket(rate_per_second=10, burst=5, clock=lambda: now[0], sleep=sleep)
+    for _ in range(15):
+        bucket.acquire()
+    # 5개는 즉시, 나머지 10개는 초당 10개 속도
+    assert now[0] == pytest.approx(1.0)
+
+
+def test_full_jitter_delay_is_bounded():
+    rng = random.Random(1)
+    delays = [full_jitter_delay(attempt, 0.5, 4.0, rng) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len({round(d, 3) for d in delays}) > 100
+
+
+def test_requests_adapter_retries_throttled_responses(monkeypatch):
+    import requests
+    from requests.adapters import HTTPAdapter
+    from tools.resilience import GuardedHTTPAdapter
+
+    statuses = [429, 503, 200]
+
+    def fake_send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = statuses.pop(0)
+        response.headers["Retry-After"] = "0"
+        response.request = request
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, "send", fake_send)
+    sleeps = []
+    session = requests.Session()
+    session.mount("https://", GuardedHTTPAdapter(EndpointGuard("jira", sleep=sleeps.append)))
+
+    assert session.get("https://jira.example.com/rest/api/2/issue/KAN-1").status_code == 200
+    assert len(sleeps) == 2 and not statuses
+
+
+def test_proxy_and_google_request_builder_route_calls_through_guard():
+    from tools.resilience import GuardedProxy, guarded_request_builder
+
+    sleeps = []
+    guard = EndpointGuard("test", sleep=sleeps.append, rng=random.Random(0))
+    repo = SimpleNamespace(name="owner/repo", get_issue=FlakyCall([ApiError(502)]),
+                           create_issue=FlakyCall([ApiError(429), ApiError(502)]))
+    proxy = GuardedProxy(repo, guard)
+    assert proxy.name == "owner/repo"
+    assert proxy.get_issue() == "ok" and len(sleeps) == 1
+    # 이슈 생성은 429 만 재시도하고, 서버에 도달했을 수 있는 502 는 그대로 실패 (중복 이슈 방지)
+    with pytest.raises(ApiError):
+        proxy.create_issue()
+    assert repo.create_issue.calls == 2 and len(sleeps) == 2
+
+    request_class = guarded_request_builder(guard)
+    assert request_class.__name__ == "GuardedHttpRequest"
+
+
+def test_post_is_not_resent_after_server_error(monkeypatch):
+    import requests
+    from requests.adapters import HTTPAdapter
+    from tools.resilience import GuardedHTTPAdapter
+
+    sent = []
+
+    def fake_send(self, request, **kwargs):
+        sent.append(request.method)
+        response = requests.Response()
+        response.status_code = 503
+        response.request = request
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, "send", fake_send)
+    sleeps = []
+    session = requests.Session()
+    session.mount("https://", GuardedHTTPAdapter(EndpointGuard("jira", sleep=sleeps.append)))
+
+    # 티켓 생성(POST)은 503 이어도 한 번만 보냄
+    assert session.post("https://jira.example.com/rest/api/2/issue", json={}).status_code == 503
+    assert sent == ["POST"] and sleeps == []
+    # 조회(GET)는 재시도
+    session.get("https://jira.example.com/rest/api/2/issue/KAN-1")
+    assert sent.count("GET") == 4
+
+
+def test_connect_errors_and_status_from_falsy_responses():
+    import requests
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+    from tools.resilience import is_connect_error, is_safe_to_resend, retry_after_seconds, status_code
+
+    # 연결 수립 전 실패는 POST 도 다시 보내도 됨, 응답을 기다리다 끊긴 경우는 아님
+    refused = NewConnectionError(None, "Connection refused")
+    assert is_connect_error(requests.ConnectionError(MaxRetryError(None, "/issue", reason=refused)))
+    assert not is_safe_to_resend(requests.ConnectionError("Connection aborted."))
+    assert not is_safe_to_resend(requests.ReadTimeout("read timed out"))
+
+    # 4xx/5xx requests.Response 는 bool 로 False 이지만 상태 코드와 헤더를 읽어야 함
+    response = requests.Response()
+    response.status_code = 429
+    response.headers["Retry-After"] = "3"
+    error = requests.HTTPError("429", response=response)
+    assert not response
+    assert status_code(error) == 429 and retry_after_seconds(error) == 3.0
+    assert is_safe_to_resend(error)
+
+
+def test_google_request_builder_retries_only_get(monkeypatch):
+    from googleapiclient.http import HttpRequest
+    from tools.resilience import guarded_request_builder
+
+    calls = []
+
+    def fake_execute(self, http=None, num_retries=0):
+        calls.append(self.method)
+        raise ApiError(503)
+
+    monkeypatch.setattr(HttpRequest, "execute", fake_execute)
+    request_class = guarded_request_builder(EndpointGuard("gmail", sleep=lambda s: None))
+    for method in ("POST", "GET"):
+        request = request_class(None, lambda *a: None, "https://gmail.example.com/send", method=method)
+        with pytest.raises(ApiError):
+            request.execute()
+
+    assert calls.count("POST") == 1 and calls.count("GET") == 4
@@ -0,0 +1,125 @@
+"""
+SDD 파이프라인 테스트 - 지연이 있는 가짜 도구로 단계 흐름 / 동시 생성 / LLM 호출 횟수 확인
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from agents.sdd.sdd_pipeline import DevTicketDraft, SDDPipeline, parse_issue_key
+
+CREATE_DELAY = 0.3
+
+
+class FakeJira:
+    def __init__(self):
+        self.created = []
+        self.deleted = []
+
+    def fetch_issue(self, issue_key):
+        return {"key": issue_key, "type": "사양", "summary": "PDF 내보내기",
+                "description": "보고서를 PDF로 내보낸다", "link": f"https://jira/browse/{issue_key}"}
+
+    def create_issue(self, summary, description, issue_type):
+        time.sleep(CREATE_DELAY)
+        self.created.append((summary, issue_type))
+        return {"key": "KAN-100", "link": "https://jira/browse/KAN-100"}
+
+    def delete_issue(self, issue_key):
+        self.deleted.append(issue_key)
+
+
+class FakeGitHub:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def open_issue(self, title, body, trigger_copilot=True, label_now=True):
+        time.sleep(CREATE_DELAY)
+        if self.fail:
+            raise RuntimeError("GitHub 502")
+        return {"number": 7, "url": "https://github.com/owner/repo/issues/7"}
+
+    def add_copilot_label(self, issue_number):
+        pass
+
+    def close_issue(self, issue_number, state_reason="not_planned"):
+        pass
+
+
+class FakeSearch:
+    def __init__(self, similar=None):
+        self.similar = similar or []
+        self.saved = []
+
+    def get_ticket_mapping(self, spec_link):
+        return None
+
+    def find_similar_tickets(self, content):
+        return self.similar
+
+    def save_ticket_mapping(self, spec_link, content, dev_link, github_link):
+        self.saved.append((spec_link, dev_link, github_link))
+        return "✅ 티켓 매핑이 성공적으로 저장되었습니다."
+
+
+class _Response:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeChatClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_response(self, messages, options=None):
+        self.calls += 1
+        return _Response(DevTicketDraft(title="PDF 내보내기 구현", body="PDF 다운로드 버튼 추가"))
+
+
+def test_parse_issue_key():
+    assert parse_issue_key("https://x.atlassian.net/browse/KAN-4") == "KAN-4"
+    assert parse_issue_key("KAN-12") == "KAN-12"
+
+
+def test_pipeline_creates_in_parallel_with_single_llm_call():
+    jira, search, chat = FakeJira(), FakeSearch(), FakeChatClient()
+    pipeline = SDDPipeline(jira, FakeGitHub(), search, chat_client=chat)
+
+    started = time.perf_counter()
+    result = asyncio.run(pipeline.run("https://x.atlassian.net/browse/KAN-4"))
+    elapsed = time.perf_counter() - started
+    print(result.to_text(), result.timings_ms)
+
+    assert result.status == "created"
+    assert chat.calls == 1
+    assert jira.created == [("PDF 내보내기 구현", "개발")]
+    assert search.saved == [("https://jira/browse/KAN-4", "https://jira/browse/KAN-100",
+                             "https://github.com/owner/repo/issues/7")]
+    # JIRA / GitHub 생성이 동시에 실행되어 두 지연의 합보다 짧아야 함
+    assert elapsed < CREATE_DELAY * 2
+
+
+def test_pipeline_stops_when_similar_ticket_exists():
+    similar = [{"score": 0.93, "spec_ticket_link": "s", "dev_ticket_link": "d", "github_issue_link": "g"}]
+    jira, chat = FakeJira(), FakeChatClient()
+    result = asyncio.run(SDDPipeline(jira, FakeGitHub(), FakeSearch(similar), chat_client=chat).run("KAN-4"))
+
+    assert result.status == "existing"
+    assert chat.calls == 0
+    assert jira.created == []
+
+
+def test_pipeline_compensates_partial_failure_without_saving_mapping():
+    jira, search = FakeJira(), FakeSearch()
+    result = asyncio.run(SDDPipeline(jira, FakeGitHub(fail=True), search).run("KAN-4"))
+    print(result.to_text())
+
+    assert result.status == "failed"
+    assert result.dev_ticket_link is None
+    assert jira.deleted == ["KAN-100"]
+    assert search.saved == []
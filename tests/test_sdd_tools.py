@@ -0,0 +1,170 @@
+"""
+SDDTicketTools 테스트 - 동시 생성 / 부분 실패 보상 / 매핑 저장 실패 / 재시도 멱등성 / Copilot 라벨 시점
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+import pytest
+
+import tools.sdd_tools as sdd_tools
+from tools.sdd_tools import SDDTicketTools, TicketCreationError
+
+CREATE_DELAY = 0.3
+SPEC_LINK = "https://jira/browse/KAN-4"
+
+
+class FakeJira:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.created = []
+        self.deleted = []
+
+    def create_issue(self, summary, description, issue_type):
+        time.sleep(CREATE_DELAY)
+        if self.fail:
+            raise RuntimeError("JIRA 500")
+        key = f"KAN-{100 + len(self.created)}"
+        self.created.append(key)
+        return {"key": key, "link": f"https://jira/browse/{key}"}
+
+    def delete_issue(self, issue_key):
+        self.deleted.append(issue_key)
+
+
+class FakeGitHub:
+    def __init__(self, fail=False, label_fails=False):
+        self.fail = fail
+        self.label_fails = label_fails
+        self.created = 0
+        self.closed = []
+        self.labeled = []
+
+    def open_issue(self, title, body, trigger_copilot=True, label_now=True):
+        time.sleep(CREATE_DELAY)
+        if self.fail:
+            raise RuntimeError("GitHub 502")
+        self.created += 1
+        if trigger_copilot and label_now:
+            self.labeled.append(self.created)
+        return {"number": self.created, "url": f"https://github.com/owner/repo/issues/{self.created}"}
+
+    def add_copilot_label(self, issue_number):
+        if self.label_fails:
+            raise RuntimeError("GitHub 502")
+        self.labeled.append(issue_number)
+
+    def close_issue(self, issue_number, state_reason="not_planned"):
+        self.closed.append(issue_number)
+
+
+class FakeSearch:
+    def __init__(self, save_fails=0):
+        self.save_fails = save_fails
+        self.mappings = {}
+        self.save_calls = 0
+
+    def get_ticket_mapping(self, spec_link):
+        return self.mappings.get(spec_link)
+
+    def save_ticket_mapping(self, spec_link, content, dev_link, github_link):
+        self.save_calls += 1
+        if self.save_calls <= self.save_fails:
+            return "Error saving ticket mapping: 503"
+        self.mappings[spec_link] = {"dev_ticket_link": dev_link, "github_issue_link": github_link}
+        return "✅ 티켓 매핑이 성공적으로 저장되었습니다."
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(sdd_tools, "MAPPING_RETRY_DELAY", 0)
+
+
+def test_creates_both_concurrently_and_saves_mapping():
+    jira, github, search = FakeJira(), FakeGitHub(), FakeSearch()
+    tools = SDDTicketTools(jira, github, search)
+
+    started = time.perf_counter()
+    result = tools.create_linked_tickets(SPEC_LINK, "사양", "제목", "본문")
+    elapsed = time.perf_counter() - started
+
+    assert result["status"] == "created"
+    assert search.mappings[SPEC_LINK]["dev_ticket_link"] == "https://jira/browse/KAN-100"
+    assert elapsed < CREATE_DELAY * 2
+    # 두 티켓이 모두 생성된 뒤에 Copilot 라벨
+    assert github.labeled == [1]
+
+
+def test_github_failure_deletes_dev_ticket():
+    jira, search = FakeJira(), FakeSearch()
+    with pytest.raises(TicketCreationError) as exc:
+        SDDTicketTools(jira, FakeGitHub(fail=True), search).create_linked_tickets(SPEC_LINK, "사양", "제목", "본문")
+
+    assert jira.deleted == ["KAN-100"]
+    assert exc.value.compensated == ["개발 티켓 KAN-100 삭제"]
+    assert search.mappings == {}
+
+
+def test_jira_failure_closes_github_issue():
+    github = FakeGitHub()
+    result = SDDTicketTools(FakeJira(fail=True), github, FakeSearch()).create_dev_ticket_and_issue(
+        SPEC_LINK, "사양", "제목", "본문"
+    )
+    print(result)
+
+    assert result.startswith("Error")
+    assert github.closed == [1]
+    # JIRA 가 실패했으므로 Copilot 라벨은 붙지 않음
+    assert github.labeled == []
+
+
+def test_label_failure_compensates_both():
+    jira, github, search = FakeJira(), FakeGitHub(label_fails=True), FakeSearch()
+    with pytest.raises(TicketCreationError) as exc:
+        SDDTicketTools(jira, github, search).create_linked_tickets(SPEC_LINK, "사양", "제목", "본문")
+
+    assert "Copilot 라벨" in str(exc.value)
+    assert jira.deleted == ["KAN-100"]
+    assert github.closed == [1]
+    assert search.mappings == {}
+
+
+def test_mapping_save_is_retried_then_compensated():
+    jira, github = FakeJira(), FakeGitHub()
+
+    retried = FakeSearch(save_fails=2)
+    assert SDDTicketTools(jira, github, retried).create_linked_tickets(SPEC_LINK, "사양", "제목", "본문")["status"] == "created"
+    assert retried.save_calls == 3
+
+    failing = FakeSearch(save_fails=10)
+    with pytest.raises(TicketCreationError):
+        SDDTicketTools(jira, github, failing).create_linked_tickets("https://jira/browse/KAN-5", "사양", "제목", "본문")
+    assert jira.deleted == ["KAN-101"]
+    assert github.closed == [2]
+
+
+def test_concurrent_retries_create_only_once():
+    jira, github, search = FakeJira(), FakeGitHub(), FakeSearch()
+    tools = SDDTicketTools(jira, github, search)
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(tools.create_linked_tickets(SPEC_LINK, "사양", "제목", "본문")))
+        for _ in range(3)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert jira.created == ["KAN-100"]
+    assert github.created == 1
+    assert sorted(r["status"] for r in results) == ["created", "existing", "existing"]
+    # 사용이 끝난 사양 티켓 잠금은 남지 않음
+    assert sdd_tools._spec_locks == {}
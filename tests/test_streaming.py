@@ -0,0 +1,97 @@
+"""
+스트리밍 테스트 - 하위 에이전트 업데이트가 마스터 에이전트 스트림에 도착 순서대로 합쳐지는지 확인
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+import pytest
+from agent_framework import AgentResponseUpdate, Content, SupportsAgentRun
+
+from agents.streaming import StreamingAgent, sub_agent_stream_callback
+
+SUB_AGENT_STEP = 0.2
+
+
+def _update(text, author=None):
+    return AgentResponseUpdate(contents=[Content.from_text(text)], role="assistant", author_name=author)
+
+
+class FakeMasterAgent:
+    """첫 토큰 후 하위 에이전트 도구를 호출(스트림 블록)하고 최종 답변을 내보내는 가짜 마스터 에이전트"""
+
+    id = "master"
+    name = "Master-Agent"
+    description = None
+    default_options = {"tools": []}
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.sub_agent_callback = sub_agent_stream_callback("SDDAgent")
+
+    def create_session(self, **kwargs):
+        return None
+
+    def get_session(self, *, service_session_id, **kwargs):
+        return None
+
+    async def _sub_agent(self):
+        for step in ["사양 조회", "유사 티켓 검색", "생성 완료"]:
+            await asyncio.sleep(SUB_AGENT_STEP)
+            self.sub_agent_callback(_update(step))
+
+    def run(self, messages=None, *, stream=False, **kwargs):
+        async def _stream():
+            yield _update("확인해볼게요.", "Master-Agent")
+            await self._sub_agent()
+            if self.fail:
+                raise RuntimeError("chat completion 실패")
+            yield _update("처리했습니다.", "Master-Agent")
+        return _stream()
+
+
+async def _collect(agent):
+    started = time.perf_counter()
+    arrivals = []
+    async for update in agent.run("KAN-4 처리해줘", stream=True):
+        arrivals.append((update.author_name, update.text, time.perf_counter() - started))
+    return arrivals
+
+
+def test_sub_agent_updates_are_forwarded_as_they_arrive():
+    arrivals = asyncio.run(_collect(StreamingAgent(FakeMasterAgent())))
+    print(arrivals)
+
+    assert [(author, text) for author, text, _ in arrivals] == [
+        ("Master-Agent", "확인해볼게요."),
+        ("SDDAgent", "사양 조회"),
+        ("SDDAgent", "유사 티켓 검색"),
+        ("SDDAgent", "생성 완료"),
+        ("Master-Agent", "처리했습니다."),
+    ]
+    # 첫 토큰은 하위 에이전트를 기다리지 않고, 하위 에이전트 단계도 끝날 때까지 모이지 않고 바로 전달됨
+    assert arrivals[0][2] < SUB_AGENT_STEP
+    assert arrivals[1][2] < SUB_AGENT_STEP * 2
+
+
+def test_callback_is_noop_outside_streaming_run():
+    # 스트리밍 실행이 아닌 곳(큐 없음)에서 호출돼도 오류 없이 무시
+    sub_agent_stream_callback("MailAgent")(_update("무시됨"))
+
+
+def test_master_stream_error_is_raised_to_consumer():
+    with pytest.raises(RuntimeError, match="chat completion"):
+        asyncio.run(_collect(StreamingAgent(FakeMasterAgent(fail=True))))
+
+
+def test_wrapper_is_accepted_by_ag_ui():
+    agent = StreamingAgent(FakeMasterAgent())
+    assert isinstance(agent, SupportsAgentRun)
+    assert agent.name == "Master-Agent"
+    assert agent.default_options == {"tools": []}
@@ -0,0 +1,120 @@
+"""
+Teams delta 수집 테스트 - 로컬 스텁 Graph 서버(aiohttp)를 상대로 실행
+"""
+
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from aiohttp import web
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from msgraph import GraphServiceClient
+from msgraph.graph_request_adapter import GraphRequestAdapter
+
+from graphapi.teams_delta import DeltaTokenStore, stream_teams_message_events
+
+USER_ID = "user-1"
+
+
+def _message(msg_id, content, created, modified=None, deleted=None):
+    return {
+        "id": msg_id,
+        "createdDateTime": created,
+        "lastModifiedDateTime": modified or created,
+        "deletedDateTime": deleted,
+        "from": {"user": {"displayName": "김철수"}},
+        "body": {"contentType": "text", "content": content},
+    }
+
+
+class StubGraph:
+    """chats 목록과 chats/{id}/messages/delta() 만 흉내내는 스텁 서버"""
+
+    def __init__(self):
+        self.requests = []
+        self.base_url = None
+
+    async def chats(self, request):
+        self.requests.append(str(request.rel_url))
+        return web.json_response({"value": [{"id": "chat-a"}, {"id": "chat-b"}]})
+
+    async def delta(self, request):
+        self.requests.append(str(request.rel_url))
+        chat_id = request.match_info["chat_id"]
+        base = f"{self.base_url}/users/{USER_ID}/chats/{chat_id}/messages/delta()"
+        skip = request.query.get("$skiptoken")
+        token = request.query.get("$deltatoken")
+
+        if token is None and skip is None:
+            # 최초 동기화 1페이지
+            return web.json_response({
+                "value": [_message(f"{chat_id}-1", "첫 메시지", "2026-10-18T01:00:00Z")],
+                "@odata.nextLink": f"{base}?$skiptoken=page2",
+            })
+        if skip == "page2":
+            return web.json_response({
+                "value": [_message(f"{chat_id}-2", "두 번째 메시지", "2026-10-18T02:00:00Z")],
+                "@odata.deltaLink": f"{base}?$deltatoken=t1",
+            })
+        if token == "t1" and chat_id == "chat-a":
+            # 이후 실행: chat-a 에만 변경분 존재 (수정 1건, 삭제 1건)
+            return web.json_response({
+                "value": [
+                    _message("chat-a-2", "수정된 메시지", "2026-10-18T02:00:00Z", modified="2026-10-19T09:00:00Z"),
+                    _message("chat-a-1", "", "2026-10-18T01:00:00Z", deleted="2026-10-19T09:30:00Z"),
+                ],
+                "@odata.deltaLink": f"{base}?$deltatoken=t2",
+            })
+        return web.json_response({"value": [], "@odata.deltaLink": f"{base}?$deltatoken={token}"})
+
+
+async def _collect(graph_client, store):
+    return [event async for event in stream_teams_message_events(graph_client, store, user_id=USER_ID)]
+
+
+async def _run(tmp_path):
+    stub = StubGraph()
+    app = web.Application()
+    app.router.add_get("/v1.0/users/{user_id}/chats", stub.chats)
+    app.router.add_get("/v1.0/users/{user_id}/chats/{chat_id}/messages/delta()", stub.delta)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    stub.base_url = f"http://127.0.0.1:{port}/v1.0"
+
+    try:
+        adapter = GraphRequestAdapter(AnonymousAuthenticationProvider())
+        adapter.base_url = stub.base_url
+        graph_client = GraphServiceClient(request_adapter=adapter)
+
+        state_path = tmp_path / "teams_delta_state.json"
+        first = await _collect(graph_client, DeltaTokenStore(str(state_path)))
+        saved = json.loads(state_path.read_text())["delta_links"]
+
+        stub.requests.clear()
+        second = await _collect(graph_client, DeltaTokenStore(str(state_path)))
+        return first, saved, second, list(stub.requests)
+    finally:
+        await runner.cleanup()
+
+
+def test_delta_ingestion_persists_links_and_returns_only_changes(tmp_path):
+    first, saved, second, second_requests = asyncio.run(_run(tmp_path))
+
+    print(f"최초 동기화 이벤트: {len(first)}개, 증분 동기화 이벤트: {len(second)}개")
+    assert len(first) == 4
+    assert {e["event"] for e in first} == {"created"}
+    assert all(link.endswith("$deltatoken=t1") for link in saved.values())
+    assert set(saved) == {"chat-a", "chat-b"}
+
+    # 두 번째 실행은 저장된 deltaLink 로 변경분만 받음
+    assert all("$deltatoken=t1" in r for r in second_requests if "delta()" in r)
+    assert sorted(e["event"] for e in second) == ["deleted", "updated"]
+    assert all(e["chat_id"] == "chat-a" for e in second)
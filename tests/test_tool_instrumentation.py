@@ -0,0 +1,132 @@
+"""
+도구 계측 테스트 - 로컬 HTTP 서버를 호출하는 가짜 도구로 호출 수 / 요청 수 / 바이트 / 오류 집계 확인
+(오류 문자열 결과, 중첩 호출, httpx chunked 응답 포함)
+"""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+import httpx
+import pytest
+import requests
+
+from tools.instrumentation import dump_tool_stats, install_http_hooks, instrument_tools, reset_tool_stats
+
+PAYLOAD = b'{"ok": true}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for _ in range(3):
+                self.wfile.write(f"{len(PAYLOAD):x}\r\n".encode() + PAYLOAD + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        status = 500 if self.path == "/fail" else 200
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+
+@instrument_tools
+class FakeTools:
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def fetch_twice(self) -> str:
+        requests.get(f"{self.base_url}/a")
+        requests.get(f"{self.base_url}/b")
+        return "ok"
+
+    def fetch_failing(self) -> str:
+        return str(requests.get(f"{self.base_url}/fail").status_code)
+
+    def explode(self) -> str:
+        raise RuntimeError("boom")
+
+    def report_error(self) -> str:
+        return "Error: 토큰이 만료되었습니다"
+
+    def report_korean_error(self) -> str:
+        return "메일 조회 중 오류 발생: 404"
+
+    def read_mail(self) -> str:
+        # 본문 중간의 "오류 발생"은 도구 오류가 아님
+        return "제목: 장애 보고\n본문: 어제 배포 중 오류 발생: 결제 API 타임아웃"
+
+    def fetch_nested(self) -> str:
+        # 다른 계측 메서드를 부르는 중첩 호출은 바깥 호출에만 한 번 집계
+        self.fetch_twice()
+        requests.get(f"{self.base_url}/c")
+        return "ok"
+
+    def fetch_chunked(self) -> int:
+        with httpx.Client() as client:
+            client.get(f"{self.base_url}/chunked")
+            with client.stream("GET", f"{self.base_url}/chunked") as response:
+                return sum(len(chunk) for chunk in response.iter_bytes())
+
+    def _private(self):
+        return "not instrumented"
+
+
+def test_tool_calls_are_measured(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    tools = FakeTools(f"http://127.0.0.1:{server.server_address[1]}")
+    install_http_hooks()
+    reset_tool_stats()
+
+    try:
+        tools.fetch_twice()
+        tools.fetch_twice()
+        tools.fetch_failing()
+        with pytest.raises(RuntimeError):
+            tools.explode()
+        tools.report_error()
+        tools.report_korean_error()
+        tools.read_mail()
+        tools.fetch_nested()
+        assert tools.fetch_chunked() == 3 * len(PAYLOAD)
+        tools._private()
+    finally:
+        server.shutdown()
+
+    stats = dump_tool_stats(str(tmp_path / "tool_stats.json"))
+    print(stats)
+
+    assert set(stats) == {"FakeTools.fetch_twice", "FakeTools.fetch_failing", "FakeTools.explode",
+                          "FakeTools.report_error", "FakeTools.report_korean_error", "FakeTools.read_mail",
+                          "FakeTools.fetch_nested", "FakeTools.fetch_chunked"}
+    assert stats["FakeTools.fetch_twice"]["calls"] == 2
+    assert stats["FakeTools.fetch_twice"]["http_requests"] == 4
+    assert stats["FakeTools.fetch_twice"]["bytes_received"] == 4 * len(PAYLOAD)
+    assert stats["FakeTools.fetch_failing"]["http_errors"] == 1
+    assert stats["FakeTools.explode"]["errors"] == 1
+    assert stats["FakeTools.report_error"]["errors"] == 1
+    assert stats["FakeTools.report_korean_error"]["errors"] == 1
+    assert stats["FakeTools.fetch_twice"]["errors"] == 0
+    assert stats["FakeTools.read_mail"]["errors"] == 0
+    # 중첩된 fetch_twice 는 따로 집계되지 않음
+    assert stats["FakeTools.fetch_twice"]["calls"] == 2
+    assert stats["FakeTools.fetch_nested"]["calls"] == 1
+    assert stats["FakeTools.fetch_nested"]["http_requests"] == 3
+    # chunked 응답 (content-length 없음): 일반 요청 / stream=True 모두 실제 수신 바이트
+    assert stats["FakeTools.fetch_chunked"]["http_requests"] == 2
+    assert stats["FakeTools.fetch_chunked"]["bytes_received"] >= 2 * 3 * len(PAYLOAD)
+    assert (tmp_path / "tool_stats.json").exists()
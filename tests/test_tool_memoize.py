@@ -0,0 +1,97 @@
+"""
+도구 결과 캐시 테스트 - 세션별 캐시 / TTL / 쓰기 도구 무효화 / 도구 스키마 유지
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+from typing import Annotated
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from pydantic import Field
+from agent_framework import AgentSession, tool
+
+from tools.memoize import SessionCacheMiddleware, ToolResultCache
+
+
+class FakeJiraTools:
+    def __init__(self):
+        self.reads = 0
+
+    def get_jira_issue(self,
+        issue_key: Annotated[str, Field(description="The key of the Jira issue (e.g., 'KAN-123')")]
+    ) -> str:
+        """Retrieves details of a specific Jira issue to read specifications."""
+        self.reads += 1
+        return f"Key: {issue_key}, read #{self.reads}"
+
+    def update_jira_issue(self,
+        issue_key: Annotated[str, Field(description="The key of the Jira issue to update")],
+        comment: Annotated[str, Field(description="Comment to add or update details")]
+    ) -> str:
+        """Updates an existing Jira issue by adding a comment or changing details."""
+        return f"Successfully updated Jira issue {issue_key} with a comment."
+
+
+class _Context:
+    def __init__(self, session):
+        self.session = session
+        self.stream = False
+
+
+def _in_session(session, fn):
+    """SessionCacheMiddleware 를 거쳐 fn 을 실행 (에이전트 실행 흉내)"""
+    result = {}
+
+    async def call_next():
+        result["value"] = fn()
+
+    asyncio.run(SessionCacheMiddleware().process(_Context(session), call_next))
+    return result["value"]
+
+
+def test_read_cache_and_write_invalidation():
+    jira = FakeJiraTools()
+    cache = ToolResultCache(ttl_seconds=60)
+    get_issue = cache.read(jira.get_jira_issue)
+    update_issue = cache.write(jira.update_jira_issue, evicts={"get_jira_issue": "issue_key"})
+
+    assert get_issue("KAN-4") == get_issue(issue_key="KAN-4")
+    get_issue("KAN-5")
+    assert jira.reads == 2
+
+    update_issue("KAN-4", "코멘트")
+    get_issue("KAN-4")   # 무효화되어 다시 조회
+    get_issue("KAN-5")   # 다른 키는 유지
+    assert jira.reads == 3
+    assert cache.hits == 2
+
+
+def test_cache_is_scoped_per_session_and_expires():
+    jira = FakeJiraTools()
+    cache = ToolResultCache(ttl_seconds=0.2)
+    get_issue = cache.read(jira.get_jira_issue)
+    session_a, session_b = AgentSession(), AgentSession()
+
+    _in_session(session_a, lambda: get_issue("KAN-4"))
+    _in_session(session_a, lambda: get_issue("KAN-4"))
+    _in_session(session_b, lambda: get_issue("KAN-4"))
+    assert jira.reads == 2
+
+    time.sleep(0.25)
+    _in_session(session_a, lambda: get_issue("KAN-4"))
+    assert jira.reads == 3
+
+
+def test_wrapped_tool_keeps_name_and_schema():
+    jira = FakeJiraTools()
+    original = tool(jira.get_jira_issue)
+    wrapped = tool(ToolResultCache().read(jira.get_jira_issue))
+
+    assert wrapped.name == original.name == "get_jira_issue"
+    assert wrapped.parameters() == original.parameters()
+    assert wrapped.description == original.description
@@ -0,0 +1,89 @@
+"""
+도구 상태 직렬화 테스트 - pickle 에는 설정만 남고, 복원 후 첫 사용 때 클라이언트를 다시 만드는지
+(라이브 클라이언트 대신 pickle 불가능한 threading.Lock 을 넣어 확인)
+"""
+
+import sys
+import pickle
+import threading
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+from tools.ai_search_tools import AISearchTools
+from tools.github_tools import GitHubAutomationTools
+from tools.gmail_tools import GmailAutomationTools
+from tools.gtask_tools import GoogleTasksAutomationTools
+from tools.jira_tools import JiraAutomationTools
+
+
+def test_google_tools_drop_service_and_reauthenticate_lazily(monkeypatch):
+    monkeypatch.setenv("GMAIL_TOKEN_PATH", "/tmp/gmail-token.json")
+    monkeypatch.setenv("GTASK_TOKEN_PATH", "/tmp/gtask-token.json")
+
+    gmail = GmailAutomationTools(service=threading.Lock())
+    tasks = GoogleTasksAutomationTools(service=threading.Lock())
+    tasks._task_index = {f"할 일 {i}": {"id": str(i)} for i in range(1000)}
+
+    restored_gmail = pickle.loads(pickle.dumps(gmail))
+    data = pickle.dumps(tasks)
+    restored_tasks = pickle.loads(data)
+
+    print(len(data))
+    assert len(data) < 1000
+    assert restored_gmail.token_path == "/tmp/gmail-token.json"
+    assert restored_tasks._task_index is None and restored_tasks._service is None
+
+    rebuilt = []
+    monkeypatch.setattr(GmailAutomationTools, "_authenticate", lambda self: rebuilt.append("gmail") or "service")
+    assert restored_gmail.service == "service" and restored_gmail.service == "service"
+    assert rebuilt == ["gmail"]
+
+
+def test_sdk_clients_are_not_pickled(monkeypatch):
+    monkeypatch.setenv("GITHUB_REPO_NAME", "owner/repo")
+    monkeypatch.setenv("JIRA_SERVER_URL", "https://example.atlassian.net")
+
+    github = GitHubAutomationTools()
+    github._client, github._repo = threading.Lock(), threading.Lock()
+    jira = JiraAutomationTools()
+    jira._client = threading.Lock()
+    search = AISearchTools()
+    search._search_client = threading.Lock()
+    search._index_checked = True
+
+    restored_github = pickle.loads(pickle.dumps(github))
+    restored_jira = pickle.loads(pickle.dumps(jira))
+    restored_search = pickle.loads(pickle.dumps(search))
+
+    assert restored_github.repo_name == "owner/repo" and restored_github._repo is None
+    assert restored_jira.server == "https://example.atlassian.net" and restored_jira._client is None
+    assert restored_search._search_client is None and restored_search._index_checked
+    # 원본 인스턴스는 그대로 클라이언트를 유지
+    assert github._repo is not None and search._search_client is not None
+
+
+def test_google_service_is_built_per_thread(monkeypatch):
+    monkeypatch.setenv("GOOGLE_CREDENTIALS_PATH", "/tmp/credentials.json")
+    monkeypatch.setenv("GMAIL_TOKEN_PATH", "/tmp/gmail-token.json")
+    built = []
+    monkeypatch.setattr(GmailAutomationTools, "_authenticate", lambda self: built.append(object()) or built[-1])
+
+    gmail = GmailAutomationTools()
+    main_service = gmail.service
+    seen = []
+    worker = threading.Thread(target=lambda: seen.extend([gmail.service, gmail.service]))
+    worker.start()
+    worker.join()
+
+    # httplib2 는 스레드 안전하지 않으므로 스레드마다 다른 service, 같은 스레드에서는 재사용
+    assert main_service is gmail.service and len(built) == 2
+    assert seen[0] is seen[1] and seen[0] is not main_service
+    # 주입된 대역은 모든 스레드가 공유
+    injected = GmailAutomationTools(service="fake")
+    worker = threading.Thread(target=lambda: seen.append(injected.service))
+    worker.start()
+    worker.join()
+    assert seen[-1] == "fake"
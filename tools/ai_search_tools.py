@@ -8,21 +8,35 @@ AI Search Tools - Azure AI Search를 이용한 티켓 관리
 - 개발 티켓 링크 (dev_ticket_link)
 - 깃허브 이슈 링크 (github_issue_link)
 
+긴 사양 티켓은 겹치는 청크로 나눠 (tools/chunking.py) 청크마다 자식 문서(parent_id = 매핑 문서 id)를 함께 저장하고,
+매핑 문서의 벡터는 청크 벡터의 평균 방향으로 둡니다. 검색은 질의 청크별 벡터 질의 결과를 매핑 단위로
+max-sim 집계합니다. (tools/rerank.py)
+
+인덱스 수명 주기:
+- 읽기 / 쓰기는 alias(INDEX_ALIAS) 로 하고, 실제 인덱스는 버전 이름(sdd-tickets-v1, v2, ...)을 씁니다.
+- 스키마나 임베딩 배포를 바꿀 때는 reindex() (또는 백그라운드 start_reindex()) 로 다음 버전 인덱스를 만들고
+  기존 문서를 병렬 배치로 다시 임베딩 / 복사한 뒤 alias 를 바꾸고 이전 인덱스를 삭제합니다.
+  그동안 중복 검사는 계속 이전 인덱스로 동작합니다.
+
 참고: https://github.com/ChangJu-Ahn/azure_aisearch_workshop/tree/main/03-vector_search
 """
 
 import os
-import time
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
 import hashlib
 from datetime import datetime, timezone
 from typing import Annotated
 
 from pydantic import Field
 from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import ResourceNotFoundError
 from azure.search.documents import SearchClient
 from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents.indexes.models import (
+    SearchAlias,
     SearchField,
     SearchFieldDataType,
     SearchableField,
@@ -36,16 +50,43 @@ from azure.search.documents.indexes.models import (
 from azure.search.documents.models import VectorizedQuery
 from openai import AzureOpenAI
 
+from tools.chunking import chunk_text, spread
+from tools.embedding_batcher import get_batcher
+from tools.instrumentation import instrument_tools
+from tools.rerank import load_thresholds, rerank
+from tools.resilience import endpoint_guard
+from tools.output_format import TOOL_BUDGETS, parse_cursor, render_records
+from tools.tool_state import PicklableTools
+
+# 백그라운드 reindex 는 프로세스당 하나씩만 실행
+_reindex_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sdd-reindex")
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-# 유사도 임계치 (이 값 이상이면 기존 티켓이 존재한다고 판단)
-SIMILARITY_THRESHOLD = 0.85
-INDEX_NAME = "sdd-tickets-index2"
-VECTOR_DIMENSIONS = 1536  # text-embedding-3-small / text-embedding-ada-002 기준
+# 유사도 판단은 tools/rerank.py 의 프로젝트별 cosine 임계치 (기본 DEFAULT_THRESHOLD) 로 수행
+# HNSW 로 받을 후보 수 / 재순위화 후 반환할 수
+CANDIDATE_K = 10
+SIMILAR_TOP_N = 5
+# 유사 티켓 검색에 쓰는 질의 청크 수 상한 (벡터 질의 수) / 한 번의 임베딩 호출에 넣는 청크 수
+MAX_QUERY_CHUNKS = 4
+EMBED_BATCH_SIZE = 16
+# 읽기 / 쓰기에 쓰는 alias 와 버전 인덱스 이름 (sdd-tickets-v1, v2, ...)
+INDEX_ALIAS = "sdd-tickets"
+INDEX_VERSION_PREFIX = "sdd-tickets-v"
+# alias 도입 전의 단일 인덱스 (있으면 alias 가 먼저 이 인덱스를 가리키고, reindex 로 버전 인덱스로 옮김)
+LEGACY_INDEX_NAME = "sdd-tickets-index2"
+# reindex 시 한 번에 읽는 문서 수 / 업로드 배치 크기 / 병렬 작업 수
+REINDEX_PAGE_SIZE = 1000
+REINDEX_BATCH_SIZE = 100
+REINDEX_WORKERS = 4
+VECTOR_DIMENSIONS = 1536  # text-embedding-3-small / text-embedding-ada-002 기본 차원
+# 임베딩 API 클라이언트 측 속도 제한 (배포의 RPM 한도보다 낮게)
+EMBEDDING_RATE_PER_SECOND = 10
+EMBEDDING_BURST = 20
 
 
 def _preprocess_text(text: str) -> str:
@@ -62,12 +103,42 @@ def _preprocess_text(text: str) -> str:
     return text
 
 
-class AISearchTools:
+def _centroid(vectors: list[list[float]]) -> list[float]:
+    """청크 벡터들의 평균 방향 (단위 벡터). 청크가 1개면 그대로 반환"""
+    if len(vectors) == 1:
+        return vectors[0]
+    mean = np.mean(np.asarray(vectors, dtype=np.float32), axis=0)
+    norm = np.linalg.norm(mean)
+    return (mean / norm if norm > 0 else mean).tolist()
+
+
+def _next_index_name(existing_indexes) -> str:
+    """기존 버전 인덱스 중 가장 큰 번호 + 1"""
+    versions = [
+        int(name[len(INDEX_VERSION_PREFIX):]) for name in existing_indexes
+        if name.startswith(INDEX_VERSION_PREFIX) and name[len(INDEX_VERSION_PREFIX):].isdigit()
+    ]
+    return f"{INDEX_VERSION_PREFIX}{max(versions, default=0) + 1}"
+
+
+def _has_newer(target: SearchClient, doc: dict) -> bool:
+    """target 에 같은 id 의 더 최신(created_at 이 같거나 늦은) 문서가 있는지"""
+    try:
+        existing = target.get_document(key=doc["id"], selected_fields=["created_at"])
+    except ResourceNotFoundError:
+        return False
+    return str(existing.get("created_at") or "") >= str(doc.get("created_at") or "")
+
+@instrument_tools
+class AISearchTools(PicklableTools):
+    # pickle 시 클라이언트는 빼고 config 문자열만 저장
+    _transient_attrs = ("_openai_client", "_index_client", "_search_client")
+
     def __init__(self):
         """
         __init__은 직렬화 가능한 config 문자열만 저장합니다.
         httpx 기반 클라이언트(AzureOpenAI, SearchClient 등)는 RLock을 포함하여
-        pickle 불가능하므로, 각 메서드 호출 시 팩토리 메서드로 생성합니다.
+        pickle 불가능하므로, 처음 사용할 때 팩토리 메서드로 생성해 재사용하고 pickle 상태에서는 제외합니다.
         """
         # Azure AI Search 설정 (SEARCH_ENDPOINT / SEARCH_ADMIN_KEY 우선, 없으면 AZURE_* 폴백)
         self._search_endpoint = os.getenv("SEARCH_ENDPOINT") or os.getenv("AZURE_SEARCH_ENDPOINT")
@@ -78,60 +149,119 @@ class AISearchTools:
         self._openai_api_key = os.getenv("FOUNDRY_PROJECT_KEY")
         self._embedding_deployment = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
         self._openai_api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01")
+        # 축소 차원 (text-embedding-3 계열만 지원, 예: 256 / 512). 없으면 dimensions 를 보내지 않고 VECTOR_DIMENSIONS
+        dimensions = os.getenv("AZURE_OPENAI_EMBEDDING_DIMENSIONS")
+        self._embedding_dimensions = int(dimensions) if dimensions else None
+
+        # 프로젝트별 유사도 임계치 (SDD_SIMILARITY_THRESHOLDS, 없으면 기본값)
+        self._similarity_thresholds = load_thresholds()
+
+        # 읽기 / 쓰기 alias 이름
+        self._index_alias = os.getenv("AZURE_SEARCH_INDEX_ALIAS", INDEX_ALIAS)
 
         # 인덱스 초기화 여부 플래그 (bool은 pickle 가능)
         self._index_checked = False
 
+        # 재사용하는 클라이언트 (연결 풀 유지, pickle 제외)
+        self._openai_client: AzureOpenAI | None = None
+        self._index_client: SearchIndexClient | None = None
+        self._search_client: SearchClient | None = None
+
         logger.info("AISearchTools 초기화 완료 (클라이언트는 lazy 생성)")
 
     # ------------------------------------------------------------------ #
-    # 팩토리 메서드 - 매 호출마다 새 클라이언트 생성 (pickle 이슈 방지)  #
+    # 팩토리 메서드 - 처음 사용할 때 생성해 재사용 (pickle 복원 후 다시 생성) #
     # ------------------------------------------------------------------ #
 
     def _make_openai_client(self) -> AzureOpenAI:
-        return AzureOpenAI(
-            api_key=self._openai_api_key,
-            azure_endpoint=self._openai_endpoint,
-            api_version=self._openai_api_version,
-        )
+        if self._openai_client is None:
+            self._openai_client = AzureOpenAI(
+                api_key=self._openai_api_key,
+                azure_endpoint=self._openai_endpoint,
+                api_version=self._openai_api_version,
+                # 재시도는 tools/resilience.py 가 담당 (SDK 재시도와 중첩 방지)
+                max_retries=0,
+            )
+        return self._openai_client
 
     def _make_search_credential(self) -> AzureKeyCredential:
         return AzureKeyCredential(self._search_admin_key)
 
     def _make_index_client(self) -> SearchIndexClient:
-        return SearchIndexClient(
-            endpoint=self._search_endpoint,
-            credential=self._make_search_credential(),
-        )
+        if self._index_client is None:
+            self._index_client = SearchIndexClient(
+                endpoint=self._search_endpoint,
+                credential=self._make_search_credential(),
+            )
+        return self._index_client
 
     def _make_search_client(self) -> SearchClient:
+        """alias 로 읽고 쓰는 검색 클라이언트 (reindex 후에도 그대로 새 인덱스를 가리킴)"""
+        if self._search_client is None:
+            self._search_client = self._make_index_search_client(self._index_alias)
+        return self._search_client
+
+    def _make_index_search_client(self, index_name: str) -> SearchClient:
+        """특정 버전 인덱스용 검색 클라이언트 (reindex 전용, 캐시하지 않음)"""
         return SearchClient(
             endpoint=self._search_endpoint,
-            index_name=INDEX_NAME,
+            index_name=index_name,
             credential=self._make_search_credential(),
         )
 
+    def current_index_name(self) -> str | None:
+        """alias 가 가리키는 인덱스 이름. alias 가 없으면 None"""
+        for alias in self._make_index_client().list_aliases():
+            if alias.name == self._index_alias:
+                return alias.indexes[0]
+        return None
+
+    def _point_alias(self, index_client: SearchIndexClient, index_name: str):
+        index_client.create_or_update_alias(SearchAlias(name=self._index_alias, indexes=[index_name]))
+        logger.info(f"alias '{self._index_alias}' → '{index_name}'")
+
     def _ensure_index_exists(self):
-        """인덱스가 없으면 생성합니다. 이미 확인한 경우 건너뜁니다."""
+        """
+        alias 와 그 인덱스가 없으면 만듭니다. 이미 확인한 경우 건너뜁니다.
+        처음에는 기존 단일 인덱스(LEGACY_INDEX_NAME)가 있으면 그 인덱스를, 없으면 v1 을 새로 만들어 가리킵니다.
+        """
         if self._index_checked:
             return
         try:
             index_client = self._make_index_client()
-            existing_indexes = [idx.name for idx in index_client.list_indexes()]
-            if INDEX_NAME not in existing_indexes:
-                logger.info(f"인덱스 '{INDEX_NAME}' 생성 중...")
-                self._create_index(index_client)
-                logger.info(f"인덱스 '{INDEX_NAME}' 생성 완료")
+            current = self.current_index_name()
+            if current is None:
+                existing_indexes = set(index_client.list_index_names())
+                current = LEGACY_INDEX_NAME if LEGACY_INDEX_NAME in existing_indexes else f"{INDEX_VERSION_PREFIX}1"
+                # 기존 인덱스에는 필드 추가(parent_id / chunk_index 등)만 반영됨
+                logger.info(f"인덱스 '{current}' 생성/갱신 중...")
+                self._create_index(index_client, current)
+                self._point_alias(index_client, current)
             else:
-                logger.info(f"인덱스 '{INDEX_NAME}' 이미 존재함")
+                logger.info(f"alias '{self._index_alias}' → '{current}' 이미 존재함")
+                self._check_vector_dimensions(index_client, current)
             self._index_checked = True
         except Exception as e:
             logger.error(f"인덱스 확인/생성 실패: {str(e)}", exc_info=True)
             raise
 
-    def _create_index(self, index_client: SearchIndexClient | None = None):
+    @property
+    def vector_dimensions(self) -> int:
+        """임베딩 / 인덱스 벡터 차원 (설정한 축소 차원 또는 모델 기본 차원)"""
+        return self._embedding_dimensions or VECTOR_DIMENSIONS
+
+    def _check_vector_dimensions(self, index_client: SearchIndexClient, index_name: str):
+        """인덱스 벡터 차원이 설정과 다르면 경고 (차원을 바꾸면 새 설정으로 reindex 해야 함)"""
+        fields = {field.name: field for field in index_client.get_index(index_name).fields}
+        field = fields.get("spec_ticket_vector")
+        indexed = getattr(field, "vector_search_dimensions", None)
+        if indexed and indexed != self.vector_dimensions:
+            logger.warning(f"인덱스 '{index_name}' 벡터 차원 {indexed} ≠ 설정 {self.vector_dimensions}. "
+                           f"새 설정으로 reindex() 를 실행해야 검색 / 저장이 동작합니다.")
+
+    def _create_index(self, index_client: SearchIndexClient | None = None, index_name: str | None = None):
         """
-        SDD 티켓 저장용 Azure AI Search 인덱스를 생성합니다.
+        SDD 티켓 저장용 Azure AI Search 인덱스를 생성합니다. (index_name 기본값: v1)
 
         알고리즘:
         - HNSW: 빠른 근사 검색 (기본 검색에 사용)
@@ -158,7 +288,7 @@ class AISearchTools:
                 type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
                 searchable=True,
                 retrievable=True,  # 검색 결과에서 벡터 값 확인 가능 (디버깅용)
-                vector_search_dimensions=VECTOR_DIMENSIONS,
+                vector_search_dimensions=self.vector_dimensions,
                 vector_search_profile_name="hnsw-profile"
             ),
             SimpleField(
@@ -171,6 +301,17 @@ class AISearchTools:
                 type=SearchFieldDataType.String,
                 filterable=True
             ),
+            # 청크 자식 문서: 매핑 문서 id / 청크 순서 (매핑 문서는 둘 다 null)
+            SimpleField(
+                name="parent_id",
+                type=SearchFieldDataType.String,
+                filterable=True
+            ),
+            SimpleField(
+                name="chunk_index",
+                type=SearchFieldDataType.Int32,
+                filterable=True
+            ),
             SimpleField(
                 name="created_at",
                 type=SearchFieldDataType.DateTimeOffset,
@@ -187,7 +328,7 @@ class AISearchTools:
                     parameters={
                         "m": 4,               # 노드당 연결 수 (4~10 권장, 낮을수록 빠름)
                         "efConstruction": 400, # 인덱스 빌드 품질 (높을수록 정확, 느림)
-                        "efSearch": 500,       # 검색 시 탐색 범위 (높을수록 정확, 느림)
+                        "efSearch": 100,       # 검색 시 탐색 범위 (후보를 로컬에서 정확히 재순위화하므로 낮게)
                         "metric": "cosine"     # 유사도 측정 방식
                     }
                 ),
@@ -212,92 +353,146 @@ class AISearchTools:
         )
 
         index = SearchIndex(
-            name=INDEX_NAME,
+            name=index_name or f"{INDEX_VERSION_PREFIX}1",
             fields=fields,
             vector_search=vector_search
         )
         client = index_client or self._make_index_client()
         client.create_or_update_index(index)
 
-    def _get_embedding(self, text: str, max_retries: int = 3) -> list[float]:
+    def _embed_many(self, texts: list[str], dimensions: int | None = None) -> list[list[float]]:
+        """
+        여러 텍스트를 한 번의 embeddings.create 호출로 벡터화합니다. (입력 순서대로 반환)
+        축소 차원이 설정되어 있으면(또는 dimensions 를 주면) dimensions= 로 요청합니다.
+        호출은 엔드포인트별 속도 제한 / jitter 백오프 재시도(Retry-After 준수) / 서킷 브레이커를 거칩니다. (tools/resilience.py)
+        """
+        guard = endpoint_guard(f"azure-openai:{self._openai_endpoint}",
+                               rate_per_second=EMBEDDING_RATE_PER_SECOND, burst=EMBEDDING_BURST)
+        dimensions = dimensions or self._embedding_dimensions
+        response = guard.call(
+            self._make_openai_client().embeddings.create,
+            input=texts,
+            model=self._embedding_deployment,
+            **({"dimensions": dimensions} if dimensions else {}),
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def _embedding_batch_key(self) -> tuple:
+        """임베딩 호출 묶음 키 - 같은 클라이언트 설정을 쓰는 인스턴스끼리만 묶음 (키 원문 대신 지문)"""
+        key_fingerprint = hashlib.sha256((self._openai_api_key or "").encode()).hexdigest()[:16]
+        return (self._openai_endpoint, self._embedding_deployment, self._openai_api_version,
+                self._embedding_dimensions, key_fingerprint)
+
+    def _get_embedding(self, text: str) -> list[float]:
         """
         텍스트를 벡터로 변환합니다.
-        실패 시 지수 백오프(exponential backoff)로 최대 max_retries회 재시도합니다.
+        동시에 들어온 다른 요청과 묶어 한 번에 호출합니다. (tools/embedding_batcher.py)
+        재시도는 _embed_many 의 공용 가드가 담당하므로 여기서는 다시 시도하지 않습니다.
         """
         processed = _preprocess_text(text)
+        batcher = get_batcher(self._embedding_batch_key(), self._embed_many)
+        try:
+            return batcher.embed(processed)
+        except Exception as e:
+            logger.error(f"임베딩 생성 최종 실패: {str(e)}", exc_info=True)
+            raise
 
-        for attempt in range(max_retries):
-            try:
-                response = self._make_openai_client().embeddings.create(
-                    input=processed,
-                    model=self._embedding_deployment
-                )
-                return response.data[0].embedding
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2
-                    logger.warning(f"임베딩 생성 실패 ({attempt + 1}/{max_retries}), {wait_time}초 후 재시도... 오류: {e}")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"임베딩 생성 최종 실패: {str(e)}", exc_info=True)
-                    raise
+    def _embed_chunks(self, chunks: list[str]) -> list[list[float]]:
+        """
+        청크 목록을 벡터로 변환합니다. 청크 1개는 동시 요청과 묶는 _get_embedding 경로를,
+        여러 개는 EMBED_BATCH_SIZE 개씩 한 번의 호출로 보냅니다. (요청 하나의 크기를 작게 유지)
+        """
+        if len(chunks) == 1:
+            return [self._get_embedding(chunks[0])]
+        vectors = []
+        for start in range(0, len(chunks), EMBED_BATCH_SIZE):
+            vectors.extend(self._embed_many(chunks[start:start + EMBED_BATCH_SIZE]))
+        return vectors
+
+    def find_similar_tickets(self, spec_ticket_content: str) -> list[dict]:
+        """
+        search_similar_tickets 의 구조화 버전 (코드 경로용, 실패 시 예외).
+        HNSW 로 CANDIDATE_K 개 후보를 받아 정확한 cosine / 프로젝트별 임계치 / MMR 로 재순위화하고 (tools/rerank.py)
+        score(cosine) / 링크 / 내용 dict 목록을 반환합니다.
+        """
+        self._ensure_index_exists()
+        # 긴 사양은 청크별 벡터로 질의하고 매핑 단위로 max-sim 집계
+        query_chunks = spread(chunk_text(_preprocess_text(spec_ticket_content)), MAX_QUERY_CHUNKS)
+        query_vectors = self._embed_chunks(query_chunks)
+
+        # HNSW 프로필을 사용한 벡터 검색 (재순위화를 위해 벡터도 함께 받음)
+        vector_queries = [
+            VectorizedQuery(vector=vector, k=CANDIDATE_K, fields="spec_ticket_vector")
+            for vector in query_vectors
+        ]
+
+        results = self._make_search_client().search(
+            search_text=None,  # 순수 벡터 검색
+            vector_queries=vector_queries,
+            select=["id", "parent_id", "spec_ticket_link", "spec_ticket_content", "dev_ticket_link",
+                    "github_issue_link", "spec_ticket_vector"],
+            top=CANDIDATE_K * len(vector_queries),
+        )
+
+        return rerank(query_vectors, list(results), top_n=SIMILAR_TOP_N, thresholds=self._similarity_thresholds)
+
+    def _mapping_documents(self, mapping: dict, chunks: list[str], chunk_vectors: list[list[float]]) -> list[dict]:
+        """매핑 문서와 (청크가 여러 개면) 청크 자식 문서 목록을 만듭니다. 매핑 벡터는 청크 벡터의 평균 방향"""
+        doc_id = self.mapping_id(mapping["spec_ticket_link"])
+        documents = [{**mapping, "id": doc_id, "spec_ticket_vector": _centroid(chunk_vectors)}]
+        if len(chunks) > 1:
+            documents += [
+                {
+                    **mapping,
+                    "id": f"{doc_id}-{i}",
+                    "parent_id": doc_id,
+                    "chunk_index": i,
+                    "spec_ticket_content": chunk,
+                    "spec_ticket_vector": vector,
+                }
+                for i, (chunk, vector) in enumerate(zip(chunks, chunk_vectors))
+            ]
+        return documents
+
+    @staticmethod
+    def mapping_id(spec_ticket_link: str) -> str:
+        """사양 티켓 링크로부터 매핑 문서 ID 를 만듭니다. (동일 링크는 항상 동일 ID)"""
+        return hashlib.md5(spec_ticket_link.encode()).hexdigest()
+
+    def get_ticket_mapping(self, spec_ticket_link: str) -> dict | None:
+        """사양 티켓 링크로 저장된 매핑을 키 조회합니다. 없으면 None (코드 경로용, 그 외 실패 시 예외)."""
+        self._ensure_index_exists()
+        try:
+            return self._make_search_client().get_document(
+                key=self.mapping_id(spec_ticket_link),
+                selected_fields=["spec_ticket_link", "dev_ticket_link", "github_issue_link", "created_at"],
+            )
+        except ResourceNotFoundError:
+            return None
 
     def search_similar_tickets(self,
         spec_ticket_content: Annotated[str, Field(description="사양 티켓의 내용 (description). 이 내용으로 유사한 기존 개발 티켓을 검색합니다.")]
     ) -> str:
         """
         사양 티켓 내용 기반으로 기존에 생성된 개발 티켓 및 GitHub 이슈를 벡터 검색으로 조회합니다.
-        HNSW 알고리즘으로 빠른 근사 검색을 수행하며,
-        유사도 임계치(0.85) 이상인 결과가 있으면 해당 정보를 반환합니다.
-        없으면 새로 생성해야 함을 알립니다.
+        HNSW 근사 검색 후 정확한 cosine 으로 재순위화하며, 비슷한 과거 매핑이 겹치지 않게 다양화합니다.
+        프로젝트별 유사도 임계치 이상인 결과가 있으면 점수 / 사양 티켓 / 개발 티켓 / GitHub 이슈 링크 표를 반환합니다.
+        없으면 "유사 티켓 없음" 으로 새로 생성해야 함을 알립니다.
         """
         logger.info("유사 티켓 검색 시작")
         logger.debug(f"검색 내용: {spec_ticket_content[:100]}...")
 
         try:
-            self._ensure_index_exists()
-            vector = self._get_embedding(spec_ticket_content)
-
-            # HNSW 프로필을 사용한 벡터 검색
-            vector_query = VectorizedQuery(
-                vector=vector,
-                k_nearest_neighbors=5,
-                fields="spec_ticket_vector"
-            )
-
-            results = self._make_search_client().search(
-                search_text=None,  # 순수 벡터 검색
-                vector_queries=[vector_query],
-                select=["id", "spec_ticket_link", "spec_ticket_content", "dev_ticket_link", "github_issue_link"],
-                top=5,
-                include_total_count=True
+            matched = self.find_similar_tickets(spec_ticket_content)
+
+            logger.info(f"유사 티켓 {len(matched)}개")
+            return render_records(
+                "유사 티켓", [{**item, "score": f"{item['score']:.4f}"} for item in matched],
+                [("score", None), ("spec_ticket_link", None), ("dev_ticket_link", None), ("github_issue_link", None)],
+                budget_tokens=TOOL_BUDGETS["search_similar_tickets"],
+                empty="유사 티켓 없음 (프로젝트별 유사도 임계치 이상 없음). 새 개발 티켓과 GitHub 이슈를 생성해주세요.",
             )
 
-            matched = []
-            for result in results:
-                score = result.get("@search.score", 0)
-                if score >= SIMILARITY_THRESHOLD:
-                    matched.append({
-                        "score": score,
-                        "spec_ticket_link": result.get("spec_ticket_link"),
-                        "spec_ticket_content": result.get("spec_ticket_content"),
-                        "dev_ticket_link": result.get("dev_ticket_link"),
-                        "github_issue_link": result.get("github_issue_link"),
-                    })
-
-            if matched:
-                logger.info(f"유사 티켓 {len(matched)}개 발견 (임계치: {SIMILARITY_THRESHOLD})")
-                result_lines = [f"✅ 유사한 기존 티켓 {len(matched)}개를 찾았습니다:"]
-                for i, item in enumerate(matched, 1):
-                    result_lines.append(f"\n[{i}] 유사도 점수: {item['score']:.4f}")
-                    result_lines.append(f"    사양 티켓: {item['spec_ticket_link']}")
-                    result_lines.append(f"    개발 티켓: {item['dev_ticket_link']}")
-                    result_lines.append(f"    GitHub 이슈: {item['github_issue_link']}")
-                return "\n".join(result_lines)
-            else:
-                logger.info("유사 티켓 없음 → 새로 생성 필요")
-                return "❌ 유사한 기존 티켓이 없습니다. 새로운 개발 티켓과 GitHub 이슈를 생성해주세요."
-
         except Exception as e:
             logger.error(f"유사 티켓 검색 실패: {str(e)}", exc_info=True)
             return f"Error searching similar tickets: {str(e)}"
@@ -311,28 +506,35 @@ class AISearchTools:
         """
         새로 생성한 개발 티켓과 GitHub 이슈 정보를 Azure AI Search에 저장합니다.
         merge_or_upload_documents를 사용하여 동일 문서 중복 저장을 방지합니다.
+        긴 사양 티켓은 청크별 자식 문서도 함께 저장하고, 이전 저장에서 남은 청크는 삭제합니다.
         이후 동일/유사한 사양 티켓이 입력될 때 중복 생성을 방지합니다.
         """
         logger.info(f"티켓 매핑 저장: {spec_ticket_link}")
         try:
             self._ensure_index_exists()
-            vector = self._get_embedding(spec_ticket_content)
-
-            # spec_ticket_link 기반으로 고유 ID 생성 (동일 링크는 항상 동일 ID)
-            doc_id = hashlib.md5(spec_ticket_link.encode()).hexdigest()
-
-            document = {
-                "id": doc_id,
+            chunks = chunk_text(_preprocess_text(spec_ticket_content))
+            mapping = {
                 "spec_ticket_link": spec_ticket_link,
                 "spec_ticket_content": spec_ticket_content,
-                "spec_ticket_vector": vector,
                 "dev_ticket_link": dev_ticket_link,
                 "github_issue_link": github_issue_link,
                 "created_at": datetime.now(timezone.utc).isoformat(),
             }
+            documents = self._mapping_documents(mapping, chunks, self._embed_chunks(chunks))
+            # spec_ticket_link 기반 고유 ID (동일 링크는 항상 동일 ID)
+            doc_id = documents[0]["id"]
 
             # merge_or_upload: 기존 문서가 있으면 업데이트, 없으면 새로 생성
-            result = self._make_search_client().merge_or_upload_documents(documents=[document])
+            search_client = self._make_search_client()
+            current_ids = {d["id"] for d in documents}
+            stale = [
+                {"id": r["id"]}
+                for r in search_client.search(search_text="*", filter=f"parent_id eq '{doc_id}'", select=["id"])
+                if r["id"] not in current_ids
+            ]
+            if stale:
+                search_client.delete_documents(documents=stale)
+            result = search_client.merge_or_upload_documents(documents=documents)
             for r in result:
                 if r.succeeded:
                     logger.info(f"티켓 매핑 저장 성공: {r.key}")
@@ -352,49 +554,144 @@ class AISearchTools:
             return f"Error saving ticket mapping: {str(e)}"
 
     def get_ticket_history(self,
-        top: Annotated[int, Field(description="반환할 최근 티켓 매핑 수 (기본값: 5)")] = 5
+        top: Annotated[int, Field(description="반환할 최근 티켓 매핑 수 (기본값: 5)")] = 5,
+        cursor: Annotated[int, Field(description="이어서 볼 위치. 이전 결과 마지막 줄 'more: cursor=N' 의 N (처음 조회는 0)")] = 0
     ) -> str:
         """
         최근 저장된 티켓 매핑 히스토리를 조회합니다.
-        created_at 기준 최신순으로 정렬하여 반환합니다.
-        기본 5개이며, 사용자 요청에 따라 더 많이 반환할 수 있습니다.
+        created_at 기준 최신순으로 생성일 / 링크 / 내용 앞부분 표를 반환합니다.
+        기본 5개이며, 사용자 요청에 따라 더 많이 반환할 수 있습니다. (결과가 길면 cursor 로 이어서 조회)
         """
-        logger.info(f"티켓 히스토리 조회: 최근 {top}개")
+        offset = parse_cursor(cursor)
+        logger.info(f"티켓 히스토리 조회: 최근 {top}개 (cursor={offset})")
         try:
             self._ensure_index_exists()
 
             results = self._make_search_client().search(
                 search_text="*",
+                filter="parent_id eq null",  # 청크 자식 문서 제외
                 select=["spec_ticket_link", "spec_ticket_content", "dev_ticket_link", "github_issue_link", "created_at"],
                 order_by=["created_at desc"],
                 top=top,
+                skip=offset,
                 include_total_count=True
             )
 
             items = []
             for result in results:
+                created = result.get("created_at")
                 items.append({
+                    "created": str(created)[:10] if created else None,
                     "spec_ticket_link": result.get("spec_ticket_link"),
-                    "spec_ticket_content": (result.get("spec_ticket_content") or "")[:100],
                     "dev_ticket_link": result.get("dev_ticket_link"),
                     "github_issue_link": result.get("github_issue_link"),
-                    "created_at": result.get("created_at"),
+                    "content": result.get("spec_ticket_content"),
                 })
 
-            if not items:
-                return "📭 저장된 티켓 매핑 히스토리가 없습니다."
-
-            total = results.get_count()
-            lines = [f"📋 최근 티켓 매핑 히스토리 ({len(items)}개 / 전체 {total}개):"]
-            for i, item in enumerate(items, 1):
-                created = item["created_at"] or "N/A"
-                lines.append(f"\n[{i}] 생성일: {created}")
-                lines.append(f"    사양 티켓: {item['spec_ticket_link']}")
-                lines.append(f"    내용 요약: {item['spec_ticket_content']}...")
-                lines.append(f"    개발 티켓: {item['dev_ticket_link']}")
-                lines.append(f"    GitHub 이슈: {item['github_issue_link']}")
-            return "\n".join(lines)
+            return render_records(
+                "티켓 매핑 히스토리", items,
+                [("created", None), ("spec_ticket_link", None), ("dev_ticket_link", None),
+                 ("github_issue_link", None), ("content", 60)],
+                budget_tokens=TOOL_BUDGETS["get_ticket_history"],
+                offset=offset, total=results.get_count(),
+                empty="저장된 티켓 매핑 히스토리가 없습니다." if not offset else None,
+            )
 
         except Exception as e:
             logger.error(f"히스토리 조회 실패: {str(e)}", exc_info=True)
             return f"Error retrieving ticket history: {str(e)}"
+
+    # ------------------------------------------------------------------ #
+    # 인덱스 버전 관리 - 새 버전 인덱스로 재임베딩 / 복사 후 alias 전환      #
+    # ------------------------------------------------------------------ #
+
+    def start_reindex(self, **kwargs) -> Future:
+        """reindex 를 백그라운드 스레드에서 실행합니다. (프로세스당 한 번에 하나, 결과는 Future 로)"""
+        return _reindex_executor.submit(self.reindex, **kwargs)
+
+    def reindex(self, re_embed: bool = True, drop_old: bool = True, workers: int = REINDEX_WORKERS) -> dict:
+        """
+        다음 버전 인덱스(sdd-tickets-vN)를 현재 스키마로 만들고, 기존 문서를 병렬 배치로 다시 임베딩(re_embed)
+        하거나 그대로 복사한 뒤 alias 를 새 인덱스로 바꿉니다. 복사 중 이전 인덱스에 저장된 매핑은 전환 직후
+        한 번 더 옮기고, drop_old 이면 이전 인덱스를 삭제합니다. 복사 중에도 읽기 / 쓰기는 alias 로 계속 동작합니다.
+
+        새 임베딩 배포 / 차원으로 옮길 때는 새 설정(환경 변수)으로 만든 인스턴스에서 실행하고,
+        alias 전환과 함께 질의 쪽 설정도 바꿉니다.
+        """
+        self._ensure_index_exists()
+        index_client = self._make_index_client()
+        old_index = self.current_index_name()
+        new_index = _next_index_name(index_client.list_index_names())
+        logger.info(f"reindex 시작: '{old_index}' → '{new_index}' (re_embed={re_embed}, workers={workers})")
+
+        self._create_index(index_client, new_index)
+        started_at = datetime.now(timezone.utc)
+        copied = self._copy_documents(old_index, new_index, re_embed, workers)
+        self._point_alias(index_client, new_index)
+        # 복사를 시작한 뒤 이전 인덱스에 저장된 매핑 (새 인덱스에 더 최신 문서가 있으면 건너뜀)
+        caught_up = self._copy_documents(old_index, new_index, re_embed, workers, since=started_at)
+
+        if drop_old:
+            index_client.delete_index(old_index)
+            logger.info(f"이전 인덱스 '{old_index}' 삭제")
+        logger.info(f"reindex 완료: 문서 {copied}개 복사, 전환 중 저장분 {caught_up}개 반영")
+        return {"old_index": old_index, "new_index": new_index, "copied": copied,
+                "caught_up": caught_up, "dropped_old": drop_old}
+
+    def _copy_documents(self, source_index: str, target_index: str, re_embed: bool, workers: int,
+                        since: datetime | None = None) -> int:
+        """source 인덱스 문서를 REINDEX_PAGE_SIZE 개씩 읽어 REINDEX_BATCH_SIZE 배치로 나눠 병렬 복사합니다."""
+        source = self._make_index_search_client(source_index)
+        target = self._make_index_search_client(target_index)
+        filters = []
+        if re_embed:
+            filters.append("parent_id eq null")  # 청크 자식 문서는 매핑 문서에서 다시 만듦
+        if since is not None:
+            filters.append(f"created_at ge {since.strftime('%Y-%m-%dT%H:%M:%SZ')}")
+
+        copied = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sdd-reindex-batch") as pool:
+            futures = []
+            offset = 0
+            while True:
+                page = [
+                    {k: v for k, v in doc.items() if not k.startswith("@")}
+                    for doc in source.search(search_text="*", filter=" and ".join(filters) or None,
+                                             order_by=["created_at asc"], top=REINDEX_PAGE_SIZE, skip=offset)
+                ]
+                for start in range(0, len(page), REINDEX_BATCH_SIZE):
+                    futures.append(pool.submit(self._copy_batch, page[start:start + REINDEX_BATCH_SIZE],
+                                               target, re_embed, since is not None))
+                if len(page) < REINDEX_PAGE_SIZE:
+                    break
+                offset += REINDEX_PAGE_SIZE
+            for future in futures:
+                copied += future.result()
+        return copied
+
+    def _copy_batch(self, docs: list[dict], target: SearchClient, re_embed: bool, skip_newer: bool) -> int:
+        """문서 배치 하나를 (다시 임베딩해) target 에 올리고 올린 매핑 수를 반환합니다."""
+        if skip_newer:
+            docs = [doc for doc in docs if not _has_newer(target, doc)]
+        if not docs:
+            return 0
+        if re_embed:
+            chunked = [chunk_text(_preprocess_text(doc.get("spec_ticket_content"))) for doc in docs]
+            flat = [chunk for chunks in chunked for chunk in chunks]
+            vectors = []
+            for start in range(0, len(flat), EMBED_BATCH_SIZE):
+                vectors.extend(self._embed_many(flat[start:start + EMBED_BATCH_SIZE]))
+            documents = []
+            for doc, chunks in zip(docs, chunked):
+                mapping = {k: doc.get(k) for k in ("spec_ticket_link", "spec_ticket_content", "dev_ticket_link",
+                                                   "github_issue_link", "created_at")}
+                documents += self._mapping_documents(mapping, chunks, vectors[:len(chunks)])
+                vectors = vectors[len(chunks):]
+        else:
+            documents = docs
+
+        failed = [r.error_message for r in target.upload_documents(documents=documents) if not r.succeeded]
+        if failed:
+            raise RuntimeError(f"reindex 업로드 실패 {len(failed)}건: {failed[0]}")
+        return len(docs)
+
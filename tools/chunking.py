@@ -0,0 +1,50 @@
+"""
+Chunking - 긴 사양 티켓을 겹치는 구간으로 나눔 (청크별 임베딩 / max-sim 매칭용)
+
+임베딩 모델은 긴 입력의 뒷부분 세부 내용을 잘 반영하지 못하고, 한 번의 큰 요청은 느립니다.
+CHUNK_MAX_CHARS 보다 긴 텍스트는 단락 / 줄 / 문장 경계에서 나누고, 경계의 문맥이 끊기지 않도록
+이웃 청크와 CHUNK_OVERLAP_CHARS 만큼 겹치게 합니다. 짧은 텍스트는 청크 1개 (원문 그대로) 입니다.
+
+    chunks = chunk_text(spec_description)          # 저장: 청크마다 자식 문서
+    query_chunks = spread(chunks, MAX_QUERY_CHUNKS)  # 검색: 질의 벡터 수 제한
+"""
+
+CHUNK_MAX_CHARS = 1500
+CHUNK_OVERLAP_CHARS = 200
+# 청크를 자를 경계 (앞에 있는 것을 우선)
+_SEPARATORS = ("\n\n", "\n", ". ", "다. ", " ")
+
+
+def chunk_text(text: str, max_chars: int = CHUNK_MAX_CHARS, overlap: int = CHUNK_OVERLAP_CHARS) -> list[str]:
+    """text 를 max_chars 이하의 겹치는 청크로 나눕니다."""
+    if len(text) <= max_chars:
+        return [text]
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + max_chars, len(text))
+        if end < len(text):
+            # 청크 뒤쪽 절반에서 가장 자연스러운 경계를 찾음 (없으면 max_chars 에서 자름)
+            for separator in _SEPARATORS:
+                cut = text.rfind(separator, start + max_chars // 2, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+def spread(items: list, limit: int) -> list:
+    """items 가 limit 개를 넘으면 처음과 끝을 포함해 고르게 limit 개를 고릅니다."""
+    if len(items) <= limit:
+        return items
+    if limit == 1:
+        return items[:1]
+    step = (len(items) - 1) / (limit - 1)
+    return [items[round(i * step)] for i in range(limit)]
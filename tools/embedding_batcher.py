@@ -0,0 +1,112 @@
+"""
+Embedding Batcher - 동시에 들어온 임베딩 요청을 모아 한 번의 embeddings.create(input=[...]) 로 보냄
+
+여러 AG-UI 세션이 동시에 SDD 파이프라인을 실행하면 각 스레드가 텍스트 1개씩 임베딩 API 를 호출합니다.
+EmbeddingBatcher 는 첫 요청이 들어온 뒤 max_wait_ms 동안 (또는 max_batch 개가 찰 때까지) 요청을 모아
+한 번에 보내고, 결과 벡터를 기다리던 호출자에게 나눠 줍니다. 같은 텍스트는 한 번만 보냅니다.
+
+- 별도 스레드 없이 각 묶음의 첫 호출자가 대기 후 API 를 호출합니다. (나머지는 결과만 기다림)
+- API 실패는 같은 묶음의 모든 호출자에게 같은 예외로 전달되며, 재시도는 호출자(AISearchTools)가 합니다.
+- 도구 인스턴스는 pickle 되므로 batcher 는 모듈 수준 레지스트리(get_batcher)에 둡니다.
+  batcher 는 처음 만든 호출자의 embed_many 를 계속 쓰므로, 키에는 그 함수가 쓰는 클라이언트 설정
+  (엔드포인트 / 배포 / API 버전 / 차원 / 키 지문) 을 모두 넣어 설정이 다른 인스턴스가 섞이지 않게 합니다.
+
+    batcher = get_batcher((endpoint, deployment, api_version, key_fingerprint), embed_many)
+    vector = batcher.embed("사양 티켓 내용")
+"""
+
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH = 16
+DEFAULT_MAX_WAIT_MS = 10
+# 묶음을 보낸 호출자가 응답 없이 멈춰도 기다리는 쪽이 영원히 막히지 않도록
+RESULT_TIMEOUT_SECONDS = 120
+
+EmbedMany = Callable[[list[str]], list[list[float]]]
+
+
+class _Batch:
+    def __init__(self):
+        self.items: list[tuple[str, Future]] = []
+        self.full = threading.Event()
+
+
+class EmbeddingBatcher:
+    def __init__(self, embed_many: EmbedMany,
+                 max_batch: int = DEFAULT_MAX_BATCH,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.embed_many = embed_many
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._current: _Batch | None = None
+        self._lock = threading.Lock()
+        # 보낸 API 호출 수 / 요청 수 (측정용)
+        self.calls = 0
+        self.requests = 0
+
+    def embed(self, text: str) -> list[float]:
+        """text 의 임베딩을 반환합니다. 동시에 들어온 다른 요청과 한 번의 API 호출로 묶일 수 있습니다."""
+        future: Future = Future()
+        with self._lock:
+            self.requests += 1
+            batch = self._current
+            leader = batch is None or len(batch.items) >= self.max_batch
+            if leader:
+                batch = self._current = _Batch()
+            batch.items.append((text, future))
+            if len(batch.items) >= self.max_batch:
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.max_wait_ms / 1000)
+            with self._lock:
+                if self._current is batch:
+                    self._current = None
+            self._flush(batch)
+        return future.result(timeout=RESULT_TIMEOUT_SECONDS)
+
+    def _flush(self, batch: _Batch):
+        texts = list(dict.fromkeys(text for text, _ in batch.items))
+        vectors: dict[str, list[float]] = {}
+        error: Exception | None = None
+        try:
+            result = self.embed_many(texts)
+            if len(result) != len(texts):
+                raise ValueError(f"임베딩 응답 수가 입력과 다릅니다 (입력 {len(texts)}개, 응답 {len(result)}개)")
+            vectors = dict(zip(texts, result))
+            with self._lock:
+                self.calls += 1
+            if len(batch.items) > 1:
+                logger.debug(f"임베딩 요청 {len(batch.items)}개를 1회 호출로 처리 (고유 텍스트 {len(texts)}개)")
+        except Exception as e:
+            error = e
+        finally:
+            # 어떤 경우에도 묶음의 모든 호출자를 깨움 (결과가 없으면 예외로)
+            for text, future in batch.items:
+                if future.done():
+                    continue
+                if error is None and text in vectors:
+                    future.set_result(vectors[text])
+                else:
+                    future.set_exception(error or RuntimeError("임베딩 결과를 받지 못했습니다."))
+
+
+_batchers: dict[Hashable, EmbeddingBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(key: Hashable, embed_many: EmbedMany, **kwargs) -> EmbeddingBatcher:
+    """
+    key 별로 하나의 batcher 를 공유합니다. (처음 만들 때의 embed_many / 설정을 사용)
+    key 는 embed_many 의 동작을 결정하는 설정(엔드포인트, 자격 증명 등)을 모두 포함해야 합니다.
+    """
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = _batchers[key] = EmbeddingBatcher(embed_many, **kwargs)
+        return batcher
@@ -3,15 +3,47 @@ import os
 from typing import Annotated, Optional
 from pydantic import Field
 
-class GitHubAutomationTools:
+from tools.instrumentation import instrument_tools
+from tools.tool_state import PicklableTools
+from tools.resilience import GuardedProxy, endpoint_guard
+
+# GitHub REST API 클라이언트 측 속도 제한 (secondary rate limit 회피)
+GITHUB_RATE_PER_SECOND = 5
+GITHUB_BURST = 10
+
+# Copilot 에이전트를 트리거하는 라벨
+COPILOT_LABEL = "copilot-issue-solver"
+
+@instrument_tools
+class GitHubAutomationTools(PicklableTools):
+    # pickle 시 클라이언트 / 레포지토리 객체는 빼고 토큰과 레포 이름만 저장
+    _transient_attrs = ("_client", "_repo")
+
     def __init__(self):
         # 환경 변수에서 설정 로드
         self.token = os.getenv("GITHUB_TOKEN")
         self.repo_name = os.getenv("GITHUB_REPO_NAME") # 예: "owner/repo"
+        # GitHub Enterprise 또는 로컬 대역 사용 시 API 주소 변경
+        self.base_url = os.getenv("GITHUB_BASE_URL", "https://api.github.com")
         
-        # GitHub 클라이언트 및 레포지토리 초기화
-        self.client = Github(self.token)
-        self.repo = self.client.get_repo(self.repo_name)
+        # GitHub 클라이언트 및 레포지토리는 실제 호출될 때 생성 (get_repo 는 API 호출)
+        self._client = None
+        self._repo = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = Github(self.token, base_url=self.base_url)
+        return self._client
+
+    @property
+    def repo(self):
+        # 레포지토리 메서드 호출이 공용 속도 제한 / 재시도 / 서킷 브레이커를 거치도록 (tools/resilience.py)
+        # get_* 조회만 재시도하고 create_issue 등은 429 / 전송 전 연결 실패만 재시도 (중복 이슈 방지)
+        if self._repo is None:
+            guard = endpoint_guard(f"github:{self.base_url}", rate_per_second=GITHUB_RATE_PER_SECOND, burst=GITHUB_BURST)
+            self._repo = GuardedProxy(guard.call(self.client.get_repo, self.repo_name), guard)
+        return self._repo
 
     def create_github_issue(self,
         title: Annotated[str, Field(description="Title of the GitHub issue for the Copilot agent")],
@@ -19,10 +51,19 @@ class GitHubAutomationTools:
         trigger_copilot: bool = True # 명칭을 trigger로 변경
     ) -> str:
         """이슈를 생성하고 전용 라벨을 부착하여 Copilot 에이전트를 트리거합니다."""
+        issue = self.open_issue(title, body, trigger_copilot)
+        return f"Successfully created GitHub issue #{issue['number']} with Copilot trigger. URL: {issue['url']}"
+
+    def open_issue(self, title: str, body: str, trigger_copilot: bool = True, label_now: bool = True) -> dict:
+        """
+        create_github_issue 의 구조화 버전 (코드 경로용). number / url 을 dict 로 반환합니다.
+        label_now=False 면 Copilot 작업 지시문만 넣고 라벨은 붙이지 않습니다.
+        (다른 작업이 모두 성공한 뒤 add_copilot_label 로 트리거)
+        """
         # try:
             # 1. Copilot 에이전트를 호출하기 위한 라벨 정의
             # 공식 문서 및 최신 워크플로우에서는 특정 라벨을 사용합니다.
-        labels = ["copilot-issue-solver"] if trigger_copilot else []
+        labels = [COPILOT_LABEL] if trigger_copilot and label_now else []
 
         # 개발 관련 이슈인 경우 Copilot 작업 지시문 추가
         if trigger_copilot:
@@ -43,9 +84,17 @@ class GitHubAutomationTools:
             # (선택 사항) 만약 조직 설정상 꼭 Assignee가 필요하다면 
             # 실제 설치된 앱의 봇 이름(예: 'github-copilot[bot]')을 찾아 넣어야 합니다.
             
-        return f"Successfully created GitHub issue #{issue.number} with Copilot trigger. URL: {issue.html_url}"
+        return {"number": issue.number, "url": issue.html_url}
         # except Exception as e:
         #     return f"Error creating GitHub issue: {str(e)}"
+
+    def add_copilot_label(self, issue_number: int):
+        """label_now=False 로 만든 이슈에 Copilot 라벨을 붙여 에이전트를 트리거합니다."""
+        self.repo.get_issue(issue_number).add_to_labels(COPILOT_LABEL)
+
+    def close_issue(self, issue_number: int, state_reason: str = "not_planned"):
+        """이슈를 닫습니다. GitHub 이슈는 API 로 삭제할 수 없으므로 부분 실패 시 보상 처리는 close 로 대신합니다."""
+        self.repo.get_issue(issue_number).edit(state="closed", state_reason=state_reason)
         
         
     def add_pr_comment(self,
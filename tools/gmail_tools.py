@@ -5,51 +5,72 @@ from datetime import datetime
 from typing import Annotated
 from pydantic import Field
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
-class GmailAutomationTools:
-    def __init__(self):
+from tools.google_credential_store import get_credentials
+from tools.instrumentation import instrument_tools
+from tools.mail_body import BodyReader, body_cache, iter_text_parts, part_charset
+from tools.output_format import TOOL_BUDGETS, parse_cursor, render_records
+from tools.tool_state import PicklableTools, ThreadLocalClient
+from tools.resilience import endpoint_guard, guarded_request_builder
+
+# get_emails_received_today 한 번에 조회하는 최대 메일 수 (실제 출력은 토큰 예산 안에서 더 줄 수 있음)
+TODAY_EMAILS_PAGE_SIZE = 20
+# Gmail API 클라이언트 측 속도 제한 (사용자당 초당 250 quota unit, messages.get = 5 unit)
+GMAIL_RATE_PER_SECOND = 20
+GMAIL_BURST = 40
+# get_email_body 가 디코딩하는 본문 최대 바이트 (이후는 잘라냄)
+# 디코딩 상한일 뿐 전송량 상한은 아님: messages.get 응답에는 인라인 파트의 data 가 모두 들어 있음
+EMAIL_BODY_MAX_BYTES = 12_000
+# 본문 조회용 부분 응답: payload 파트 트리 전체 (snippet / labelIds 등 목록용 필드는 제외)
+# 파트 단위로 필드를 고르면 중첩 깊이만큼 mask 를 써야 해서, 전달된 메일(message/rfc822)처럼 깊은 트리의 텍스트를 놓침.
+# 첨부와 큰 파트의 바이트는 원래 body.attachmentId 로만 오므로 payload 전체를 받아도 첨부는 내려받지 않음
+EMAIL_BODY_FIELDS = "id,payload"
+
+@instrument_tools
+class GmailAutomationTools(PicklableTools):
+    # pickle 시 service 는 빼고 경로 설정만 저장 (복원 후 첫 사용 때 다시 인증)
+    _transient_attrs = ("_service", "_thread_services")
+
+    def __init__(self, service=None):
         # 1. 환경 변수에서 경로 로드
         self.cred_path = os.getenv("GOOGLE_CREDENTIALS_PATH")
         self.token_path = os.getenv("GMAIL_TOKEN_PATH")
+        self.scopes = ["https://www.googleapis.com/auth/gmail.modify"]
+        self._thread_services: ThreadLocalClient | None = None
+
+        # service 를 직접 주입하면 인증을 건너뜁니다. (테스트 / 벤치마크의 로컬 대역용)
+        self._service = service
+        if service is not None:
+            return
         
         # 경로 설정 확인 (에러 방지)
         if not self.cred_path or not self.token_path:
             raise ValueError("환경 변수 'GOOGLE_CREDENTIALS_PATH' 또는 'GMAIL_TOKEN_PATH'가 설정되지 않았습니다.")
-            
-        self.scopes = ["https://www.googleapis.com/auth/gmail.modify"]
         
-        # 2. Gmail 서비스 초기화
-        self.service = self._authenticate()
+        # 2. Gmail 서비스 초기화 (생성한 스레드의 service 를 미리 만들어 설정 / 토큰 문제를 바로 드러냄)
+        self.service
+
+    @property
+    def service(self):
+        # 주입된 대역은 그대로 사용
+        if self._service is not None:
+            return self._service
+        # httplib2 는 스레드 안전하지 않으므로 스레드마다 service 를 따로 만듦 (자격 증명은 공용 저장소에서 공유)
+        # pickle 복원 후에는 첫 사용 시 다시 만듦 (토큰은 공용 저장소에서 읽으므로 OAuth 동의 흐름은 반복되지 않음)
+        if self._thread_services is None:
+            self._thread_services = ThreadLocalClient(self._authenticate)
+        return self._thread_services.get()
 
     def _authenticate(self):
         """환경 변수 경로를 사용하여 Google 서비스 객체를 생성합니다."""
-        creds = None
+        # 토큰 갱신/저장은 공용 저장소가 잠금과 함께 처리 (동시 워커 간 중복 갱신 방지)
+        creds = get_credentials(self.token_path, self.cred_path, self.scopes)
         
-        # token.json 확인
-        if os.path.exists(self.token_path):
-            creds = Credentials.from_authorized_user_file(self.token_path, self.scopes)
-        
-        # 인증 정보가 없거나 만료된 경우
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists(self.cred_path):
-                    raise FileNotFoundError(f"Credentials 파일이 없습니다: {self.cred_path}")
-                
-                flow = InstalledAppFlow.from_client_secrets_file(self.cred_path, self.scopes)
-                creds = flow.run_local_server(port=0)
-            
-            # 갱신된 토큰 저장
-            with open(self.token_path, "w") as token:
-                token.write(creds.to_json())
-        
-        return build("gmail", "v1", credentials=creds)
+        # 모든 execute() 가 공용 속도 제한 / 재시도 / 서킷 브레이커를 거치도록 (tools/resilience.py)
+        guard = endpoint_guard("gmail", rate_per_second=GMAIL_RATE_PER_SECOND, burst=GMAIL_BURST)
+        return build("gmail", "v1", credentials=creds, requestBuilder=guarded_request_builder(guard))
 
     def get_unread_email_titles(self) -> str:
         """가장 최근의 확인하지 않은(읽지 않은) 메일들의 제목 목록을 최대 10개 가져옵니다."""
@@ -71,29 +92,98 @@ class GmailAutomationTools:
         except Exception as e:
             return f"메일 제목 호출 중 오류 발생: {str(e)}"
 
-    def get_emails_received_today(self) -> str:
-        """오늘 수신된 모든 메일의 제목과 요약 내용을 가져옵니다."""
+    def get_emails_received_today(self,
+        cursor: Annotated[int, Field(description="이어서 볼 위치. 이전 결과 마지막 줄 'more: cursor=N' 의 N (처음 조회는 0)")] = 0
+    ) -> str:
+        """오늘 수신된 메일을 ID / 시각 / 발신자 / 제목 / 요약 표로 가져옵니다. 한 번에 최대 20건이며, 더 있으면 cursor 를 알려줍니다."""
         try:
             today = datetime.now().strftime('%Y/%m/%d')
             query = f"after:{today}"
-            results = self.service.users().messages().list(userId='me', q=query).execute()
-            messages = results.get('messages', [])
-            
-            if not messages:
-                return f"{today} 오늘 수신된 메일이 없습니다."
-            
-            output = [f"--- {today} 수신 메일 리스트 ---"]
-            for msg in messages:
-                full_msg = self.service.users().messages().get(userId='me', id=msg['id']).execute()
-                headers = full_msg.get('payload', {}).get('headers', [])
-                subject = next((h['value'] for h in headers if h['name'] == 'Subject'), "제목 없음")
-                snippet = full_msg.get('snippet', '')
-                output.append(f"제목: {subject}\n요약: {snippet}\n")
-            
-            return "\n".join(output)
+            # 전체 건수를 알기 위해 ID 만 먼저 조회 (본문은 보여줄 구간만 metadata 로 조회)
+            ids, page_token = [], None
+            while True:
+                results = self.service.users().messages().list(
+                    userId='me', q=query, maxResults=500, pageToken=page_token
+                ).execute()
+                ids.extend(msg['id'] for msg in results.get('messages', []))
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+
+            offset = parse_cursor(cursor)
+            records = []
+            for msg_id in ids[offset:offset + TODAY_EMAILS_PAGE_SIZE]:
+                msg = self.service.users().messages().get(
+                    userId='me', id=msg_id, format='metadata', metadataHeaders=['Subject', 'From']
+                ).execute()
+                headers = msg.get('payload', {}).get('headers', [])
+                received = datetime.fromtimestamp(int(msg.get('internalDate', 0)) / 1000)
+                records.append({
+                    "id": msg_id,
+                    "time": received.strftime('%H:%M'),
+                    "from": next((h['value'] for h in headers if h['name'] == 'From'), None),
+                    "subject": next((h['value'] for h in headers if h['name'] == 'Subject'), "제목 없음"),
+                    "snippet": msg.get('snippet'),
+                })
+
+            return render_records(
+                f"{today} 수신 메일", records,
+                [("id", None), ("time", None), ("from", 40), ("subject", 80), ("snippet", 100)],
+                budget_tokens=TOOL_BUDGETS["get_emails_received_today"],
+                offset=offset, total=len(ids),
+                empty=f"{today} 오늘 수신된 메일이 없습니다." if not ids else None,
+            )
         except Exception as e:
             return f"오늘 메일 호출 중 오류 발생: {str(e)}"
 
+    def get_email_body(self,
+        message_id: Annotated[str, Field(description="본문을 읽을 메일 ID (get_emails_received_today 결과의 id)")]
+    ) -> str:
+        """
+        메일 본문을 텍스트로 가져옵니다. 첨부 파일은 받지 않고, HTML 메일은 텍스트로 바꾸며, 긴 본문은 앞부분만 반환합니다.
+        EMAIL_BODY_MAX_BYTES 는 디코딩 예산입니다. 인라인 파트는 messages.get 응답으로 한 번에 받고,
+        attachmentId 로 분리된 큰 텍스트 파트만 예산이 남아 있을 때 따로 받습니다.
+        """
+        cache_key = (self.token_path, message_id)
+        cached = body_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            msg = self.service.users().messages().get(
+                userId='me', id=message_id, format='full', fields=EMAIL_BODY_FIELDS
+            ).execute()
+            payload = msg.get('payload', {})
+            headers = payload.get('headers', [])
+
+            reader = BodyReader(EMAIL_BODY_MAX_BYTES)
+            for part in iter_text_parts(payload):
+                if reader.exhausted:
+                    reader.truncated = True
+                    break
+                body = part.get('body', {})
+                data = body.get('data')
+                if data is None and body.get('attachmentId'):
+                    # 크기 때문에 분리된 텍스트 파트만 partId 별로 따로 받음
+                    data = self.service.users().messages().attachments().get(
+                        userId='me', messageId=message_id, id=body['attachmentId']
+                    ).execute().get('data')
+                reader.feed(data or "", part_charset(part), html=part.get('mimeType') == 'text/html')
+
+            lines = [
+                f"제목: {next((h['value'] for h in headers if h['name'] == 'Subject'), '제목 없음')}",
+                f"보낸 사람: {next((h['value'] for h in headers if h['name'] == 'From'), '-')}",
+                f"날짜: {next((h['value'] for h in headers if h['name'] == 'Date'), '-')}",
+                "",
+                reader.text() or "(본문 없음)",
+            ]
+            if reader.truncated:
+                lines.append(f"... (본문이 길어 앞 {EMAIL_BODY_MAX_BYTES} bytes 만 표시)")
+            text = "\n".join(lines)
+            body_cache.put(cache_key, text)
+            return text
+        except Exception as e:
+            return f"메일 본문 조회 중 오류 발생: {str(e)}"
+
     def get_recent_emails(self, 
         count: Annotated[int, Field(description="조회할 최근 메일의 개수")] = 5
     ) -> str:
@@ -0,0 +1,185 @@
+"""
+Google OAuth 토큰 저장소
+Gmail / Google Tasks 도구가 공유하는 자격 증명(Credentials) 관리 모듈입니다.
+
+- 프로세스 단위로 토큰 파일(token_path)당 하나의 Credentials 객체를 공유합니다.
+- 토큰 갱신은 single-flight 로 수행합니다.
+  (스레드 간: threading.Lock / 프로세스 간: 토큰 파일 옆의 .lock 파일 잠금)
+- 잠금을 얻은 뒤 디스크의 토큰을 다시 읽어, 다른 워커가 이미 갱신했다면 재사용합니다.
+- 서비스가 오래 쥐고 있는 Credentials 는 StoredCredentials 이므로, 요청 도중 google-auth transport 가
+  만료를 감지해 부르는 refresh() (before_request / 401 재시도) 도 같은 잠금을 잡고 갱신 결과를 디스크에 저장합니다.
+- 토큰 파일은 임시 파일에 쓴 뒤 os.replace 로 교체하여(atomic write-rename) 손상을 방지합니다.
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+# (토큰 경로, scopes) -> Credentials
+_credentials_cache: dict[tuple[str, tuple[str, ...]], "StoredCredentials"] = {}
+# 토큰 경로 -> 스레드 잠금
+_path_locks: dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def _thread_lock_for(token_path: str) -> threading.Lock:
+    with _registry_lock:
+        lock = _path_locks.get(token_path)
+        if lock is None:
+            lock = threading.Lock()
+            _path_locks[token_path] = lock
+        return lock
+
+
+@contextmanager
+def _file_lock(token_path: str):
+    """토큰 파일 옆의 .lock 파일로 프로세스 간 배타 잠금을 잡습니다."""
+    lock_path = f"{token_path}.lock"
+    directory = os.path.dirname(lock_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(lock_path, "a+b") as lock_file:
+        if os.name == "nt":
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _write_token_atomic(token_path: str, creds: Credentials) -> None:
+    """임시 파일에 기록한 뒤 os.replace 로 교체합니다. (부분 기록된 토큰 파일 방지)"""
+    directory = os.path.dirname(os.path.abspath(token_path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".token-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as tmp:
+            tmp.write(creds.to_json())
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_path, token_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class StoredCredentials(Credentials):
+    """토큰 파일에 연결된 Credentials. 어디서 refresh() 가 불려도 저장소의 잠금 / 디스크 재확인 / 저장을 거칩니다."""
+
+    def __init__(self, *args, token_path: str | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._token_path = token_path
+
+    def __setstate__(self, d):
+        super().__setstate__(d)
+        self._token_path = d.get("_token_path")
+
+    def refresh(self, request):
+        if not self._token_path:
+            return super().refresh(request)
+        stale_token = self.token
+        with _thread_lock_for(self._token_path):
+            # 잠금 대기 중 같은 객체를 다른 스레드가 이미 갱신
+            if self.token != stale_token:
+                return
+            with _file_lock(self._token_path):
+                self._refresh_locked(request, stale_token)
+
+    def _refresh_locked(self, request, stale_token: str | None):
+        """두 잠금을 잡은 상태에서: 다른 워커가 저장한 새 토큰이 있으면 쓰고, 없으면 갱신 후 저장합니다."""
+        disk_creds = _load_from_disk(self._token_path, self.scopes)
+        if disk_creds is not None and disk_creds.valid and disk_creds.token != stale_token:
+            logger.info(f"다른 워커가 갱신한 토큰 재사용: {self._token_path}")
+            self.token = disk_creds.token
+            self.expiry = disk_creds.expiry
+            return
+        logger.info(f"Google 토큰 갱신: {self._token_path}")
+        super().refresh(request)
+        _write_token_atomic(self._token_path, self)
+
+
+def _load_from_disk(token_path: str, scopes: list[str]) -> StoredCredentials | None:
+    if not os.path.exists(token_path):
+        return None
+    creds = StoredCredentials.from_authorized_user_file(token_path, scopes)
+    creds._token_path = token_path
+    return creds
+
+
+def get_credentials(token_path: str, cred_path: str | None, scopes: list[str]) -> StoredCredentials:
+    """
+    유효한 Credentials 를 반환합니다.
+
+    이미 프로세스 내에 유효한 객체가 있으면 잠금 없이 그대로 반환하고,
+    만료된 경우에만 잠금을 잡고 갱신(또는 최초 인증)을 수행합니다.
+    """
+    token_path = os.path.abspath(token_path)
+    key = (token_path, tuple(scopes))
+
+    creds = _credentials_cache.get(key)
+    if creds is not None and creds.valid:
+        return creds
+
+    with _thread_lock_for(token_path):
+        # 잠금 대기 중 다른 스레드가 갱신을 마쳤을 수 있음
+        creds = _credentials_cache.get(key)
+        if creds is not None and creds.valid:
+            return creds
+
+        with _file_lock(token_path):
+            # 다른 프로세스가 이미 갱신해서 저장했을 수 있으므로 디스크를 다시 확인
+            disk_creds = _load_from_disk(token_path, scopes)
+            if disk_creds is not None and disk_creds.valid:
+                logger.info(f"다른 워커가 갱신한 토큰 재사용: {token_path}")
+                if creds is None:
+                    _credentials_cache[key] = disk_creds
+                    return disk_creds
+                # 이미 서비스에 주입된 객체를 유지하기 위해 토큰 값만 교체
+                creds.token = disk_creds.token
+                creds.expiry = disk_creds.expiry
+                return creds
+
+            creds = creds or disk_creds
+            if creds and creds.expired and creds.refresh_token:
+                # 잠금은 이미 잡았으므로 갱신 + 저장만
+                creds._refresh_locked(Request(), creds.token)
+            else:
+                if not cred_path or not os.path.exists(cred_path):
+                    raise FileNotFoundError(f"Credentials 파일이 없습니다: {cred_path}")
+                flow = InstalledAppFlow.from_client_secrets_file(cred_path, scopes)
+                info = json.loads(flow.run_local_server(port=0).to_json())
+                creds = StoredCredentials.from_authorized_user_info(info, scopes)
+                creds._token_path = token_path
+                # 새로 받은 토큰 저장
+                _write_token_atomic(token_path, creds)
+
+            _credentials_cache[key] = creds
+            return creds
+
+
+def clear_cache() -> None:
+    """프로세스 내 공유 Credentials 캐시를 비웁니다. (테스트 / 토큰 교체 시)"""
+    with _registry_lock:
+        _credentials_cache.clear()
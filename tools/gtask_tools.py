@@ -1,46 +1,204 @@
 import os
-from datetime import datetime
+import re
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
 from typing import Annotated, Optional
-from pydantic import Field
+from pydantic import BaseModel, Field
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
-class GoogleTasksAutomationTools:
-    def __init__(self):
+from tools.google_credential_store import get_credentials
+from tools.instrumentation import instrument_tools
+from tools.tool_state import PicklableTools, ThreadLocalClient
+from tools.resilience import endpoint_guard, guarded_request_builder
+
+# tasks.list 한 페이지 최대 크기 (API 상한 100)
+LIST_PAGE_SIZE = 100
+# 배치 요청 1회에 묶는 최대 요청 수 (Google 권장 50개 이하)
+BATCH_CHUNK_SIZE = 50
+# 목록 조회 시 필요한 필드만 받도록 응답을 축소
+TASK_LIST_FIELDS = "nextPageToken,items(id,title,notes,due,status,updated,deleted)"
+# 증분 동기화 시 서버/클라이언트 시계 차이를 흡수하기 위한 여유 시간
+INDEX_SYNC_SKEW = timedelta(minutes=1)
+# Tasks API 클라이언트 측 속도 제한
+GTASKS_RATE_PER_SECOND = 10
+GTASKS_BURST = 20
+
+
+def _tasks_guard():
+    return endpoint_guard("google-tasks", rate_per_second=GTASKS_RATE_PER_SECOND, burst=GTASKS_BURST)
+
+
+def _normalize_title(title: str) -> str:
+    """중복 비교용 제목 정규화 (대소문자/공백 차이 무시)"""
+    return re.sub(r"\s+", " ", (title or "").strip()).lower()
+
+
+def _notes_hash(notes: Optional[str]) -> str:
+    """메모 내용 비교용 해시 (공백 차이 무시)"""
+    normalized = re.sub(r"\s+", " ", (notes or "").strip())
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+class TaskItem(BaseModel):
+    title: str = Field(description="추가할 할 일의 제목")
+    notes: Optional[str] = Field(default=None, description="할 일에 대한 상세 설명(메모)")
+    due_date: Optional[str] = Field(default=None, description="마감 기한 (형식: YYYY-MM-DD)")
+
+
+@instrument_tools
+class GoogleTasksAutomationTools(PicklableTools):
+    # pickle 시 service 와 중복 검사 인덱스는 빼고 경로 설정만 저장 (인덱스는 다음 사용 때 전체 조회로 재구성)
+    _transient_attrs = ("_service", "_thread_services", "_index_lock", "_task_index", "_task_keys", "_index_synced_at")
+
+    def __init__(self, service=None):
         # 1. 환경 변수에서 경로 로드 (Gmail과 같은 credentials를 쓰되, 토큰은 별도 관리를 권장합니다)
         self.cred_path = os.getenv("GOOGLE_CREDENTIALS_PATH")
         self.token_path = os.getenv("GTASK_TOKEN_PATH")
 
-        # 경로 설정 확인 (에러 방지)
-        if not self.token_path:
-            raise ValueError("환경 변수 'GTASK_TOKEN_PATH'가 설정되지 않았습니다.")
-            
         # Google Tasks 관리 권한 설정
         self.scopes = ["https://www.googleapis.com/auth/tasks"]
-        
-        # 2. Tasks 서비스 초기화
-        self.service = self._authenticate()
+
+        # service 를 직접 주입하면 인증을 건너뜁니다. (테스트 / 벤치마크의 로컬 대역용)
+        self._service = service
+        self._thread_services: ThreadLocalClient | None = None
+        if service is None:
+            # 경로 설정 확인 (에러 방지)
+            if not self.token_path:
+                raise ValueError("환경 변수 'GTASK_TOKEN_PATH'가 설정되지 않았습니다.")
+
+            # 2. Tasks 서비스 초기화 (생성한 스레드의 service 를 미리 만듦)
+            self.service
+
+        # 중복 검사용 미완료 할 일 인덱스 (정규화 제목 -> {할 일 ID: {id, notes, notes_hash}})
+        # 같은 제목의 미완료 할 일이 여럿일 수 있으므로 키마다 할 일 ID 별로 보관하고, 모두 빠졌을 때만 키를 지움
+        # 최초 사용 시 전체 조회로 구성하고, 이후에는 updatedMin 으로 변경분만 반영
+        self._task_index: dict[str, dict[str, dict]] | None = None
+        # 할 일 ID -> 인덱스 키 (제목이 바뀐 할 일의 이전 키를 지우기 위한 역방향 맵)
+        self._task_keys: dict[str, str] = {}
+        self._index_synced_at: str | None = None
+        # 중복 검사(인덱스 조회)와 등록 사이에 다른 스레드의 등록이 끼어들지 않도록 (이 인스턴스의 쓰기 도구만 직렬화)
+        self._index_lock = threading.RLock()
+
+    @property
+    def service(self):
+        # 주입된 대역은 그대로 사용
+        if self._service is not None:
+            return self._service
+        # httplib2 는 스레드 안전하지 않으므로 스레드마다 service 를 따로 만듦. pickle 복원 후에는 첫 사용 시 다시 만듦
+        if self._thread_services is None:
+            self._thread_services = ThreadLocalClient(self._authenticate)
+        return self._thread_services.get()
+
+    @property
+    def index_lock(self):
+        if self._index_lock is None:
+            self._index_lock = threading.RLock()
+        return self._index_lock
 
     def _authenticate(self):
         """환경 변수 경로를 사용하여 Tasks 서비스 객체를 생성합니다."""
-        creds = None
-        if os.path.exists(self.token_path):
-            creds = Credentials.from_authorized_user_file(self.token_path, self.scopes)
-        
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file(self.cred_path, self.scopes)
-                creds = flow.run_local_server(port=0)
-            
-            with open(self.token_path, "w") as token:
-                token.write(creds.to_json())
+        # 토큰 갱신/저장은 공용 저장소가 잠금과 함께 처리 (동시 워커 간 중복 갱신 방지)
+        creds = get_credentials(self.token_path, self.cred_path, self.scopes)
         
-        return build("tasks", "v1", credentials=creds)
+        # 모든 execute() 가 공용 속도 제한 / 재시도 / 서킷 브레이커를 거치도록 (tools/resilience.py)
+        return build("tasks", "v1", credentials=creds, requestBuilder=guarded_request_builder(_tasks_guard()))
+
+    @staticmethod
+    def _build_task_body(title: str, notes: Optional[str] = None, due_date: Optional[str] = None) -> dict:
+        """할 일 객체를 구성합니다. 마감일이 있으면 RFC 3339 형식으로 변환하여 추가합니다."""
+        task_body = {
+            "title": title,
+            "notes": notes
+        }
+        if due_date:
+            task_body["due"] = f"{due_date}T00:00:00Z"
+        return task_body
+
+    def _iter_tasks(self, show_completed: bool = False, limit: Optional[int] = None, **filters):
+        """nextPageToken 을 따라가며 기본 목록의 할 일을 모두(또는 limit개까지) 순회합니다."""
+        if limit is not None and limit <= 0:
+            return
+        page_token = None
+        fetched = 0
+        while True:
+            page_size = LIST_PAGE_SIZE if limit is None else min(LIST_PAGE_SIZE, limit - fetched)
+            results = self.service.tasks().list(
+                tasklist='@default',
+                maxResults=page_size,
+                showCompleted=show_completed,
+                pageToken=page_token,
+                fields=TASK_LIST_FIELDS,
+                **filters,
+            ).execute()
+
+            for item in results.get('items', []):
+                yield item
+                fetched += 1
+                if limit is not None and fetched >= limit:
+                    return
+
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return
+
+    def _index_task(self, task: dict):
+        """할 일 하나를 인덱스에 반영합니다. 완료/삭제된 할 일은 인덱스에서 제거합니다."""
+        if self._task_index is None:
+            return
+        # 같은 ID 의 기존 항목을 먼저 제거 (제목이 바뀐 할 일이 이전 제목으로 중복 판정되지 않도록)
+        self._unindex_task(task.get('id'))
+        if not task.get('title') or task.get('deleted') or task.get('status') == 'completed':
+            return
+        key = _normalize_title(task['title'])
+        self._task_index.setdefault(key, {})[task.get('id')] = {
+            "id": task.get('id'),
+            "notes": task.get('notes'),
+            "notes_hash": _notes_hash(task.get('notes')),
+        }
+        self._task_keys[task.get('id')] = key
+
+    def _unindex_task(self, task_id: str | None):
+        key = self._task_keys.pop(task_id, None)
+        entries = self._task_index.get(key) if key is not None else None
+        if entries is None:
+            return
+        entries.pop(task_id, None)
+        # 같은 제목의 다른 미완료 할 일이 남아 있으면 키를 유지
+        if not entries:
+            del self._task_index[key]
+
+    @staticmethod
+    def _indexed_task(index: dict[str, dict[str, dict]], title: str) -> dict | None:
+        """같은 제목(정규화)의 미완료 할 일 중 먼저 인덱스된 것. 없으면 None."""
+        entries = index.get(_normalize_title(title))
+        return next(iter(entries.values())) if entries else None
+
+    def _sync_task_index(self) -> dict[str, dict[str, dict]]:
+        """
+        미완료 할 일 인덱스를 최신 상태로 맞춥니다.
+        최초 1회는 전체 목록을 읽고, 이후에는 마지막 동기화 이후 변경된 할 일만(updatedMin) 읽습니다.
+        """
+        sync_started = datetime.now(timezone.utc) - INDEX_SYNC_SKEW
+
+        if self._task_index is None or self._index_synced_at is None:
+            self._task_index = {}
+            self._task_keys = {}
+            for item in self._iter_tasks():
+                self._index_task(item)
+        else:
+            # 완료/삭제된 할 일도 받아야 인덱스에서 제거할 수 있음
+            for item in self._iter_tasks(
+                show_completed=True,
+                updatedMin=self._index_synced_at,
+                showDeleted=True,
+                showHidden=True,
+            ):
+                self._index_task(item)
+
+        self._index_synced_at = sync_started.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        return self._task_index
 
     def add_google_task(self,
         title: Annotated[str, Field(description="추가할 할 일의 제목")],
@@ -49,18 +207,12 @@ class GoogleTasksAutomationTools:
     ) -> str:
         """Google Tasks의 기본 목록(@default)에 새로운 할 일을 추가합니다."""
         try:
-            # 할 일 객체 구성
-            task_body = {
-                "title": title,
-                "notes": notes
-            }
-            
-            # 마감일이 있으면 RFC 3339 형식으로 변환하여 추가
-            if due_date:
-                task_body["due"] = f"{due_date}T00:00:00Z"
+            task_body = self._build_task_body(title, notes, due_date)
 
             # 기본 작업 목록(@default)에 삽입
             result = self.service.tasks().insert(tasklist='@default', body=task_body).execute()
+            with self.index_lock:
+                self._index_task(result)
             
             return f"성공적으로 할 일이 추가되었습니다: {result.get('title')} (ID: {result.get('id')})"
         except Exception as e:
@@ -71,8 +223,7 @@ class GoogleTasksAutomationTools:
     ) -> str:
         """기본 목록에서 완료되지 않은 할 일들을 가져옵니다."""
         try:
-            results = self.service.tasks().list(tasklist='@default', maxResults=max_results, showCompleted=False).execute()
-            items = results.get('items', [])
+            items = list(self._iter_tasks(limit=max_results))
 
             if not items:
                 return "남은 할 일이 없습니다."
@@ -83,4 +234,108 @@ class GoogleTasksAutomationTools:
             
             return "\n".join(task_list)
         except Exception as e:
-            return f"할 일 목록 조회 중 오류 발생: {str(e)}"
\ No newline at end of file
+            return f"할 일 목록 조회 중 오류 발생: {str(e)}"
+
+    def add_google_tasks_bulk(self,
+        tasks: Annotated[list[TaskItem], Field(description="한 번에 추가할 할 일 목록 (각 항목: title, notes, due_date)")],
+        skip_duplicates: Annotated[bool, Field(description="이미 같은 제목의 미완료 할 일이 있으면 건너뛸지 여부")] = True
+    ) -> str:
+        """여러 개의 할 일을 Google 배치 요청으로 한 번에 추가합니다. 메일 한 통에서 추출한 여러 할 일을 등록할 때 사용하세요."""
+        try:
+            items = [t if isinstance(t, TaskItem) else TaskItem.model_validate(t) for t in tasks]
+            if not items:
+                return "추가할 할 일이 없습니다."
+
+            with self.index_lock:
+                return self._add_tasks_bulk(items, skip_duplicates)
+        except Exception as e:
+            return f"할 일 일괄 추가 중 오류 발생: {str(e)}"
+
+    def _add_tasks_bulk(self, items: list[TaskItem], skip_duplicates: bool) -> str:
+        # 인덱스 동기화 (최초 1회 전체 조회, 이후 변경분만 조회)
+        index = self._sync_task_index() if skip_duplicates else {}
+
+        to_insert = []
+        skipped = []
+        seen = set()
+        for item in items:
+            key = _normalize_title(item.title)
+            if skip_duplicates and (key in index or key in seen):
+                skipped.append(item.title)
+                continue
+            seen.add(key)
+            to_insert.append(item)
+
+        created = []
+        failed = []
+
+        def _on_response(request_id, response, exception):
+            if exception is not None:
+                failed.append(f"{to_insert[int(request_id)].title}: {exception}")
+            else:
+                created.append(response)
+                self._index_task(response)
+
+        for start in range(0, len(to_insert), BATCH_CHUNK_SIZE):
+            batch = self.service.new_batch_http_request(callback=_on_response)
+            for offset, item in enumerate(to_insert[start:start + BATCH_CHUNK_SIZE]):
+                batch.add(
+                    self.service.tasks().insert(
+                        tasklist='@default',
+                        body=self._build_task_body(item.title, item.notes, item.due_date),
+                    ),
+                    request_id=str(start + offset),
+                )
+            # 배치 요청은 HttpRequest 가 아니므로 직접 가드를 거침 (insert 묶음이므로 중복 생성 방지를 위해 5xx 는 재시도 안 함)
+            _tasks_guard().call_non_idempotent(batch.execute)
+
+        lines = [f"할 일 {len(created)}개를 추가했습니다."]
+        for task in created:
+            lines.append(f"- {task.get('title')} (ID: {task.get('id')})")
+        if skipped:
+            lines.append(f"중복으로 건너뛴 할 일 {len(skipped)}개:")
+            lines.extend(f"- {title}" for title in skipped)
+        if failed:
+            lines.append(f"추가 실패 {len(failed)}개:")
+            lines.extend(f"- {msg}" for msg in failed)
+        return "\n".join(lines)
+
+    def upsert_task(self,
+        title: Annotated[str, Field(description="추가할 할 일의 제목")],
+        notes: Annotated[Optional[str], Field(description="할 일에 대한 상세 설명(메모)")] = None,
+        due_date: Annotated[Optional[str], Field(description="마감 기한 (형식: YYYY-MM-DD)")] = None
+    ) -> str:
+        """
+        할 일을 중복 없이 등록합니다. 별도의 목록 조회 없이 바로 호출하세요.
+        같은 제목의 미완료 할 일이 있으면 메모가 같을 경우 건너뛰고, 다를 경우 기존 할 일에 메모를 병합합니다.
+        """
+        try:
+            with self.index_lock:
+                index = self._sync_task_index()
+                existing = self._indexed_task(index, title)
+
+                if existing is None:
+                    result = self.service.tasks().insert(
+                        tasklist='@default',
+                        body=self._build_task_body(title, notes, due_date),
+                    ).execute()
+                    self._index_task(result)
+                    return f"성공적으로 할 일이 추가되었습니다: {result.get('title')} (ID: {result.get('id')})"
+
+                old_notes = existing.get('notes') or ""
+                if not notes or _notes_hash(notes) == existing['notes_hash'] or notes.strip() in old_notes:
+                    return f"이미 동일한 할 일이 있어 건너뛰었습니다: {title} (ID: {existing['id']})"
+
+                # 메모가 다르면 기존 할 일에 병합
+                patch_body = {"notes": f"{old_notes}\n---\n{notes}" if old_notes else notes}
+                if due_date:
+                    patch_body["due"] = f"{due_date}T00:00:00Z"
+                result = self.service.tasks().patch(
+                    tasklist='@default',
+                    task=existing['id'],
+                    body=patch_body,
+                ).execute()
+                self._index_task(result)
+                return f"기존 할 일에 내용을 병합했습니다: {result.get('title')} (ID: {result.get('id')})"
+        except Exception as e:
+            return f"할 일 등록 중 오류 발생: {str(e)}"
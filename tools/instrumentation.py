@@ -0,0 +1,392 @@
+"""
+Tool Instrumentation - 도구 메서드별 지연 시간 / 호출 수 계측
+
+모든 도구 클래스(Gmail, Google Tasks, JIRA, GitHub, AI Search)에 `@instrument_tools`를 붙여
+public 메서드 호출마다 아래 값을 기록합니다.
+
+- 실행 시간(wall time), 호출 수, 오류 수
+  (예외 + 도구가 예외 대신 돌려주는 "Error ..." / "... 중 오류 발생: ..." 로 시작하는 문자열 결과)
+- 호출 중 발생한 외부 HTTP 요청 수 / 송수신 바이트 / HTTP 오류(4xx, 5xx) 수
+  (requests, httplib2, httpx 전송 계층에 훅을 걸어 집계)
+
+도구 메서드가 다른 계측 메서드(fetch_issue, open_issue 같은 구조화 헬퍼)를 부르는 중첩 호출은 따로 기록하지 않습니다.
+(지연 시간과 HTTP 통계가 두 번 집계되지 않도록, 가장 바깥 호출에만 합산)
+
+HTTP 훅은 라이브러리 클래스를 monkeypatch 하므로 데코레이터가 자동으로 설치하지 않습니다.
+HTTP 통계가 필요한 진입점(벤치마크, TOOL_HTTP_HOOKS=1 인 Function App)에서 install_http_hooks()를
+명시적으로 호출해야 하며, 설치 전에는 HTTP 관련 값이 0 으로 남습니다.
+
+기록 대상:
+- OpenTelemetry span / metric (collector 가 설정된 경우 그대로 전송)
+- 프로세스 내 고정 버킷 히스토그램 (collector 없이 dump_tool_stats()로 확인)
+  TOOL_STATS_DUMP_PATH 환경 변수가 있으면 프로세스 종료 시 JSON 으로 저장합니다.
+"""
+
+import os
+import re
+import json
+import time
+import atexit
+import bisect
+import inspect
+import logging
+import functools
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from opentelemetry import metrics, trace
+from opentelemetry.trace import StatusCode
+
+logger = logging.getLogger(__name__)
+
+_tracer = trace.get_tracer("ms-aitour.tools")
+_meter = metrics.get_meter("ms-aitour.tools")
+_duration_histogram = _meter.create_histogram("tool.duration", unit="ms", description="도구 메서드 실행 시간")
+_call_counter = _meter.create_counter("tool.calls", description="도구 메서드 호출 수")
+_error_counter = _meter.create_counter("tool.errors", description="도구 메서드 오류 수 (예외 + 오류 문자열 결과)")
+_http_request_counter = _meter.create_counter("tool.http.requests", description="도구 호출 중 외부 HTTP 요청 수")
+_http_bytes_counter = _meter.create_counter("tool.http.bytes", unit="By", description="도구 호출 중 HTTP 송수신 바이트")
+
+# 히스토그램 버킷 상한 (ms). 마지막 버킷은 그 이상 전부.
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 60000]
+
+
+@dataclass
+class _CallStats:
+    """한 번의 도구 호출 동안 집계되는 HTTP 통계"""
+    requests: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    http_errors: int = 0
+
+
+_active_call: ContextVar[_CallStats | None] = ContextVar("tool_active_call", default=None)
+
+
+def _record_http(bytes_sent: int, bytes_received: int, status: int | None) -> _CallStats | None:
+    stats = _active_call.get()
+    if stats is None:
+        return None
+    stats.requests += 1
+    stats.bytes_sent += bytes_sent
+    stats.bytes_received += bytes_received
+    if status is not None and status >= 400:
+        stats.http_errors += 1
+    return stats
+
+
+def _body_size(body) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray, str)):
+        return len(body)
+    return 0
+
+
+def _content_length(headers) -> int:
+    try:
+        return int(headers.get("content-length") or headers.get("Content-Length") or 0)
+    except (TypeError, ValueError, AttributeError):
+        return 0
+
+
+# ------------------------------------------------------------------ #
+# HTTP 전송 계층 훅 (프로세스당 1회 설치)                              #
+# ------------------------------------------------------------------ #
+
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+
+
+def install_http_hooks():
+    """requests / httplib2 / httpx 의 전송 함수에 요청 수·바이트 집계 훅을 설치합니다."""
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        _hooks_installed = True
+
+    try:
+        import requests
+
+        original_send = requests.Session.send
+
+        @functools.wraps(original_send)
+        def send(self, request, **kwargs):
+            response = original_send(self, request, **kwargs)
+            received = _content_length(response.headers)
+            if not received and not kwargs.get("stream"):
+                received = len(response.content or b"")
+            _record_http(_body_size(request.body), received, response.status_code)
+            return response
+
+        requests.Session.send = send
+    except ImportError:
+        pass
+
+    try:
+        import httplib2
+
+        original_request = httplib2.Http.request
+
+        @functools.wraps(original_request)
+        def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+            response, content = original_request(self, uri, method, body, headers, *args, **kwargs)
+            _record_http(_body_size(body), len(content or b""), response.status)
+            return response, content
+
+        httplib2.Http.request = request
+    except ImportError:
+        pass
+
+    try:
+        import httpx
+
+        original_sync_send = httpx.Client.send
+        original_async_send = httpx.AsyncClient.send
+
+        class _CountingSyncStream(httpx.SyncByteStream):
+            """stream=True 응답: 본문을 다 읽고 닫을 때 실제 수신 바이트를 호출 통계에 더합니다."""
+
+            def __init__(self, response, stats):
+                self._stream, self._response, self._stats = response.stream, response, stats
+
+            def __iter__(self):
+                yield from self._stream
+
+            def close(self):
+                self._stream.close()
+                self._stats.bytes_received += self._response.num_bytes_downloaded
+
+        class _CountingAsyncStream(httpx.AsyncByteStream):
+            def __init__(self, response, stats):
+                self._stream, self._response, self._stats = response.stream, response, stats
+
+            async def __aiter__(self):
+                async for chunk in self._stream:
+                    yield chunk
+
+            async def aclose(self):
+                await self._stream.aclose()
+                self._stats.bytes_received += self._response.num_bytes_downloaded
+
+        def _httpx_request_size(request) -> int:
+            size = _content_length(request.headers)
+            if not size:
+                try:
+                    size = len(request.content)
+                except httpx.RequestNotRead:  # 스트리밍 요청 본문 (크기 미상)
+                    size = 0
+            return size
+
+        def _httpx_record(request, response, stream_cls):
+            # chunked / 압축 응답은 content-length 가 없거나 실제와 다르므로 읽은 바이트(num_bytes_downloaded)로 집계.
+            # stream=True 로 아직 본문을 읽지 않았으면 스트림을 감싸 닫힐 때 더합니다.
+            read = response.is_closed
+            stats = _record_http(_httpx_request_size(request), response.num_bytes_downloaded if read else 0,
+                                 response.status_code)
+            if stats is not None and not read:
+                response.stream = stream_cls(response, stats)
+
+        @functools.wraps(original_sync_send)
+        def sync_send(self, request, **kwargs):
+            response = original_sync_send(self, request, **kwargs)
+            _httpx_record(request, response, _CountingSyncStream)
+            return response
+
+        @functools.wraps(original_async_send)
+        async def async_send(self, request, **kwargs):
+            response = await original_async_send(self, request, **kwargs)
+            _httpx_record(request, response, _CountingAsyncStream)
+            return response
+
+        httpx.Client.send = sync_send
+        httpx.AsyncClient.send = async_send
+    except ImportError:
+        pass
+
+
+# ------------------------------------------------------------------ #
+# 프로세스 내 히스토그램                                              #
+# ------------------------------------------------------------------ #
+
+class _ToolHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.http_requests = 0
+        self.http_errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def observe(self, elapsed_ms: float, stats: _CallStats, failed: bool):
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.calls += 1
+        self.errors += int(failed)
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.http_requests += stats.requests
+        self.http_errors += stats.http_errors
+        self.bytes_sent += stats.bytes_sent
+        self.bytes_received += stats.bytes_received
+
+    def percentile(self, q: float) -> float:
+        """버킷 상한 기준 근사 백분위수 (ms)"""
+        if not self.calls:
+            return 0.0
+        target = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 2),
+            "http_requests": self.http_requests,
+            "http_errors": self.http_errors,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "buckets_ms": dict(zip([*map(str, LATENCY_BUCKETS_MS), "inf"], self.buckets)),
+        }
+
+
+_histograms: dict[str, _ToolHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def _observe(tool_name: str, elapsed_ms: float, stats: _CallStats, failed: bool):
+    with _histograms_lock:
+        histogram = _histograms.get(tool_name)
+        if histogram is None:
+            histogram = _histograms[tool_name] = _ToolHistogram()
+        histogram.observe(elapsed_ms, stats, failed)
+
+
+def dump_tool_stats(path: str | None = None) -> dict:
+    """도구별 누적 통계를 dict 로 반환하고, path 가 주어지면 JSON 파일로 저장합니다."""
+    with _histograms_lock:
+        snapshot = {name: h.to_dict() for name, h in sorted(_histograms.items())}
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+    return snapshot
+
+
+def reset_tool_stats():
+    with _histograms_lock:
+        _histograms.clear()
+
+
+# ------------------------------------------------------------------ #
+# 데코레이터                                                          #
+# ------------------------------------------------------------------ #
+
+# 도구가 예외 대신 돌려주는 오류 문자열의 앞부분 ("Error creating ...", "메일 본문 조회 중 오류 발생: ...")
+# 본문 중간의 "오류 발생" (메일 내용 등)은 오류로 보지 않도록 시작 부분만 확인
+_ERROR_RESULT = re.compile(r"Error\b|[^\n:]{1,40} 중 오류 발생:")
+
+
+def _is_error_result(result) -> bool:
+    return isinstance(result, str) and _ERROR_RESULT.match(result) is not None
+
+
+class _ToolCall:
+    """span 시작/종료와 통계 기록을 한 곳에서 처리합니다. (동기/비동기 공용)"""
+
+    def __init__(self, tool_name: str):
+        self.tool_name = tool_name
+        self.stats = _CallStats()
+        self.error_result: str | None = None
+
+    def check_result(self, result):
+        """예외 대신 오류 문자열을 돌려주는 도구의 결과를 오류로 기록합니다."""
+        if _is_error_result(result):
+            self.error_result = result
+        return result
+
+    def __enter__(self):
+        self.token = _active_call.set(self.stats)
+        self.span_cm = _tracer.start_as_current_span(f"tool {self.tool_name}")
+        self.span = self.span_cm.__enter__()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        _active_call.reset(self.token)
+        failed = exc is not None or self.error_result is not None
+
+        attributes = {"tool.name": self.tool_name}
+        self.span.set_attribute("tool.name", self.tool_name)
+        self.span.set_attribute("tool.http.request_count", self.stats.requests)
+        self.span.set_attribute("tool.http.error_count", self.stats.http_errors)
+        self.span.set_attribute("tool.http.bytes_sent", self.stats.bytes_sent)
+        self.span.set_attribute("tool.http.bytes_received", self.stats.bytes_received)
+        # 예외 기록 및 ERROR 상태 설정은 span 컨텍스트 매니저가 처리
+        if exc is None and self.error_result is not None:
+            self.span.set_status(StatusCode.ERROR, self.error_result[:200])
+        self.span_cm.__exit__(exc_type, exc, tb)
+
+        _duration_histogram.record(elapsed_ms, attributes)
+        _call_counter.add(1, attributes)
+        if failed:
+            _error_counter.add(1, attributes)
+        if self.stats.requests:
+            _http_request_counter.add(self.stats.requests, attributes)
+            _http_bytes_counter.add(self.stats.bytes_sent + self.stats.bytes_received, attributes)
+        _observe(self.tool_name, elapsed_ms, self.stats, failed)
+
+        return False
+
+
+def instrument_tool(func=None, *, name: str | None = None):
+    """단일 함수/메서드 계측 데코레이터. functools.wraps 로 시그니처(Annotated 설명)를 유지합니다."""
+    if func is None:
+        return functools.partial(instrument_tool, name=name)
+
+    tool_name = name or func.__qualname__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if _active_call.get() is not None:
+                # 중첩 호출: HTTP 통계는 바깥 호출에 그대로 쌓임
+                return await func(*args, **kwargs)
+            with _ToolCall(tool_name) as call:
+                return call.check_result(await func(*args, **kwargs))
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _active_call.get() is not None:
+            # 중첩 호출: HTTP 통계는 바깥 호출에 그대로 쌓임
+            return func(*args, **kwargs)
+        with _ToolCall(tool_name) as call:
+            return call.check_result(func(*args, **kwargs))
+    return wrapper
+
+
+def instrument_tools(cls):
+    """클래스 데코레이터. '_'로 시작하지 않는 모든 메서드에 instrument_tool 을 적용합니다. (HTTP 훅은 설치하지 않음)"""
+    for attr_name, attr in list(vars(cls).items()):
+        if attr_name.startswith("_") or not inspect.isfunction(attr):
+            continue
+        setattr(cls, attr_name, instrument_tool(attr, name=f"{cls.__name__}.{attr_name}"))
+    return cls
+
+
+_dump_path = os.getenv("TOOL_STATS_DUMP_PATH")
+if _dump_path:
+    atexit.register(dump_tool_stats, _dump_path)
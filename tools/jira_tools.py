@@ -4,6 +4,10 @@ from typing import Annotated, Optional
 from pydantic import Field
 from jira import JIRA
 
+from tools.instrumentation import instrument_tools
+from tools.tool_state import PicklableTools
+from tools.resilience import GuardedHTTPAdapter, endpoint_guard
+
 # 로거 설정
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -11,7 +15,15 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-class JiraAutomationTools:
+# JIRA Cloud REST API 클라이언트 측 속도 제한
+JIRA_RATE_PER_SECOND = 10
+JIRA_BURST = 20
+
+@instrument_tools
+class JiraAutomationTools(PicklableTools):
+    # pickle 시 JIRA 클라이언트(세션)는 빼고 서버 / 계정 설정만 저장
+    _transient_attrs = ("_client",)
+
     def __init__(self):
         logger.info("JiraAutomationTools 초기화 시작")
         # 환경 변수에서 설정 로드
@@ -39,17 +51,52 @@ class JiraAutomationTools:
         # 실제 호출될 때 클라이언트를 생성하여 에러 방지 및 세션 유지
         if self._client is None:
             self._client = JIRA(server=self.server, basic_auth=(self.email, self.token), options={'resilient' : False})
+            # 세션의 모든 요청(리소스 메서드 포함)이 공용 속도 제한 / 재시도 / 서킷 브레이커를 거치도록
+            guard = endpoint_guard(f"jira:{self.server}", rate_per_second=JIRA_RATE_PER_SECOND, burst=JIRA_BURST)
+            for prefix in ("https://", "http://"):
+                self._client._session.mount(prefix, GuardedHTTPAdapter(guard))
         return self._client
 
+    def issue_link(self, issue_key: str) -> str:
+        return f"{self.server.rstrip('/')}/browse/{issue_key}"
+
+    # ------------------------------------------------------------------ #
+    # 구조화 결과를 반환하는 메서드 (LLM 도구가 아닌 코드 경로용, 실패 시 예외) #
+    # ------------------------------------------------------------------ #
+
+    def fetch_issue(self, issue_key: str) -> dict:
+        """이슈를 조회하여 key / type / summary / description / link 를 dict 로 반환합니다."""
+        issue = self.client.issue(issue_key)
+        return {
+            "key": issue.key,
+            "type": issue.fields.issuetype.name if issue.fields.issuetype else "Unknown",
+            "summary": issue.fields.summary,
+            "description": issue.fields.description or "",
+            "link": self.issue_link(issue.key),
+        }
+
+    def create_issue(self, summary: str, description: str, issue_type: str) -> dict:
+        """이슈를 생성하고 key / link 를 dict 로 반환합니다."""
+        new_issue = self.client.create_issue(fields={
+            'project': {'key': self.project_key},
+            'summary': summary,
+            'description': description,
+            'issuetype': {'name': issue_type},
+        })
+        return {"key": new_issue.key, "link": self.issue_link(new_issue.key)}
+
+    def delete_issue(self, issue_key: str):
+        """이슈를 삭제합니다. (부분 실패 시 보상 처리용)"""
+        self.client.issue(issue_key).delete()
+
     def get_jira_issue(self, 
         issue_key: Annotated[str, Field(description="The key of the Jira issue (e.g., 'KAN-123')")]
     ) -> str:
         """Retrieves details of a specific Jira issue to read specifications."""
         logger.info(f"JIRA 이슈 조회 시작: {issue_key}")
         try:
-            issue = self.client.issue(issue_key)
-            issue_type = issue.fields.issuetype.name if issue.fields.issuetype else "Unknown"
-            result = f"Key: {issue.key}, Type: {issue_type}, Summary: {issue.fields.summary}, Description: {issue.fields.description}"
+            issue = self.fetch_issue(issue_key)
+            result = f"Key: {issue['key']}, Type: {issue['type']}, Summary: {issue['summary']}, Description: {issue['description']}"
             logger.info(f"JIRA 이슈 조회 성공: {issue_key}")
             logger.debug(f"응답: {result}")
             return result
@@ -66,14 +113,9 @@ class JiraAutomationTools:
         logger.info(f"JIRA 이슈 생성 시작: {summary}")
         logger.debug(f"Issue Type: {issue_type}, Project: {self.project_key}")
         try:
-            new_issue = self.client.create_issue(fields={
-                'project': {'key': self.project_key},
-                'summary': summary,
-                'description': description,
-                'issuetype': {'name': issue_type},
-            })
-            logger.info(f"JIRA 이슈 생성 성공: {new_issue.key}")
-            return f"Successfully created Jira issue: {new_issue.key}"
+            new_issue = self.create_issue(summary, description, issue_type)
+            logger.info(f"JIRA 이슈 생성 성공: {new_issue['key']}")
+            return f"Successfully created Jira issue: {new_issue['key']}"
         except Exception as e:
             logger.error(f"JIRA 이슈 생성 실패: {summary} - {str(e)}", exc_info=True)
             return f"Error creating Jira issue: {str(e)}"
@@ -0,0 +1,187 @@
+"""
+Mail Body - Gmail 메시지 본문 중 텍스트 파트만 골라 바이트 예산 안에서 스트리밍 디코딩
+
+Gmail API 의 format=full 응답에서 첨부 파일(과 큰 파트)의 바이트는 body.attachmentId 로만 오고,
+body.data 에는 인라인 텍스트 파트만 들어 있습니다. 그래서
+
+1. iter_text_parts 가 파트 트리를 (전달된 message/rfc822 안까지) 걸으며 첨부(filename / Content-Disposition: attachment)와
+   텍스트가 아닌 파트를 건너뛰고, multipart/alternative 에서는 text/plain 을 text/html 보다 우선해 고르고
+2. 고른 파트의 본문은 인라인 data 를, attachmentId 로 분리된 파트만 partId 별로 따로 받아 (attachments.get)
+3. BodyReader 가 base64url 을 조각 단위로 디코딩해 바이트 예산에 닿으면 나머지는 디코딩하지 않습니다.
+   (예산은 디코딩과 분리된 파트의 추가 조회를 줄일 뿐, 이미 응답에 들어 있는 인라인 data 의 전송량은 줄이지 않음)
+   HTML 은 같은 조각 단위로 HTMLParser 에 흘려 넣어 텍스트만 남깁니다. (script / style 제외, 블록 태그는 줄바꿈)
+
+    reader = BodyReader(max_bytes=12_000)
+    for part in iter_text_parts(message["payload"]):
+        reader.feed(part["body"].get("data", ""), part_charset(part), html=part["mimeType"] == "text/html")
+        if reader.exhausted:
+            break
+    text = reader.text()
+
+메시지 본문은 바뀌지 않으므로 결과는 모듈 수준 LRU(body_cache)에 메시지 ID 별로 둡니다. (pickle 되지 않음)
+"""
+
+import re
+import base64
+import codecs
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+from typing import Iterator
+
+# 한 번에 디코딩하는 base64 문자 수 (4 의 배수)
+DECODE_CHUNK_CHARS = 64 * 1024
+MAX_CACHED_BODIES = 256
+
+_BLOCK_TAGS = {"p", "div", "br", "tr", "li", "ul", "ol", "table", "h1", "h2", "h3", "h4", "h5", "h6",
+               "blockquote", "pre", "hr", "section", "article"}
+_SKIP_TAGS = {"script", "style", "head", "title"}
+
+
+def _header(part: dict, name: str) -> str:
+    return next((h["value"] for h in part.get("headers", []) if h["name"].lower() == name), "")
+
+
+def is_attachment(part: dict) -> bool:
+    return bool(part.get("filename")) or _header(part, "content-disposition").lower().startswith("attachment")
+
+
+def part_charset(part: dict) -> str:
+    match = re.search(r'charset="?([\w.:-]+)"?', _header(part, "content-type"), re.IGNORECASE)
+    charset = match.group(1) if match else "utf-8"
+    try:
+        codecs.lookup(charset)
+        return charset
+    except LookupError:
+        return "utf-8"
+
+
+def iter_text_parts(part: dict) -> Iterator[dict]:
+    """본문으로 읽을 텍스트 파트를 순서대로 돌려줍니다. (첨부 / 비텍스트 제외, alternative 는 하나만)"""
+    if is_attachment(part):
+        return
+    mime_type = part.get("mimeType", "").lower()
+    children = part.get("parts") or []
+    if mime_type == "multipart/alternative" and children:
+        # 같은 내용의 다른 표현 중 하나만: text/plain > text/html > 그 외 (중첩 multipart 포함)
+        ranked = sorted(children, key=lambda p: {"text/plain": 0, "text/html": 1}.get(p.get("mimeType", "").lower(), 2))
+        for child in ranked:
+            found = list(iter_text_parts(child))
+            if found:
+                yield from found
+                return
+    elif mime_type.startswith("multipart/") or mime_type == "message/rfc822":
+        # 전달된 메일(message/rfc822)은 parts 에 원본 메시지의 파트 트리가 들어 있음
+        for child in children:
+            yield from iter_text_parts(child)
+    elif mime_type in ("text/plain", "text/html"):
+        yield part
+
+
+class HtmlTextExtractor(HTMLParser):
+    """조각 단위로 feed 받아 보이는 텍스트만 모읍니다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pieces: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._line_break()
+            if tag == "li":
+                self.pieces.append("- ")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in _BLOCK_TAGS:
+            self._line_break()
+
+    def _line_break(self):
+        # 연속된 블록 태그 경계는 줄바꿈 하나로
+        if self.pieces and not self.pieces[-1].endswith("\n"):
+            self.pieces.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.pieces.append(data)
+
+
+class BodyReader:
+    """여러 텍스트 파트를 이어 받아 디코딩된 바이트 합계가 max_bytes 에 닿을 때까지 텍스트로 모읍니다."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.consumed = 0
+        self.truncated = False
+        self._pieces: list[str] = []
+
+    @property
+    def exhausted(self) -> bool:
+        return self.consumed >= self.max_bytes
+
+    def feed(self, data: str, charset: str = "utf-8", html: bool = False):
+        """base64url 문자열 data 를 조각 단위로 디코딩합니다. 예산을 넘는 뒷부분은 디코딩하지 않습니다."""
+        decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+        parser = HtmlTextExtractor() if html else None
+        for start in range(0, len(data), DECODE_CHUNK_CHARS):
+            if self.exhausted:
+                self.truncated = True
+                break
+            raw = base64.urlsafe_b64decode(_pad(data[start:start + DECODE_CHUNK_CHARS]))
+            remaining = self.max_bytes - self.consumed
+            if len(raw) > remaining:
+                raw = raw[:remaining]
+                self.truncated = True
+            self.consumed += len(raw)
+            self._emit(decoder.decode(raw), parser)
+        self._emit(decoder.decode(b"", final=not self.truncated), parser)
+        if parser:
+            parser.close()
+            self._pieces.append("".join(parser.pieces))
+        self._pieces.append("\n")
+
+    def _emit(self, text: str, parser: HtmlTextExtractor | None):
+        if parser:
+            parser.feed(text)
+        else:
+            self._pieces.append(text)
+
+    def text(self) -> str:
+        text = "".join(self._pieces).replace("\r\n", "\n").replace("\xa0", " ")
+        text = re.sub(r"[ \t]+", " ", text)
+        text = re.sub(r" ?\n ?", "\n", text)
+        return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _pad(data: str) -> str:
+    return data + "=" * (-len(data) % 4)
+
+
+class BodyCache:
+    """메시지 본문 결과 LRU (스레드 안전)"""
+
+    def __init__(self, max_entries: int = MAX_CACHED_BODIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+body_cache = BodyCache()
@@ -0,0 +1,191 @@
+"""
+Tool Result Memoization - 대화(세션) 단위 읽기 전용 도구 결과 캐시
+
+한 번의 마스터 에이전트 대화에서 LLM 이 같은 읽기 도구를 같은 인자로 반복 호출하는 경우
+(`get_jira_issue("KAN-4")`, `get_issue(12)`, `list_tasks()`, `get_unread_email_titles()` 등)
+네트워크 호출 없이 이전 결과를 돌려줍니다.
+
+사용법 (agents/*.py 에서 tools=[...] 를 만들 때 적용):
+
+    cache = tool_cache  # 에이전트 간 공유 (하위 에이전트의 쓰기가 다른 에이전트의 읽기 캐시도 무효화)
+    tools=[
+        cache.read(jira_tools.get_jira_issue),
+        cache.write(jira_tools.update_jira_issue, evicts={"get_jira_issue": "issue_key"}),
+        cache.write(tasks_tools.add_google_task, evicts=["list_tasks"]),
+    ]
+
+- 캐시 키: (세션 키, 도구 이름, 인자). 세션 키는 SessionCacheMiddleware 가 에이전트 실행마다
+  AgentSession.session_id 로 설정하며(as_tool 로 호출되는 하위 에이전트에도 전달됨),
+  세션이 없으면 프로세스 공용 키를 사용합니다. (이 경우에도 TTL 로 만료)
+- 쓰기 도구는 실행 후 evicts 에 지정한 읽기 도구 항목을 지웁니다.
+  dict 값으로 인자 이름을 주면 같은 값의 항목만, list/None 이면 해당 도구 항목 전체를 지웁니다.
+- "Error" 로 시작하는 결과나 예외는 캐시하지 않습니다.
+"""
+
+import json
+import time
+import inspect
+import logging
+import functools
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from agent_framework import AgentMiddleware
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 120
+MAX_SESSIONS = 256
+MAX_ENTRIES_PER_SESSION = 512
+GLOBAL_SESSION = "__global__"
+
+_session_key: ContextVar[str] = ContextVar("tool_cache_session", default=GLOBAL_SESSION)
+
+
+class SessionCacheMiddleware(AgentMiddleware):
+    """에이전트 실행 동안 캐시 세션 키를 AgentSession.session_id 로 설정합니다."""
+
+    async def process(self, context, call_next):
+        if context.session is None:
+            # 세션 없이 실행되는 하위 에이전트(as_tool)는 상위 에이전트의 세션 키를 그대로 사용
+            await call_next()
+            return
+        token = _session_key.set(context.session.session_id)
+        try:
+            await call_next()
+        finally:
+            # 스트리밍 응답은 call_next 이후에 소비되므로 요청 태스크가 끝날 때까지 유지
+            if not context.stream:
+                _session_key.reset(token)
+
+
+def _arguments_key(signature: inspect.Signature, args, kwargs) -> tuple[str, dict]:
+    try:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+    except TypeError:
+        arguments = {"args": list(args), **kwargs}
+    return json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str), arguments
+
+
+class ToolResultCache:
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        # 세션 키 -> {(도구 이름, 인자 키): (만료 시각, 인자, 결과)} (세션은 LRU 로 MAX_SESSIONS 개 유지)
+        self._sessions: OrderedDict[str, OrderedDict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # -------------------------------------------------------------- #
+    def _entries(self, session: str) -> OrderedDict:
+        entries = self._sessions.get(session)
+        if entries is None:
+            entries = self._sessions[session] = OrderedDict()
+            while len(self._sessions) > MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session)
+        return entries
+
+    def _get(self, tool_name: str, args_key: str):
+        with self._lock:
+            entries = self._entries(_session_key.get())
+            entry = entries.get((tool_name, args_key))
+            if entry is None or entry[0] < time.monotonic():
+                entries.pop((tool_name, args_key), None)
+                self.misses += 1
+                return None
+            entries.move_to_end((tool_name, args_key))
+            self.hits += 1
+            return entry
+
+    def _put(self, tool_name: str, args_key: str, arguments: dict, result, ttl: float):
+        if isinstance(result, str) and result.startswith("Error"):
+            return
+        with self._lock:
+            entries = self._entries(_session_key.get())
+            entries[(tool_name, args_key)] = (time.monotonic() + ttl, arguments, result)
+            while len(entries) > MAX_ENTRIES_PER_SESSION:
+                entries.popitem(last=False)
+
+    def invalidate(self, tool_name: str, match_arg: str | None = None, value=None):
+        """현재 세션에서 tool_name 항목을 지웁니다. match_arg 가 있으면 해당 인자 값이 같은 항목만."""
+        with self._lock:
+            entries = self._entries(_session_key.get())
+            for key in [k for k in entries if k[0] == tool_name]:
+                if match_arg is None or entries[key][1].get(match_arg) == value:
+                    del entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+            self.hits = self.misses = 0
+
+    # -------------------------------------------------------------- #
+    def read(self, func, *, ttl: float | None = None, name: str | None = None):
+        """읽기 전용 도구를 캐시합니다. functools.wraps 로 도구 이름/시그니처(Annotated 설명)를 유지합니다."""
+        tool_name = name or func.__name__
+        ttl = self.ttl_seconds if ttl is None else ttl
+        signature = inspect.signature(func)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                args_key, arguments = _arguments_key(signature, args, kwargs)
+                entry = self._get(tool_name, args_key)
+                if entry is not None:
+                    logger.debug(f"도구 캐시 적중: {tool_name} {args_key}")
+                    return entry[2]
+                result = await func(*args, **kwargs)
+                self._put(tool_name, args_key, arguments, result, ttl)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            args_key, arguments = _arguments_key(signature, args, kwargs)
+            entry = self._get(tool_name, args_key)
+            if entry is not None:
+                logger.debug(f"도구 캐시 적중: {tool_name} {args_key}")
+                return entry[2]
+            result = func(*args, **kwargs)
+            self._put(tool_name, args_key, arguments, result, ttl)
+            return result
+        return wrapper
+
+    def write(self, func, *, evicts: dict[str, str | None] | list[str] | None = None):
+        """쓰기 도구 실행 후 관련 읽기 항목을 지웁니다. (실행 결과와 관계없이 무효화)"""
+        rules = evicts if isinstance(evicts, dict) else {tool: None for tool in evicts or []}
+        signature = inspect.signature(func)
+
+        def _evict(args, kwargs):
+            _, arguments = _arguments_key(signature, args, kwargs)
+            for tool_name, match_arg in rules.items():
+                if match_arg is None:
+                    self.invalidate(tool_name)
+                else:
+                    self.invalidate(tool_name, match_arg, arguments.get(match_arg))
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _evict(args, kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _evict(args, kwargs)
+        return wrapper
+
+
+# agents/*.py 가 공유하는 기본 캐시
+tool_cache = ToolResultCache()
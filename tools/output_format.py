@@ -0,0 +1,88 @@
+"""
+Compact Output - 목록형 도구 결과를 도구별 토큰 예산 안의 간결한 레코드 표로 렌더링
+
+목록 도구의 결과는 LLM 이 매 턴 다시 읽는 입력이므로(agents/history.py), 이모지 / 줄마다 붙는 라벨 대신
+헤더 한 줄 + 열 이름 한 줄 + 레코드당 한 줄(| 구분)로 출력합니다.
+
+    오늘 메일: 1-12/57건
+    #|time|from|subject|snippet
+    1|09:12|팀장 <lead@example.com>|주간 보고서 검토|이번 주 금요일까지 …
+    ...
+    more: cursor=12
+
+- 필드는 공백을 한 칸으로 줄이고 열별 최대 글자 수로 자릅니다. (None 이면 자르지 않음 - 링크 등)
+- 레코드는 예산(budget_tokens)을 넘기 전까지만 출력하고 (최소 1건), 남은 레코드가 있으면
+  마지막 줄에 다음 호출에 쓸 cursor(= 다음 시작 위치)를 적습니다.
+- 도구별 예산은 TOOL_BUDGETS 에서 조정합니다.
+"""
+
+DEFAULT_BUDGET_TOKENS = 600
+MORE_PREFIX = "more: cursor="
+
+# 도구 이름 -> 결과 토큰 예산
+TOOL_BUDGETS = {
+    "get_emails_received_today": 900,
+    "get_ticket_history": 700,
+    "search_similar_tickets": 400,
+}
+
+Columns = list[tuple[str, int | None]]
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 쓰는 보수적 추정치 (한글 1자 ≈ 1토큰, 영문 3~4자 ≈ 1토큰)"""
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def clip(value, max_chars: int | None = None) -> str:
+    """공백을 줄이고 구분자(|)를 바꾼 뒤 max_chars 로 자릅니다. 값이 없으면 '-'"""
+    if value is None or value == "":
+        return "-"
+    text = " ".join(str(value).split()).replace("|", "/")
+    if max_chars is not None and len(text) > max_chars:
+        return text[:max_chars - 1] + "…"
+    return text
+
+
+def parse_cursor(cursor) -> int:
+    """cursor 값(정수 / 숫자 문자열 / None)을 시작 위치로 바꿉니다. 잘못된 값은 처음(0)"""
+    try:
+        return max(int(cursor or 0), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def render_records(title: str,
+                   records: list[dict],
+                   columns: Columns,
+                   *,
+                   budget_tokens: int = DEFAULT_BUDGET_TOKENS,
+                   offset: int = 0,
+                   total: int | None = None,
+                   empty: str | None = None) -> str:
+    """
+    records[i] 를 offset + i + 1 번째 레코드로 보고 예산 안에서 표로 렌더링합니다.
+    total 은 전체 레코드 수 (모르면 offset + len(records))
+    """
+    if total is None:
+        total = offset + len(records)
+    if not records:
+        return empty or f"{title}: 0/{total}건"
+
+    header = "|".join(["#"] + [name for name, _ in columns])
+    # 헤더 / 열 이름 / more 줄 몫을 먼저 뺌
+    used = estimate_tokens(f"{title}: {offset + 1}-{total}/{total}건\n{header}\n{MORE_PREFIX}{total}")
+    rows = []
+    for i, record in enumerate(records):
+        row = "|".join([str(offset + i + 1)] + [clip(record.get(name), limit) for name, limit in columns])
+        cost = estimate_tokens(row) + 1
+        if rows and used + cost > budget_tokens:
+            break
+        rows.append(row)
+        used += cost
+
+    end = offset + len(rows)
+    lines = [f"{title}: {offset + 1}-{end}/{total}건", header, *rows]
+    if end < total:
+        lines.append(f"{MORE_PREFIX}{end}")
+    return "\n".join(lines)
@@ -0,0 +1,156 @@
+"""
+Rerank - 유사 티켓 후보의 로컬 재순위화 (정확한 cosine 재계산 / MMR 다양화 / 프로젝트별 보정 임계치)
+
+HNSW 근사 검색은 efSearch / k 에 따라 recall 과 @search.score 가 흔들리고,
+거의 같은 과거 매핑 여러 개가 상위 결과를 모두 차지하기도 합니다.
+그래서 검색은 k 를 조금 넉넉히(후보) 받고, 반환된 벡터로 다음을 로컬에서 수행합니다.
+
+1. 질의 벡터와 후보 벡터의 cosine 을 NumPy 로 정확히 다시 계산
+   긴 사양은 질의 / 저장 모두 청크 단위 벡터이므로 (질의 청크 × 후보 청크) 최대값(max-sim)을 쓰고,
+   같은 매핑(parent_id)의 청크 후보는 가장 높은 하나로 합침
+2. 후보의 프로젝트(사양 티켓 링크의 KAN-4 → KAN)별 보정 임계치 이상만 남김
+3. MMR(maximal marginal relevance) 로 관련도는 높고 서로 덜 겹치는 순서로 top_n 개 선택
+
+임계치는 cosine 기준입니다. 기존 @search.score 0.85 (Azure cosine 점수 1 / (2 - cos)) 는 cos ≈ 0.82 에 해당합니다.
+프로젝트별 값은 SDD_SIMILARITY_THRESHOLDS='{"KAN": 0.8, "OPS": 0.86}' 로 주며,
+라벨이 달린 과거 판정(중복 여부)이 있으면 calibrate_threshold 로 목표 precision 을 만족하는 값을 구합니다.
+
+    candidates = search_client.search(..., select=[..., "spec_ticket_vector"])
+    matched = rerank(query_chunk_vectors, list(candidates), top_n=5, thresholds=load_thresholds())
+"""
+
+import os
+import re
+import json
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.82
+DEFAULT_MMR_LAMBDA = 0.7
+THRESHOLDS_ENV = "SDD_SIMILARITY_THRESHOLDS"
+
+_PROJECT_PATTERN = re.compile(r"/browse/([A-Z][A-Z0-9_]*)-\d+")
+
+
+def project_key(link: str | None) -> str | None:
+    """JIRA 티켓 링크에서 프로젝트 키를 꺼냅니다. (https://xxx.atlassian.net/browse/KAN-4 → KAN)"""
+    match = _PROJECT_PATTERN.search(link or "")
+    return match.group(1) if match else None
+
+
+def load_thresholds(raw: str | None = None) -> dict[str, float]:
+    """환경 변수(JSON)의 프로젝트별 임계치를 읽습니다. 형식이 잘못되면 경고 후 빈 dict (기본 임계치 사용)"""
+    raw = os.getenv(THRESHOLDS_ENV) if raw is None else raw
+    if not raw:
+        return {}
+    try:
+        return {str(project): float(value) for project, value in json.loads(raw).items()}
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.warning(f"{THRESHOLDS_ENV} 형식 오류, 기본 임계치 {DEFAULT_THRESHOLD} 사용: {str(e)}")
+        return {}
+
+
+def threshold_for(project: str | None, thresholds: dict[str, float] | None = None) -> float:
+    return (thresholds or {}).get(project, (thresholds or {}).get("*", DEFAULT_THRESHOLD))
+
+
+def cosine_similarities(query: list[float], vectors: list[list[float]]) -> np.ndarray:
+    """query 와 각 vector 의 cosine 유사도 (길이 0 벡터는 0)"""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    q = np.asarray(query, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(q)
+    return np.divide(matrix @ q, norms, out=np.zeros(len(matrix), dtype=np.float32), where=norms > 0)
+
+
+def mmr(relevance: np.ndarray, vectors: list[list[float]], top_n: int,
+        lambda_: float = DEFAULT_MMR_LAMBDA) -> list[int]:
+    """
+    MMR 순서로 top_n 개 인덱스를 고릅니다.
+    매 단계 lambda * 관련도 - (1 - lambda) * (이미 고른 것과의 최대 cosine) 이 가장 큰 후보를 선택합니다.
+    """
+    if len(relevance) == 0:
+        return []
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    unit = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+    pairwise = unit @ unit.T
+
+    selected = [int(np.argmax(relevance))]
+    redundancy = pairwise[selected[0]].copy()
+    remaining = np.ones(len(relevance), dtype=bool)
+    remaining[selected[0]] = False
+    while len(selected) < min(top_n, len(relevance)):
+        scores = np.where(remaining, lambda_ * relevance - (1 - lambda_) * redundancy, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        remaining[best] = False
+        redundancy = np.maximum(redundancy, pairwise[best])
+    return selected
+
+
+def rerank(query_vectors: list[list[float]] | list[float], candidates: list[dict], *,
+           top_n: int = 5,
+           thresholds: dict[str, float] | None = None,
+           lambda_: float = DEFAULT_MMR_LAMBDA,
+           vector_field: str = "spec_ticket_vector",
+           link_field: str = "spec_ticket_link",
+           group_field: str = "parent_id") -> list[dict]:
+    """
+    검색 후보를 정확한 cosine 으로 다시 점수 매기고, 프로젝트별 임계치를 넘는 후보를 MMR 순서로 top_n 개 반환합니다.
+    query_vectors 는 벡터 하나 또는 질의 청크 벡터 목록이며, 후보 점수는 질의 청크들과의 cosine 최대값입니다.
+    group_field 가 있는 후보(자식 청크 문서)는 그 값(부모 문서 id)별로 가장 높은 청크 하나만 남깁니다.
+    반환 dict 의 id 는 부모 문서 id, score 는 cosine, search_score 는 검색 엔진 점수이며 벡터 / 청크 필드는 제외됩니다.
+    """
+    usable = [c for c in candidates if c.get(vector_field)]
+    if not usable:
+        return []
+    vectors = [c[vector_field] for c in usable]
+    queries = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+    scores = np.max([cosine_similarities(q, vectors) for q in queries], axis=0)
+
+    # 매핑별 최고 청크 (max-sim 집계)
+    best: dict = {}
+    for i, c in enumerate(usable):
+        key = c.get(group_field) or c.get("id") or i
+        if key not in best or scores[i] > scores[best[key][1]]:
+            best[key] = (key, i)
+
+    keep = [(key, i) for key, i in best.values()
+            if scores[i] >= threshold_for(project_key(usable[i].get(link_field)), thresholds)]
+    if not keep:
+        return []
+    order = mmr(scores[[i for _, i in keep]], [vectors[i] for _, i in keep], top_n, lambda_)
+
+    results = []
+    for position in order:
+        key, i = keep[position]
+        item = {k: v for k, v in usable[i].items()
+                if k not in (vector_field, group_field, "chunk_index") and not k.startswith("@")}
+        if isinstance(key, str):
+            item["id"] = key
+        item["score"] = float(scores[i])
+        item["search_score"] = usable[i].get("@search.score")
+        results.append(item)
+    return results
+
+
+def calibrate_threshold(scores: list[float], is_duplicate: list[bool],
+                        min_precision: float = 0.95) -> float | None:
+    """
+    라벨이 달린 과거 판정(cosine, 실제 중복 여부)으로 임계치를 보정합니다.
+    precision 이 min_precision 이상을 유지하는 가장 낮은 임계치(= recall 최대)를 반환하며, 없으면 None.
+    """
+    pairs = sorted(zip(scores, is_duplicate), key=lambda p: p[0], reverse=True)
+    best = None
+    true_positives = 0
+    for rank, (score, duplicate) in enumerate(pairs, start=1):
+        true_positives += bool(duplicate)
+        # 같은 점수가 이어지면 마지막 위치에서만 판단 (임계치는 점수 단위로만 자를 수 있음)
+        if rank < len(pairs) and pairs[rank][0] == score:
+            continue
+        if true_positives and true_positives / rank >= min_precision:
+            best = float(score)
+    return best
@@ -0,0 +1,363 @@
+"""
+Resilience - 외부 API 호출 공통 재시도 / 클라이언트 측 속도 제한 / 서킷 브레이커
+
+    embeddings = endpoint_guard("azure-openai:embeddings", rate_per_second=10, burst=20)
+    response = embeddings.call(client.embeddings.create, input=texts, model=deployment)
+
+EndpointGuard.call 은
+
+1. 서킷 브레이커가 열려 있으면 호출 없이 CircuitOpenError 로 바로 실패하고 (reset_timeout 후 한 번 시험 호출)
+2. 엔드포인트별 토큰 버킷에서 토큰을 받은 뒤 호출하며 (동시 세션이 함께 429 를 맞지 않도록)
+3. 재시도 가능한 실패(429 / 408 / 5xx / 연결 오류)는 full jitter 지수 백오프로 다시 시도합니다.
+   응답에 Retry-After (또는 retry-after-ms / x-ms-retry-after-ms) 가 있으면 그 시간보다 먼저 재시도하지 않습니다.
+
+멱등이 아닌 호출(POST: JIRA 티켓 / GitHub 이슈 / 메일 발송 / 할 일 추가 등)은 guard.call_non_idempotent 로 부르며,
+서버가 처리하지 않았음이 확실한 실패(429, 요청을 보내기 전의 연결 실패)만 다시 보냅니다.
+서버에 도달한 뒤의 시간 초과나 5xx 는 이미 처리됐을 수 있으므로 재시도하지 않습니다. (중복 생성 / 중복 발송 방지)
+
+400 / 401 / 404 같은 클라이언트 오류는 재시도하지 않고 서킷 실패로도 세지 않습니다.
+가드는 도구 인스턴스가 아니라 모듈 수준 레지스트리에 이름별로 두므로 pickle 되지 않고 세션 간에 공유됩니다.
+SDK 자체 재시도(openai max_retries 등)는 꺼서 재시도가 중첩되지 않게 합니다.
+
+SDK 별 연결 방법: (HTTP 메서드 / 메서드 이름으로 멱등 여부를 판단)
+- googleapiclient (Gmail / Tasks): build(..., requestBuilder=guarded_request_builder(guard)) → 모든 execute()
+- requests 세션 (JIRA): session.mount("https://", GuardedHTTPAdapter(guard)) → 리소스 메서드 호출까지 포함
+- 그 외 SDK 객체 (PyGithub Repository / Azure OpenAI): GuardedProxy(obj, guard) (get_* 만 멱등) 또는 guard.call(...)
+"""
+
+import time
+import socket
+import random
+import logging
+import threading
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+# 같은 요청을 다시 보내도 결과가 같은 HTTP 메서드
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_AFTER_HEADERS = ("retry-after-ms", "x-ms-retry-after-ms", "retry-after")
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 열려 있어 호출하지 않고 실패"""
+
+
+def status_code(exc: BaseException) -> int | None:
+    """SDK 별 예외에서 HTTP 상태 코드를 꺼냅니다. (openai / azure-core / googleapiclient / requests)"""
+    for attr in ("status_code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    # 4xx/5xx requests.Response 는 bool 로 False 이므로 truthiness 가 아니라 None 으로 판단
+    response = getattr(exc, "response", None)
+    if response is None:
+        response = getattr(exc, "resp", None)
+    for attr in ("status_code", "status"):
+        value = getattr(response, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _headers(exc: BaseException):
+    response = getattr(exc, "response", None)
+    if response is not None and getattr(response, "headers", None) is not None:
+        return response.headers
+    # PyGithub GithubException 은 예외에 헤더를 직접 가짐
+    if hasattr(getattr(exc, "headers", None), "get"):
+        return exc.headers
+    # googleapiclient HttpError.resp 는 헤더 dict 자체
+    resp = getattr(exc, "resp", None)
+    return resp if hasattr(resp, "get") else {}
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """응답 헤더의 Retry-After 를 초 단위로 반환합니다. (없거나 해석할 수 없으면 None)"""
+    headers = _headers(exc)
+    for name in RETRY_AFTER_HEADERS:
+        value = headers.get(name) or headers.get(name.title())
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+            return seconds / 1000 if name.endswith("-ms") else seconds
+        except ValueError:
+            pass
+        try:
+            # HTTP-date 형식
+            return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, CircuitOpenError):
+        return False
+    code = status_code(exc)
+    if code is not None:
+        return code in RETRYABLE_STATUS
+    # 상태 코드가 없는 연결 / 시간 초과 오류 (openai.APIConnectionError, requests.ConnectionError 등)
+    return isinstance(exc, (ConnectionError, TimeoutError)) or any(
+        word in type(exc).__name__ for word in ("Connection", "Timeout")
+    )
+
+
+def _exception_chain(exc: BaseException, depth: int = 8):
+    """예외와 그 원인들 (__cause__ / __context__ / urllib3 MaxRetryError.reason / 래핑된 args[0])"""
+    seen = set()
+    pending = [exc]
+    while pending and len(seen) < depth:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        yield current
+        pending.extend([current.__cause__, current.__context__, getattr(current, "reason", None)])
+        pending.extend(arg for arg in getattr(current, "args", ())[:1] if isinstance(arg, BaseException))
+
+
+def is_connect_error(exc: BaseException) -> bool:
+    """요청 바이트를 보내기 전, 연결 수립 단계에서 실패했는지 (서버가 요청을 받지 못했음이 확실한 경우)"""
+    connect_errors: tuple = (ConnectionRefusedError, socket.gaierror)
+    try:
+        from requests.exceptions import ConnectTimeout
+        from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+        connect_errors += (ConnectTimeout, ConnectTimeoutError, NewConnectionError)
+    except ImportError:
+        pass
+    return any(isinstance(e, connect_errors) for e in _exception_chain(exc))
+
+
+def is_safe_to_resend(exc: BaseException) -> bool:
+    """멱등이 아닌 요청도 다시 보내도 되는 실패: 429 (처리 전 거절) 또는 전송 전 연결 실패"""
+    return status_code(exc) == 429 or is_connect_error(exc)
+
+
+def full_jitter_delay(attempt: int, base: float, cap: float, rng=random) -> float:
+    """attempt 번째 재시도 대기 시간: 0 ~ min(cap, base * 2^attempt) 사이 균등 분포"""
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """초당 rate_per_second 개, 최대 burst 개까지 쌓이는 토큰 버킷 (스레드 안전)"""
+
+    def __init__(self, rate_per_second: float, burst: int, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_second
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # 부동소수점 오차로 1 에 조금 못 미치는 경우도 토큰 1개로 봄
+                if self._tokens >= 1 - 1e-9:
+                    self._tokens = max(self._tokens - 1, 0.0)
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+class CircuitBreaker:
+    """연속 failure_threshold 번 실패하면 reset_timeout 동안 열림. 이후 한 번 시험 호출(half-open)"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if self._clock() - self._opened_at >= self.reset_timeout else "open"
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self.reset_timeout - (self._clock() - self._opened_at)
+            if remaining > 0 or self._probing:
+                raise CircuitOpenError(f"서킷 열림 (연속 실패 {self._failures}회, {max(remaining, 0):.1f}초 후 재시도)")
+            self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+
+
+class EndpointGuard:
+    def __init__(self, name: str,
+                 policy: RetryPolicy | None = None,
+                 bucket: TokenBucket | None = None,
+                 breaker: CircuitBreaker | None = None,
+                 sleep=time.sleep,
+                 rng=random):
+        self.name = name
+        self.policy = policy or RetryPolicy()
+        self.bucket = bucket
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+        self._rng = rng
+
+    def call(self, func, *args, **kwargs):
+        """func(*args, **kwargs) 를 속도 제한 / 재시도 / 서킷 브레이커와 함께 호출합니다. (멱등 호출용)"""
+        return self._call(func, args, kwargs, idempotent=True)
+
+    def call_non_idempotent(self, func, *args, **kwargs):
+        """멱등이 아닌 호출. 429 와 전송 전 연결 실패만 재시도합니다. (속도 제한 / 서킷 브레이커는 동일)"""
+        return self._call(func, args, kwargs, idempotent=False)
+
+    def _call(self, func, args, kwargs, idempotent: bool):
+        for attempt in range(self.policy.max_attempts):
+            self.breaker.before_call()
+            if self.bucket is not None:
+                self.bucket.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    # 클라이언트 오류는 의존 서비스 장애가 아니므로 서킷 실패로 세지 않음
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if not idempotent and not is_safe_to_resend(e):
+                    logger.error(f"[{self.name}] 멱등이 아닌 호출 실패, 중복 방지를 위해 재시도하지 않음: {str(e)}")
+                    raise
+                if attempt == self.policy.max_attempts - 1:
+                    logger.error(f"[{self.name}] 최종 실패 ({attempt + 1}회 시도): {str(e)}")
+                    raise
+                delay = full_jitter_delay(attempt, self.policy.base_delay, self.policy.max_delay, self._rng)
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None:
+                    delay = max(delay, min(retry_after, self.policy.max_delay))
+                logger.warning(f"[{self.name}] 호출 실패 ({attempt + 1}/{self.policy.max_attempts}), "
+                               f"{delay:.2f}초 후 재시도: {str(e)}")
+                self._sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+
+_guards: dict[str, EndpointGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def endpoint_guard(name: str,
+                   rate_per_second: float | None = None,
+                   burst: int | None = None,
+                   policy: RetryPolicy | None = None,
+                   failure_threshold: int = 5,
+                   reset_timeout: float = 30.0) -> EndpointGuard:
+    """이름별로 하나의 가드를 공유합니다. (처음 만들 때의 설정을 사용)"""
+    with _guards_lock:
+        guard = _guards.get(name)
+        if guard is None:
+            bucket = TokenBucket(rate_per_second, burst or max(int(rate_per_second), 1)) if rate_per_second else None
+            guard = _guards[name] = EndpointGuard(
+                name, policy=policy, bucket=bucket,
+                breaker=CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout),
+            )
+        return guard
+
+
+class RetryableResponse(Exception):
+    """재시도 가능한 상태 코드의 requests 응답 (GuardedHTTPAdapter 내부에서 재시도 신호로 사용)"""
+
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+        self.status_code = response.status_code
+
+
+class GuardedHTTPAdapter(HTTPAdapter):
+    """requests 세션에 mount 하면 세션의 모든 요청이 guard 를 거칩니다. 마지막 시도의 응답은 그대로 반환"""
+
+    def __init__(self, guard: EndpointGuard, **kwargs):
+        super().__init__(**kwargs)
+        self.guard = guard
+
+    def send(self, request, **kwargs):
+        def attempt():
+            response = super(GuardedHTTPAdapter, self).send(request, **kwargs)
+            if response.status_code in RETRYABLE_STATUS:
+                raise RetryableResponse(response)
+            return response
+
+        try:
+            if request.method in IDEMPOTENT_METHODS:
+                return self.guard.call(attempt)
+            return self.guard.call_non_idempotent(attempt)
+        except RetryableResponse as e:
+            # 재시도를 다 쓴 응답은 SDK 가 평소처럼 오류로 처리하도록 돌려줌
+            return e.response
+
+
+def guarded_request_builder(guard: EndpointGuard):
+    """googleapiclient build(requestBuilder=...) 에 넘길, execute() 가 guard 를 거치는 HttpRequest 클래스"""
+    from googleapiclient.http import HttpRequest
+
+    class GuardedHttpRequest(HttpRequest):
+        def execute(self, http=None, num_retries=0):
+            if self.method in IDEMPOTENT_METHODS:
+                return guard.call(super().execute, http=http, num_retries=num_retries)
+            return guard.call_non_idempotent(super().execute, http=http, num_retries=num_retries)
+
+    return GuardedHttpRequest
+
+
+class GuardedProxy:
+    """
+    대상 객체의 메서드 호출을 guard 를 거쳐 실행하는 프록시 (반환값은 감싸지 않음)
+    이름이 idempotent_prefixes 로 시작하는 조회 메서드만 재시도하고, 그 외(create_issue 등)는 call_non_idempotent 로 부릅니다.
+    """
+
+    def __init__(self, target, guard: EndpointGuard, idempotent_prefixes: tuple[str, ...] = ("get_",)):
+        self._target = target
+        self._guard = guard
+        self._idempotent_prefixes = idempotent_prefixes
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        guarded = self._guard.call if name.startswith(self._idempotent_prefixes) else self._guard.call_non_idempotent
+
+        def call(*args, **kwargs):
+            return guarded(attr, *args, **kwargs)
+        return call
@@ -0,0 +1,202 @@
+"""
+SDD Ticket Tools - 개발 티켓 + GitHub 이슈 동시 생성과 매핑 저장을 하나의 작업으로 처리
+
+create_dev_ticket_and_issue 는 JIRA 개발 티켓과 GitHub 이슈를 동시에 생성하고(지연 = 둘 중 느린 쪽),
+save_ticket_mapping 으로 매핑을 기록합니다. 중간에 실패하면 이미 만든 쪽을 되돌립니다.
+- JIRA 만 성공: 개발 티켓 삭제
+- GitHub 만 성공: 이슈 close (GitHub 이슈는 API 로 삭제 불가)
+- 둘 다 성공했지만 Copilot 라벨 부착 / 매핑 저장 실패(재시도 후): 둘 다 되돌림
+
+GitHub 이슈는 라벨 없이 만들고 두 티켓이 모두 생성된 뒤에 Copilot 라벨을 붙입니다.
+(라벨이 붙는 순간 Copilot 작업이 시작되므로, JIRA 생성이 실패한 이슈에서 작업이 돌지 않도록)
+
+재시도에 안전하도록(idempotent) 같은 사양 티켓 링크로 이미 저장된 매핑이 있으면 새로 만들지 않고
+기존 링크를 반환하며, 같은 사양 티켓에 대한 동시 호출은 프로세스 내 잠금으로 직렬화합니다.
+"""
+
+import time
+import logging
+import functools
+import threading
+import contextlib
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated
+
+from pydantic import Field
+
+from tools.jira_tools import JiraAutomationTools
+from tools.github_tools import GitHubAutomationTools
+from tools.ai_search_tools import AISearchTools
+from tools.instrumentation import instrument_tools
+
+logger = logging.getLogger(__name__)
+
+DEV_ISSUE_TYPE = "개발"
+MAPPING_SAVE_ATTEMPTS = 3
+MAPPING_RETRY_DELAY = 0.2  # 초, 시도마다 선형 증가
+
+# 도구 인스턴스는 durable agent 에서 pickle 되므로 실행기/잠금은 모듈 수준에 둠
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sdd-create")
+# 사양 티켓 링크 -> [잠금, 사용 중인 스레드 수]. 마지막 사용자가 나가면 항목을 지워 링크 수만큼 쌓이지 않게 함
+_spec_locks: dict[str, list] = {}
+_spec_locks_guard = threading.Lock()
+
+
+@contextlib.contextmanager
+def _spec_lock(spec_ticket_link: str):
+    with _spec_locks_guard:
+        entry = _spec_locks.setdefault(spec_ticket_link, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _spec_locks_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _spec_locks[spec_ticket_link]
+
+
+def _submit(fn, *args):
+    # 계측(ContextVar)이 작업 스레드에서도 상위 도구 호출에 합산되도록 컨텍스트를 복사해서 실행
+    return _executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+class TicketCreationError(Exception):
+    """생성 또는 매핑 저장 실패. 보상 처리 결과(compensated)를 함께 담습니다."""
+
+    def __init__(self, message: str, compensated: list[str] | None = None):
+        super().__init__(message)
+        self.compensated = compensated or []
+
+
+@instrument_tools
+class SDDTicketTools:
+    def __init__(self,
+                 jira_tools: JiraAutomationTools | None = None,
+                 github_tools: GitHubAutomationTools | None = None,
+                 ai_search_tools: AISearchTools | None = None):
+        self.jira_tools = jira_tools or JiraAutomationTools()
+        self.github_tools = github_tools or GitHubAutomationTools()
+        self.ai_search_tools = ai_search_tools or AISearchTools()
+
+    def _compensate(self, dev_ticket: dict | None, github_issue: dict | None) -> list[str]:
+        """생성된 쪽을 되돌리고, 되돌린 항목 설명 목록을 반환합니다. (보상 실패는 기록만 함)"""
+        compensated = []
+        if dev_ticket:
+            try:
+                self.jira_tools.delete_issue(dev_ticket["key"])
+                compensated.append(f"개발 티켓 {dev_ticket['key']} 삭제")
+            except Exception as e:
+                logger.error(f"보상 처리 실패 - 개발 티켓 삭제: {dev_ticket['key']} - {str(e)}", exc_info=True)
+                compensated.append(f"개발 티켓 {dev_ticket['key']} 삭제 실패 (수동 정리 필요: {dev_ticket['link']})")
+        if github_issue:
+            try:
+                self.github_tools.close_issue(github_issue["number"])
+                compensated.append(f"GitHub 이슈 #{github_issue['number']} close")
+            except Exception as e:
+                logger.error(f"보상 처리 실패 - GitHub 이슈 close: #{github_issue['number']} - {str(e)}", exc_info=True)
+                compensated.append(f"GitHub 이슈 #{github_issue['number']} close 실패 (수동 정리 필요: {github_issue['url']})")
+        return compensated
+
+    def _save_mapping(self, spec_ticket_link, spec_ticket_content, dev_ticket_link, github_issue_link) -> str | None:
+        """매핑 저장 (merge_or_upload 라 재시도해도 중복되지 않음). 최종 실패 시 마지막 오류 메시지 반환."""
+        error = None
+        for attempt in range(MAPPING_SAVE_ATTEMPTS):
+            saved = self.ai_search_tools.save_ticket_mapping(
+                spec_ticket_link, spec_ticket_content, dev_ticket_link, github_issue_link
+            )
+            if not saved.startswith("Error"):
+                return None
+            error = saved
+            logger.warning(f"매핑 저장 실패 ({attempt + 1}/{MAPPING_SAVE_ATTEMPTS}): {saved}")
+            if attempt < MAPPING_SAVE_ATTEMPTS - 1:
+                time.sleep(MAPPING_RETRY_DELAY * (attempt + 1))
+        return error
+
+    def create_linked_tickets(self, spec_ticket_link: str, spec_ticket_content: str,
+                              title: str, body: str) -> dict:
+        """
+        create_dev_ticket_and_issue 의 구조화 버전 (코드 경로용).
+        {"status": "created" | "existing", "dev_ticket_link", "github_issue_link"} 를 반환하고,
+        실패 시 보상 처리 후 TicketCreationError 를 발생시킵니다.
+        """
+        with _spec_lock(spec_ticket_link):
+            existing = self.ai_search_tools.get_ticket_mapping(spec_ticket_link)
+            if existing:
+                logger.info(f"이미 매핑된 사양 티켓, 생성 생략: {spec_ticket_link}")
+                return {
+                    "status": "existing",
+                    "dev_ticket_link": existing.get("dev_ticket_link"),
+                    "github_issue_link": existing.get("github_issue_link"),
+                }
+
+            jira_future = _submit(
+                self.jira_tools.create_issue, title, f"{body}\n\n사양 티켓: {spec_ticket_link}", DEV_ISSUE_TYPE
+            )
+            # 라벨은 JIRA 생성까지 성공한 뒤에 붙임 (Copilot 트리거)
+            github_future = _submit(
+                functools.partial(self.github_tools.open_issue, label_now=False), title, f"{body}\n\nSpec: {spec_ticket_link}"
+            )
+
+            dev_ticket = github_issue = None
+            errors = []
+            try:
+                dev_ticket = jira_future.result()
+            except Exception as e:
+                errors.append(f"개발 티켓 생성 실패: {str(e)}")
+            try:
+                github_issue = github_future.result()
+            except Exception as e:
+                errors.append(f"GitHub 이슈 생성 실패: {str(e)}")
+
+            if not errors:
+                try:
+                    self.github_tools.add_copilot_label(github_issue["number"])
+                except Exception as e:
+                    errors.append(f"Copilot 라벨 부착 실패: {str(e)}")
+
+            if errors:
+                compensated = self._compensate(dev_ticket, github_issue)
+                raise TicketCreationError("; ".join(errors), compensated)
+
+            error = self._save_mapping(spec_ticket_link, spec_ticket_content, dev_ticket["link"], github_issue["url"])
+            if error:
+                compensated = self._compensate(dev_ticket, github_issue)
+                raise TicketCreationError(error, compensated)
+
+            logger.info(f"개발 티켓/GitHub 이슈 생성 및 매핑 저장 완료: {dev_ticket['key']}, #{github_issue['number']}")
+            return {
+                "status": "created",
+                "dev_ticket_link": dev_ticket["link"],
+                "github_issue_link": github_issue["url"],
+            }
+
+    def create_dev_ticket_and_issue(self,
+        spec_ticket_link: Annotated[str, Field(description="사양 티켓의 JIRA 링크 (예: https://xxx.atlassian.net/browse/KAN-4)")],
+        spec_ticket_content: Annotated[str, Field(description="사양 티켓의 내용 (description)")],
+        title: Annotated[str, Field(description="개발 티켓 / GitHub 이슈 제목")],
+        body: Annotated[str, Field(description="개발 티켓 / GitHub 이슈 본문")]
+    ) -> str:
+        """
+        개발 티켓("개발" 타입)과 GitHub 이슈를 동시에 생성하고 매핑까지 저장합니다.
+        일부만 성공하면 생성된 쪽을 되돌리며, 이미 매핑된 사양 티켓이면 기존 링크를 반환합니다.
+        """
+        try:
+            result = self.create_linked_tickets(spec_ticket_link, spec_ticket_content, title, body)
+        except TicketCreationError as e:
+            lines = [f"Error creating dev ticket and issue: {str(e)}"]
+            lines.extend(f"  - 되돌림: {item}" for item in e.compensated)
+            return "\n".join(lines)
+        except Exception as e:
+            logger.error(f"개발 티켓/GitHub 이슈 생성 실패: {spec_ticket_link} - {str(e)}", exc_info=True)
+            return f"Error creating dev ticket and issue: {str(e)}"
+
+        header = "✅ 이미 생성된 티켓이 있습니다." if result["status"] == "existing" else "✅ 개발 티켓과 GitHub 이슈를 생성하고 매핑을 저장했습니다."
+        return (
+            f"{header}\n"
+            f"  사양 티켓: {spec_ticket_link}\n"
+            f"  개발 티켓: {result['dev_ticket_link']}\n"
+            f"  GitHub 이슈: {result['github_issue_link']}"
+        )
@@ -0,0 +1,55 @@
+"""
+Tool State - durable agent 가 도구 인스턴스를 pickle 할 때 설정만 저장하는 공통 프로토콜
+
+도구 클래스는 라이브 클라이언트(googleapiclient service, Github / JIRA / Azure SDK 클라이언트)와
+다시 만들 수 있는 캐시를 _transient_attrs 에 나열합니다. pickle 상태에서는 이 속성들을 빼고
+(환경 변수에서 읽은 경로 / 키 / 엔드포인트 같은 설정만 남음), 복원 후에는 None 으로 두어
+각 클래스의 lazy 프로퍼티가 첫 사용 시 다시 만들게 합니다.
+
+    @instrument_tools
+    class JiraAutomationTools(PicklableTools):
+        _transient_attrs = ("_client",)
+
+        @property
+        def client(self):
+            if self._client is None:
+                self._client = JIRA(...)
+            return self._client
+
+테스트 / 벤치마크에서 주입한 대역(service=...)도 저장되지 않으므로, 복원한 인스턴스는 실제 인증 경로를 사용합니다.
+
+googleapiclient service 처럼 스레드 안전하지 않은 클라이언트(httplib2)는 ThreadLocalClient 로 스레드마다 따로 만듭니다.
+(동기 도구를 asyncio.to_thread 로 동시에 실행하므로 프로세스 공용 lock 대신 스레드별 클라이언트를 씀)
+"""
+
+import threading
+
+
+class PicklableTools:
+    # pickle 에서 제외하고 복원 후 None 으로 두는 속성 (라이브 클라이언트 / 캐시)
+    _transient_attrs: tuple[str, ...] = ()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name in self._transient_attrs:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        for name in self._transient_attrs:
+            self.__dict__.setdefault(name, None)
+
+
+class ThreadLocalClient:
+    """스레드마다 factory() 로 만든 클라이언트를 하나씩 둡니다. (to_thread 작업 스레드는 재사용되므로 스레드당 1회 생성)"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._local = threading.local()
+
+    def get(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._factory()
+        return client